@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""Headless JSON API over the PRGI SQLite database (stdlib only).
+
+Start:
+  python api_server.py --db prgi_data.db --port 8000
+
+Endpoints (GET or HEAD):
+  /search?title=times&state=Delhi&limit=50           one page of matches, id order
+  /search?title=times&after_id=1234                  next page (token from "next_after_id")
+  /search?title=times&order=relevance                best full-text matches first, single page
+  /export?language=Hindi&format=csv                  every match, streamed (csv or ndjson)
+  /facets?column=district&state=Maharashtra          dependent facet counts
+  /similar?title=Dainik%20Jagran&limit=10            fuzzy title availability check
+  /stats                                             record counts, DB version, cache counters
+  /health
+
+Filters are the same as ``prgi_data_manager.py query``: title, owner, registration_number,
+sounds_like, state, district, language, class_name. Queries run on a thread pool over
+read-only WAL connections, at most --max-concurrency at a time; JSON bodies are cached by
+DB version and gzip-compressed when the client accepts it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import gzip
+import io
+import json
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from prgi_data_manager import (
+    CONTAINS_FILTERS,
+    EXACT_FILTERS,
+    ReadPool,
+    ResultCache,
+    TitleIndex,
+    build_select,
+    db_stats,
+    db_version,
+    facet_counts,
+    filter_lookup_ids,
+    has_fts,
+    normalize_filters,
+    prepare_for_readers,
+    search_page,
+    sounds_like_key,
+    title_key,
+)
+
+RESULT_COLUMNS = [
+    "sr_no",
+    "title_name",
+    "registration_number",
+    "owner_name",
+    "pub_state_name",
+    "pub_dist_name",
+    "language",
+    "class_name",
+]
+FILTER_PARAMS = (*CONTAINS_FILTERS, *EXACT_FILTERS, "sounds_like")
+MAX_PAGE_SIZE = 1000
+MAX_SIMILAR = 50
+GZIP_MIN_BYTES = 1024
+VERSION_TTL = 1.0
+EXPORT_BATCH = 1000
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class Body(NamedTuple):
+    """Encoded JSON response, with its gzip form when large enough to be worth sending compressed."""
+
+    raw: bytes
+    gzipped: Optional[bytes]
+
+
+class Stream(NamedTuple):
+    """Streamed response: ``produce(conn, emit)`` runs on a pooled connection and emits byte chunks."""
+
+    content_type: str
+    produce: Callable[[Any, Callable[[bytes], None]], None]
+
+
+def encode_json(obj: object) -> Body:
+    raw = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Body(raw, gzip.compress(raw, compresslevel=5) if len(raw) >= GZIP_MIN_BYTES else None)
+
+
+def int_param(params: Dict[str, str], name: str, default: Optional[int], low: int, high: int) -> Optional[int]:
+    value = params.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer") from None
+    if not low <= number <= high:
+        raise HTTPError(400, f"{name} must be between {low} and {high}")
+    return number
+
+
+def filters_from_params(params: Dict[str, str]) -> Dict[str, str]:
+    filters = {name: params[name] for name in FILTER_PARAMS if params.get(name, "").strip()}
+    if "sounds_like" in filters:
+        # Checked here so /export answers 400 before it starts streaming.
+        sounds_like_key(filters["sounds_like"])
+    return filters
+
+
+class SearchAPI:
+    """Request handlers plus the shared state behind them: read pool, result cache and title index."""
+
+    def __init__(self, db_path: str, pool_size: int = 8, max_concurrency: int = 32, cache_mb: int = 64) -> None:
+        prepare_for_readers(db_path)
+        self.db_path = db_path
+        self.pool = ReadPool(db_path, size=pool_size)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="prgi-api")
+        self.cache = ResultCache(max_bytes=cache_mb * 1024 * 1024)
+        self.max_concurrency = max_concurrency
+        self.routes: Dict[str, Callable[[Dict[str, str]], Any]] = {
+            "/search": self.search,
+            "/export": self.export,
+            "/facets": self.facets,
+            "/similar": self.similar,
+            "/stats": self.stats,
+            "/health": self.health,
+        }
+        self._version = 0
+        self._version_checked = float("-inf")
+        self._title_index: Optional[Tuple[int, TitleIndex]] = None
+        # Created in start(), inside the running event loop.
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._index_lock: Optional[asyncio.Lock] = None
+
+    def start(self) -> None:
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._index_lock = asyncio.Lock()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close()
+
+    async def run_db(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(conn, *args)`` on a pooled connection in a worker thread."""
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._with_connection, fn, args)
+
+    def _with_connection(self, fn: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        try:
+            with self.pool.connection(timeout=10.0) as conn:
+                return fn(conn, *args)
+        except TimeoutError:
+            raise HTTPError(503, "all database connections are busy") from None
+
+    async def version(self) -> int:
+        """DB version, re-read at most once per VERSION_TTL seconds."""
+        now = time.monotonic()
+        if now - self._version_checked >= VERSION_TTL:
+            self._version = await self.run_db(db_version)
+            self._version_checked = now
+        return self._version
+
+    async def cached(self, key: Tuple[Any, ...], compute: Callable[..., object]) -> Body:
+        """JSON body for ``key`` from the result cache, or ``compute(conn)`` encoded and stored."""
+        version = await self.version()
+        body = self.cache.get(key, version)
+        if body is None:
+            body = await self.run_db(lambda conn: encode_json(compute(conn)))
+            self.cache.put(key, version, body, len(body.raw) + len(body.gzipped or b""))
+        return body
+
+    async def search(self, params: Dict[str, str]) -> Body:
+        filters = filters_from_params(params)
+        limit = int_param(params, "limit", 50, 1, MAX_PAGE_SIZE)
+        after_id = int_param(params, "after_id", None, 0, 2**63 - 1)
+        order = params.get("order", "id")
+        if order not in ("id", "relevance"):
+            raise HTTPError(400, "order must be 'id' or 'relevance'")
+        if after_id is not None and order == "relevance":
+            raise HTTPError(400, "after_id pages id order only; relevance order returns a single page")
+
+        def compute(conn: Any) -> object:
+            rows, next_after = search_page(
+                conn, filters, limit, after_id=after_id, rank=order == "relevance", columns=RESULT_COLUMNS
+            )
+            names = ["id", *RESULT_COLUMNS]
+            return {"rows": [dict(zip(names, row)) for row in rows], "next_after_id": next_after}
+
+        return await self.cached(("search", normalize_filters(filters), limit, after_id, order), compute)
+
+    async def export(self, params: Dict[str, str]) -> Stream:
+        filters = filters_from_params(params)
+        limit = int_param(params, "limit", 0, 0, 2**31 - 1)
+        fmt = params.get("format", "csv")
+        if fmt not in ("csv", "ndjson"):
+            raise HTTPError(400, "format must be 'csv' or 'ndjson'")
+        names = ["id", *RESULT_COLUMNS]
+
+        def produce(conn: Any, emit: Callable[[bytes], None]) -> None:
+            sql, sql_params = build_select(
+                filters, columns=names, fts=has_fts(conn), limit=limit, lookup_ids=filter_lookup_ids(conn, filters)
+            )
+            cursor = conn.execute(sql, sql_params)
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            if fmt == "csv":
+                writer.writerow(names)
+            try:
+                while True:
+                    rows = cursor.fetchmany(EXPORT_BATCH)
+                    if not rows:
+                        break
+                    if fmt == "csv":
+                        writer.writerows(rows)
+                    else:
+                        for row in rows:
+                            buf.write(json.dumps(dict(zip(names, row)), ensure_ascii=False))
+                            buf.write("\n")
+                    emit(buf.getvalue().encode("utf-8"))
+                    buf.seek(0)
+                    buf.truncate()
+            finally:
+                # An unfinished statement would hold its read snapshot after the connection goes back to the pool.
+                cursor.close()
+            if buf.tell():
+                emit(buf.getvalue().encode("utf-8"))
+
+        content_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+        return Stream(content_type, produce)
+
+    async def facets(self, params: Dict[str, str]) -> Body:
+        name = params.get("column", "")
+        if name not in EXACT_FILTERS:
+            raise HTTPError(400, f"column must be one of: {', '.join(EXACT_FILTERS)}")
+        selections = {EXACT_FILTERS[key]: params[key] for key in EXACT_FILTERS if params.get(key, "").strip()}
+
+        def compute(conn: Any) -> object:
+            counts = facet_counts(conn, EXACT_FILTERS[name], selections)
+            return {"column": name, "values": [{"value": value, "count": count} for value, count in counts]}
+
+        key = ("facets", name, normalize_filters({k: v for k, v in params.items() if k in EXACT_FILTERS}))
+        return await self.cached(key, compute)
+
+    async def title_index(self) -> TitleIndex:
+        """In-memory similarity index, rebuilt once per DB version."""
+        version = await self.version()
+        async with self._index_lock:
+            if self._title_index is None or self._title_index[0] != version:
+                self._title_index = (version, await self.run_db(TitleIndex.from_db))
+            return self._title_index[1]
+
+    async def similar(self, params: Dict[str, str]) -> Body:
+        title = params.get("title", "").strip()
+        if not title_key(title):
+            raise HTTPError(400, "title is required")
+        limit = int_param(params, "limit", 10, 1, MAX_SIMILAR)
+        version = await self.version()
+        # Keyed by the title as typed, since the body echoes it back.
+        key = ("similar", title, limit)
+        body = self.cache.get(key, version)
+        if body is None:
+            index = await self.title_index()
+
+            def compute() -> Body:
+                matches = index.search(title, limit=limit)
+                return encode_json({"title": title, "matches": [m._asdict() for m in matches]})
+
+            # Scoring is pure Python; keep it off the event loop like the DB work.
+            async with self._slots:
+                body = await asyncio.get_running_loop().run_in_executor(self.executor, compute)
+            self.cache.put(key, version, body, len(body.raw) + len(body.gzipped or b""))
+        return body
+
+    async def stats(self, params: Dict[str, str]) -> Body:
+        stats = await self.run_db(db_stats)
+        return encode_json({**stats, "version": await self.version(), "cache": self.cache.stats()})
+
+    async def health(self, params: Dict[str, str]) -> Body:
+        return encode_json({"status": "ok"})
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection until the client closes it or asks to."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.write_error(writer, 400, "request header too large", False)
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                headers = {}
+                for line in header_lines:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, http_version = request_line.split(" ", 2)
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    await self.write_error(writer, 400, "malformed request", False)
+                    break
+                if length:
+                    await reader.readexactly(length)
+                connection = headers.get("connection", "").lower()
+                if http_version == "HTTP/1.1":
+                    keep_alive = connection != "close"
+                else:
+                    keep_alive = connection == "keep-alive"
+                gzip_ok = "gzip" in headers.get("accept-encoding", "")
+                if not await self.respond(writer, method, target, gzip_ok, keep_alive):
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(
+        self, writer: asyncio.StreamWriter, method: str, target: str, gzip_ok: bool, keep_alive: bool
+    ) -> bool:
+        """Dispatch one request and write its response; returns whether to keep the connection open."""
+        url = urlsplit(target)
+        handler = self.routes.get(url.path.rstrip("/") or "/")
+        try:
+            if handler is None:
+                raise HTTPError(404, f"no such endpoint: {url.path}")
+            if method not in ("GET", "HEAD"):
+                raise HTTPError(405, "only GET and HEAD are supported")
+            result = await handler(dict(parse_qsl(url.query)))
+        except HTTPError as exc:
+            await self.write_error(writer, exc.status, str(exc), keep_alive)
+            return keep_alive
+        except ValueError as exc:
+            await self.write_error(writer, 400, str(exc), keep_alive)
+            return keep_alive
+        except Exception as exc:  # noqa: BLE001 - report and keep serving
+            print(f"Error serving {target}: {exc!r}")
+            await self.write_error(writer, 500, "internal error", keep_alive)
+            return keep_alive
+        if isinstance(result, Stream):
+            return await self.write_stream(writer, result, method == "HEAD", gzip_ok, keep_alive)
+        body = result.raw
+        extra = []
+        if gzip_ok and result.gzipped is not None:
+            body = result.gzipped
+            extra.append("Content-Encoding: gzip")
+        await self.write_response(
+            writer, 200, "application/json", body, keep_alive, extra, head_only=method == "HEAD"
+        )
+        return keep_alive
+
+    async def write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        content_type: str,
+        body: bytes,
+        keep_alive: bool,
+        extra: Sequence[str] = (),
+        head_only: bool = False,
+    ) -> None:
+        head = [
+            f"HTTP/1.1 {status} {REASONS[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Vary: Accept-Encoding",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            *extra,
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
+    async def write_error(self, writer: asyncio.StreamWriter, status: int, message: str, keep_alive: bool) -> None:
+        await self.write_response(writer, status, "application/json", encode_json({"error": message}).raw, keep_alive)
+
+    async def write_stream(
+        self, writer: asyncio.StreamWriter, stream: Stream, head_only: bool, gzip_ok: bool, keep_alive: bool
+    ) -> bool:
+        """Send a streamed body with chunked encoding as the worker thread produces it.
+
+        The queue is bounded, so a slow client pauses the query instead of
+        buffering the whole export in memory.
+        """
+        head = [
+            "HTTP/1.1 200 OK",
+            f"Content-Type: {stream.content_type}",
+            "Transfer-Encoding: chunked",
+            "Vary: Accept-Encoding",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if gzip_ok:
+            head.append("Content-Encoding: gzip")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        if head_only:
+            # No body at all, not even the last chunk: a keep-alive client would read it as the next response.
+            await writer.drain()
+            return keep_alive
+
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=8)
+        stop = threading.Event()
+        done = object()
+
+        def emit(chunk: bytes) -> None:
+            if stop.is_set():
+                raise ConnectionAbortedError("client went away")
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), loop).result()
+
+        def produce(conn: Any) -> None:
+            try:
+                stream.produce(conn, emit)
+            finally:
+                if not stop.is_set():
+                    asyncio.run_coroutine_threadsafe(chunks.put(done), loop).result()
+
+        task = asyncio.ensure_future(self.run_db(produce))
+        compressor = zlib.compressobj(5, zlib.DEFLATED, 31) if gzip_ok else None
+        try:
+            while True:
+                getter = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    # The producer failed before signalling completion.
+                    getter.cancel()
+                    task.result()
+                    raise ConnectionAbortedError("export ended early")
+                chunk = getter.result()
+                if chunk is done:
+                    break
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    await writer.drain()
+            await task
+            if compressor is not None:
+                tail = compressor.flush()
+                writer.write(b"%x\r\n%s\r\n" % (len(tail), tail))
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            return keep_alive
+        except Exception as exc:  # noqa: BLE001 - headers are sent; all we can do is drop the connection
+            if not isinstance(exc, ConnectionError):
+                print(f"Export aborted: {exc!r}")
+            return False
+        finally:
+            stop.set()
+            while not chunks.empty():
+                chunks.get_nowait()
+            if not task.done():
+                task.add_done_callback(lambda t: t.exception())
+
+
+async def serve(api: SearchAPI, host: str, port: int) -> None:
+    api.start()
+    server = await asyncio.start_server(api.handle, host, port, backlog=1024)
+    print(f"Serving {api.db_path} on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="JSON search API over the PRGI SQLite database")
+    parser.add_argument("--db", default="prgi_data.db", help="SQLite DB file path")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--pool-size", type=int, default=8, help="Read-only DB connections and worker threads")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=32, help="Requests allowed to query the DB at once; others wait"
+    )
+    parser.add_argument("--cache-mb", type=int, default=64, help="Size of the in-memory result cache in MB")
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if not Path(args.db).exists():
+        parser.error(f"database not found: {args.db} (run prgi_data_manager.py import first)")
+    api = SearchAPI(args.db, pool_size=args.pool_size, max_concurrency=args.max_concurrency, cache_mb=args.cache_mb)
+    try:
+        asyncio.run(serve(api, args.host, args.port))
+    except KeyboardInterrupt:
+        print("Stopped.")
+    finally:
+        api.close()
+
+
+if __name__ == "__main__":
+    main()
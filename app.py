@@ -4,12 +4,38 @@
 Run with: streamlit run app.py
 """
 
+from __future__ import annotations
+
+import importlib
+import os
 import streamlit as st
 import sqlite3
-import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any
-import json
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from packaging.version import Version
+
+from prgi_data_manager import (
+    FACET_COLUMNS,
+    QueryProfiler,
+    ReadPool,
+    ResultCache,
+    SimilarTitle,
+    TitleIndex,
+    db_stats,
+    db_version,
+    facet_counts,
+    fts_match_expression,
+    normalize_filters,
+    prepare_for_readers,
+    profiled,
+    search_page,
+)
+
+if TYPE_CHECKING:
+    # pandas is imported on first use, so the first page renders without paying for it.
+    import pandas as pd
+    from prgi_engine import ColumnarEngine
 
 # Set page config
 st.set_page_config(
@@ -21,131 +47,284 @@ st.set_page_config(
 
 TABLE_NAME = "registrations"
 DEFAULT_DB = "prgi_data.db"
+RESULT_CACHE_MB = 128
+READ_POOL_SIZE = 8
+# SQL steps slower than this go to the slow-query log, which is off unless PRGI_SLOW_QUERY_LOG names a file
+SLOW_QUERY_MS = float(os.environ.get("PRGI_SLOW_QUERY_MS", "250"))
+SLOW_QUERY_LOG = os.environ.get("PRGI_SLOW_QUERY_LOG", "")
+# "memory" serves searches from an in-memory columnar copy of the table (prgi_engine.py) by default
+SEARCH_ENGINE = os.environ.get("PRGI_SEARCH_ENGINE", "sqlite")
+
+# Streamlit 1.52+ takes a callable as download data and only runs it on click
+DEFERRED_DOWNLOADS = Version(st.__version__) >= Version("1.52.0")
 
 
 @st.cache_resource
-def get_db_connection(db_path: str):
-    """Create a cached database connection."""
+def get_read_pool(db_path: str) -> Optional[ReadPool]:
+    """Create the shared pool of read-only database connections."""
     if not Path(db_path).exists():
         st.error(f"Database file '{db_path}' not found. Please import data first.")
         return None
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # Migrates older databases and switches them to WAL, so searches never wait on an import
+    prepare_for_readers(db_path)
+    return ReadPool(db_path, size=READ_POOL_SIZE)
+
 
+@st.cache_resource(max_entries=2)
+def get_title_index(db_path: str, version: int) -> TitleIndex:
+    """Build the trigram title index once per database version."""
+    with get_read_pool(db_path).connection() as conn:
+        return TitleIndex.from_db(conn)
 
-def get_unique_values(conn: sqlite3.Connection, column: str) -> List[str]:
-    """Get unique values from a column for filter dropdowns."""
+
+@st.cache_resource(max_entries=1, show_spinner="Loading the in-memory search engine...")
+def get_search_engine(db_path: str, version: int) -> ColumnarEngine:
+    """Load the columnar search engine once per database version, shared by every session."""
+    from prgi_engine import ColumnarEngine
+    
+    with get_read_pool(db_path).connection() as conn:
+        return ColumnarEngine.from_db(conn)
+
+
+@st.cache_data
+def get_unique_values(
+    db_path: str, column: str, version: int, selections: tuple = (), _profiler: Optional[QueryProfiler] = None
+) -> Dict[str, int]:
+    """Get facet values with record counts for a filter dropdown, narrowed by the other selected filters."""
     try:
-        cursor = conn.execute(f"SELECT DISTINCT {column} FROM {TABLE_NAME} WHERE {column} != '' ORDER BY {column}")
-        return [""] + [row[0] for row in cursor.fetchall()]
-    except:
-        return [""]
-
-
-def build_search_query(filters: Dict[str, str]) -> tuple:
-    """Build SQL query based on search filters."""
-    clauses = []
-    params = []
-    
-    # Title search (contains)
-    if filters.get('title'):
-        clauses.append("LOWER(title_name) LIKE LOWER(?)")
-        params.append(f"%{filters['title']}%")
-    
-    # Owner search (contains)
-    if filters.get('owner'):
-        clauses.append("LOWER(owner_name) LIKE LOWER(?)")
-        params.append(f"%{filters['owner']}%")
-    
-    # Registration number search (contains)
-    if filters.get('registration_number'):
-        clauses.append("LOWER(registration_number) LIKE LOWER(?)")
-        params.append(f"%{filters['registration_number']}%")
-    
-    # State (exact match)
-    if filters.get('state'):
-        clauses.append("LOWER(pub_state_name) = LOWER(?)")
-        params.append(filters['state'])
-    
-    # District (exact match)
-    if filters.get('district'):
-        clauses.append("LOWER(pub_dist_name) = LOWER(?)")
-        params.append(filters['district'])
-    
-    # Language (exact match)
-    if filters.get('language'):
-        clauses.append("LOWER(language) = LOWER(?)")
-        params.append(filters['language'])
-    
-    # Class (exact match)
-    if filters.get('class_name'):
-        clauses.append("LOWER(class_name) = LOWER(?)")
-        params.append(filters['class_name'])
-    
-    where_clause = " AND ".join(clauses) if clauses else "1=1"
-    return where_clause, params
-
-
-def search_database(conn: sqlite3.Connection, filters: Dict[str, str], limit: int = 1000) -> pd.DataFrame:
-    """Search the database with given filters and return results as DataFrame."""
-    where_clause, params = build_search_query(filters)
-    
-    query = f"""
-        SELECT 
-            sr_no,
-            title_name,
-            registration_number,
-            owner_name,
-            pub_state_name,
-            pub_dist_name,
-            language,
-            class_name
-        FROM {TABLE_NAME}
-        WHERE {where_clause}
-        ORDER BY id DESC
-        LIMIT ?
+        with get_read_pool(db_path).connection() as conn:
+            with profiled(_profiler, f"facets: {column}", conn) as info:
+                counts = facet_counts(conn, column, dict(selections))
+                info["rows"] = len(counts)
+            return {"": 0, **dict(counts)}
+    except sqlite3.Error:
+        return {"": 0}
+
+
+def facet_selectbox(
+    label: str, column: str, db_path: str, version: int, profiler: Optional[QueryProfiler] = None
+) -> str:
+    """Dropdown over one facet, showing only values that match the other selections, with their counts."""
+    key = f"facet_{column}"
+    selections = tuple(
+        (other, st.session_state[f"facet_{other}"])
+        for other in FACET_COLUMNS
+        if other != column and st.session_state.get(f"facet_{other}")
+    )
+    values = get_unique_values(db_path, column, version, selections, _profiler=profiler)
+    if st.session_state.get(key, "") not in values:
+        # The selected value no longer exists (e.g. after a re-import)
+        st.session_state[key] = ""
+    return st.selectbox(label, list(values), key=key, format_func=lambda v: f"{v} ({values[v]:,})" if v else "")
+
+
+SEARCH_COLUMNS = [
+    "sr_no",
+    "title_name",
+    "registration_number",
+    "owner_name",
+    "pub_state_name",
+    "pub_dist_name",
+    "language",
+    "class_name",
+]
+
+
+def search_database(
+    conn: sqlite3.Connection,
+    filters: Dict[str, str],
+    limit: int = 1000,
+    rank: bool = False,
+    after_id: Optional[int] = None,
+    profiler: Optional[QueryProfiler] = None,
+) -> Tuple[pd.DataFrame, Optional[int]]:
+    """Search one page of results; returns the DataFrame and the next page token (None on the last page)."""
+    import pandas as pd
+    
+    # Newest first; contains-filters go through the FTS5 index when the database has one.
+    with profiled(profiler, "search: SQL", conn) as info:
+        rows, next_after = search_page(
+            conn, filters, limit, after_id=after_id, rank=rank, columns=SEARCH_COLUMNS, descending=True
+        )
+        info["rows"] = len(rows)
+    with profiled(profiler, "search: DataFrame") as info:
+        df = pd.DataFrame([tuple(row)[1:] for row in rows], columns=SEARCH_COLUMNS)
+        info["rows"] = len(df)
+    return df, next_after
+
+
+def search_cache_key(
+    db_path: str, filters: Dict[str, str], limit: int, rank: bool, after_id: Optional[int], use_engine: bool
+) -> tuple:
+    """Cache key for one result page; equivalent filter dicts share it, but not across search backends."""
+    return ("search", db_path, normalize_filters(filters), limit, rank, after_id, use_engine)
+
+
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """Result cache shared by every session of this server process."""
+    return ResultCache(max_bytes=RESULT_CACHE_MB * 1024 * 1024)
+
+
+def cached_search(
+    key: tuple,
+    db_path: str,
+    version: int,
+    filters: Dict[str, str],
+    limit: int,
+    rank: bool,
+    after_id: Optional[int],
+    profiler: Optional[QueryProfiler] = None,
+    use_engine: bool = False,
+) -> Tuple[pd.DataFrame, Optional[int]]:
+    """search_database() through the shared result cache; entries expire when the DB version changes.
+    
+    With ``use_engine`` pages come from the in-memory engine, except relevance-ranked ones, which need FTS.
     """
-    params.append(limit)
+    # Loaded before the timed block, so the first import and an engine (re)load are not counted as search time.
+    importlib.import_module("pandas")
+    engine = get_search_engine(db_path, version) if use_engine else None
+    
+    def run_search() -> Tuple[pd.DataFrame, Optional[int]]:
+        if engine is not None and not (rank and fts_match_expression(filters)[0]):
+            with profiled(profiler, "search: engine") as info:
+                result = engine.search_page(filters, limit, after_id=after_id, descending=True)
+                info["rows"] = len(result[0])
+            return result
+        with get_read_pool(db_path).connection() as conn:
+            return search_database(conn, filters, limit, rank=rank, after_id=after_id, profiler=profiler)
     
-    df = pd.read_sql_query(query, conn, params=params)
-    return df
+    with profiled(profiler, "search: total") as info:
+        result = get_result_cache().get_or_compute(
+            key, version, run_search, sizeof=lambda result: int(result[0].memory_usage(deep=True).sum())
+        )
+        info["rows"] = len(result[0])
+    return result
+
+
+def cached_export(
+    key: tuple, version: int, df: pd.DataFrame, fmt: str, profiler: Optional[QueryProfiler] = None
+) -> bytes:
+    """Download payload for a result page, built on first use and cached next to the page."""
+    def build() -> bytes:
+        with profiled(profiler, f"export: {fmt}") as info:
+            info["rows"] = len(df)
+            if fmt == "csv":
+                return df.to_csv(index=False).encode("utf-8")
+            return df.to_json(orient='records', indent=2).encode("utf-8")
+    
+    return get_result_cache().get_or_compute((*key, fmt), version, build, sizeof=len)
+
+
+def download_data(key: tuple, version: int, df: pd.DataFrame, fmt: str, profiler: Optional[QueryProfiler] = None):
+    """Payload for st.download_button, deferred until the click when Streamlit supports it."""
+    if DEFERRED_DOWNLOADS:
+        return lambda: cached_export(key, version, df, fmt, profiler)
+    return cached_export(key, version, df, fmt, profiler)
 
 
-def get_stats(conn: sqlite3.Connection) -> Dict[str, int]:
-    """Get database statistics."""
+def next_page(after_id: int):
+    """Move to the page after the current one."""
+    st.session_state.page_stack.append(st.session_state.page_after)
+    st.session_state.page_after = after_id
+
+
+def previous_page():
+    """Move back to the page before the current one."""
+    st.session_state.page_after = st.session_state.page_stack.pop()
+
+
+@st.cache_data
+def get_stats(db_path: str, version: int, _profiler: Optional[QueryProfiler] = None) -> Dict[str, int]:
+    """Get database statistics from the precomputed summary, cached until the DB version changes."""
+    with get_read_pool(db_path).connection() as conn:
+        with profiled(_profiler, "stats", conn) as info:
+            summary = db_stats(conn)
+            info["rows"] = len(summary)
     stats = {}
-    stats['total_records'] = conn.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
-    stats['unique_states'] = conn.execute(f"SELECT COUNT(DISTINCT pub_state_name) FROM {TABLE_NAME} WHERE pub_state_name != ''").fetchone()[0]
-    stats['unique_languages'] = conn.execute(f"SELECT COUNT(DISTINCT language) FROM {TABLE_NAME} WHERE language != ''").fetchone()[0]
-    stats['unique_districts'] = conn.execute(f"SELECT COUNT(DISTINCT pub_dist_name) FROM {TABLE_NAME} WHERE pub_dist_name != ''").fetchone()[0]
+    stats['total_records'] = summary['total_records']
+    stats['unique_states'] = summary['unique_pub_state_name']
+    stats['unique_languages'] = summary['unique_language']
+    stats['unique_districts'] = summary['unique_pub_dist_name']
     return stats
 
 
+def show_timing_panel(profiler: QueryProfiler):
+    """Sidebar table of the steps timed in this run, with the query plan of each step that ran SQL."""
+    with st.sidebar:
+        st.header("⏱️ Query Timings")
+        if not profiler.timings:
+            st.caption("No queries ran; everything came from cache.")
+            return
+        st.dataframe(
+            [
+                {"Step": t.label, "ms": round(t.ms, 1), "Rows": t.rows, "Full scan": t.full_scan, "Slow": t.slow}
+                for t in profiler.timings
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+        for t in profiler.timings:
+            if t.plan:
+                with st.expander(f"Plan: {t.label} ({t.ms:.1f} ms){' · full scan' if t.full_scan else ''}"):
+                    st.code("\n".join(t.plan), language=None)
+        if SLOW_QUERY_LOG:
+            st.caption(f"SQL steps over {SLOW_QUERY_MS:.0f} ms are logged to {SLOW_QUERY_LOG}")
+
+
 def main():
     st.title("🔍 PRGI Registration Data Search")
     st.markdown("Search and explore Press Registration General Information data")
     
     # Database connection
     db_path = st.sidebar.text_input("Database Path", value=DEFAULT_DB)
-    conn = get_db_connection(db_path)
+    pool = get_read_pool(db_path)
     
-    if conn is None:
+    if pool is None:
         st.warning("⚠️ Database not found. Please import data using:")
         st.code("python prgi_data_manager.py import --csv prgi_registration_title_details.csv --db prgi_data.db")
         return
     
+    # Bumped by every change to the data; cached dropdowns, stats and results are keyed on it
+    with pool.connection() as conn:
+        version = db_version(conn)
+    
+    # Timings of this run; slow SQL steps are also appended to the slow-query log, if one is set.
+    # Without the timings panel or the log nothing is profiled, so queries are not traced or explained.
+    # The checkbox is drawn further down the sidebar; its state is already set when a click reruns the script.
+    profiler = None
+    if st.session_state.get("show_timings", False) or SLOW_QUERY_LOG:
+        profiler = QueryProfiler(slow_ms=SLOW_QUERY_MS, log_path=SLOW_QUERY_LOG or None)
+    
     # Display statistics
     with st.sidebar:
         st.header("📊 Database Stats")
         try:
-            stats = get_stats(conn)
+            stats = get_stats(db_path, version, _profiler=profiler)
             st.metric("Total Records", f"{stats['total_records']:,}")
             st.metric("States", stats['unique_states'])
             st.metric("Languages", stats['unique_languages'])
             st.metric("Districts", stats['unique_districts'])
         except Exception as e:
             st.error(f"Error loading stats: {e}")
+        
+        cache_stats = get_result_cache().stats()
+        st.caption(
+            f"Result cache: {cache_stats['hits']:,} hits · {cache_stats['misses']:,} misses · "
+            f"{cache_stats['entries']} entries ({cache_stats['bytes'] / 1024 / 1024:.1f} MB)"
+        )
+        show_timings = st.checkbox("⏱️ Show query timings", value=False, key="show_timings")
+        use_engine = st.checkbox(
+            "⚡ In-memory search",
+            value=SEARCH_ENGINE == "memory",
+            help="Load the table into memory once and filter it there instead of querying SQLite",
+        )
+        if use_engine:
+            engine = get_search_engine(db_path, version)
+            st.caption(
+                f"In-memory engine: {len(engine):,} rows · {engine.nbytes / 1024 / 1024:.0f} MB · "
+                f"loaded in {engine.load_seconds:.1f}s"
+            )
     
     # Search filters
     st.header("🔎 Search Filters")
@@ -158,18 +337,24 @@ def main():
     
     with col2:
         reg_number = st.text_input("📝 Registration Number", placeholder="Enter reg. number...")
-        state = st.selectbox("🗺️ State", get_unique_values(conn, "pub_state_name"))
+        state = facet_selectbox("🗺️ State", "pub_state_name", db_path, version, profiler)
     
     with col3:
-        district = st.selectbox("📍 District", get_unique_values(conn, "pub_dist_name"))
-        language = st.selectbox("🗣️ Language", get_unique_values(conn, "language"))
+        district = facet_selectbox("📍 District", "pub_dist_name", db_path, version, profiler)
+        language = facet_selectbox("🗣️ Language", "language", db_path, version, profiler)
     
     # Additional filters
     col4, col5 = st.columns(2)
     with col4:
-        class_name = st.selectbox("📚 Class", get_unique_values(conn, "class_name"))
+        class_name = facet_selectbox("📚 Class", "class_name", db_path, version, profiler)
+        sounds_like = st.text_input(
+            "🔊 Title Sounds Like",
+            placeholder="e.g. Samaachaar, समाचार...",
+            help="Matches titles spelled differently but pronounced the same",
+        )
     with col5:
-        result_limit = st.slider("Maximum Results", min_value=10, max_value=5000, value=500, step=10)
+        result_limit = st.slider("Results per Page", min_value=10, max_value=5000, value=500, step=10)
+        rank_results = st.checkbox("Best text matches first", help="Rank title/owner/registration matches by relevance")
     
     # Search button
     search_button = st.button("🔍 Search", type="primary", use_container_width=True)
@@ -182,21 +367,36 @@ def main():
         'state': state,
         'district': district,
         'language': language,
-        'class_name': class_name
+        'class_name': class_name,
+        'sounds_like': sounds_like
     }
     
+    # Start again from the first page whenever the search changes
+    search_key = (tuple(filters.items()), result_limit, rank_results)
+    if st.session_state.get("page_search") != search_key:
+        st.session_state.page_search = search_key
+        st.session_state.page_stack = []  # page tokens of the pages before the current one
+        st.session_state.page_after = None
+    
     # Auto-search or manual search
-    if search_button or any(filters.values()):
+    if search_button or any(filters.values()) or st.session_state.page_stack:
         with st.spinner("Searching database..."):
             try:
-                results_df = search_database(conn, filters, result_limit)
+                after_id = st.session_state.page_after
+                cache_key = search_cache_key(db_path, filters, result_limit, rank_results, after_id, use_engine)
+                results_df, next_after = cached_search(
+                    cache_key, db_path, version, filters, result_limit, rank_results, after_id, profiler, use_engine
+                )
+                page_number = len(st.session_state.page_stack) + 1
                 
                 # Display results
-                st.header(f"📋 Results ({len(results_df)} records found)")
+                st.header(f"📋 Results (page {page_number}, {len(results_df)} records)")
                 
                 if len(results_df) > 0:
-                    # Add row numbers
-                    results_df.insert(0, 'No.', range(1, len(results_df) + 1))
+                    # Add row numbers (on a copy; the cached page is shared between sessions)
+                    first_no = (page_number - 1) * result_limit + 1
+                    results_df = results_df.copy()
+                    results_df.insert(0, 'No.', range(first_no, first_no + len(results_df)))
                     
                     # Display table with better formatting
                     st.dataframe(
@@ -215,16 +415,35 @@ def main():
                         }
                     )
                     
+                    # Page controls
+                    col_prev, col_page, col_next = st.columns([1, 2, 1])
+                    with col_prev:
+                        st.button(
+                            "◀ Previous",
+                            on_click=previous_page,
+                            disabled=not st.session_state.page_stack,
+                            use_container_width=True
+                        )
+                    with col_page:
+                        st.caption(f"Page {page_number} · {result_limit} records per page")
+                    with col_next:
+                        st.button(
+                            "Next ▶",
+                            on_click=next_page,
+                            args=(next_after,),
+                            disabled=next_after is None,
+                            use_container_width=True
+                        )
+                    
                     # Export options
                     st.divider()
                     col_exp1, col_exp2 = st.columns(2)
                     
                     with col_exp1:
                         # CSV download
-                        csv = results_df.to_csv(index=False)
                         st.download_button(
                             label="📥 Download CSV",
-                            data=csv,
+                            data=download_data(cache_key, version, results_df, "csv", profiler),
                             file_name="prgi_search_results.csv",
                             mime="text/csv",
                             use_container_width=True
@@ -232,10 +451,9 @@ def main():
                     
                     with col_exp2:
                         # JSON download
-                        json_str = results_df.to_json(orient='records', indent=2)
                         st.download_button(
                             label="📥 Download JSON",
-                            data=json_str,
+                            data=download_data(cache_key, version, results_df, "json", profiler),
                             file_name="prgi_search_results.json",
                             mime="application/json",
                             use_container_width=True
@@ -243,11 +461,48 @@ def main():
                 else:
                     st.info("No records found matching your search criteria. Try adjusting your filters.")
                     
+            except ValueError as e:
+                # Filter input that cannot be searched, e.g. a sounds-like value without letters
+                st.warning(f"⚠️ {e}")
             except Exception as e:
                 st.error(f"Error during search: {e}")
                 st.exception(e)
     else:
         st.info("👆 Use the filters above to search the database")
+    
+    # Title availability check
+    st.divider()
+    st.header("🧭 Title Availability Check")
+    col_sim1, col_sim2 = st.columns([3, 1])
+    with col_sim1:
+        proposed_title = st.text_input("Proposed Title", placeholder="Enter a new title to compare with existing ones...")
+    with col_sim2:
+        top_k = st.slider("Similar Titles", min_value=5, max_value=50, value=10, step=5)
+    
+    if proposed_title:
+        import pandas as pd
+        
+        with profiled(profiler, "similar titles") as info:
+            matches = get_title_index(db_path, version).search(proposed_title, limit=top_k)
+            info["rows"] = len(matches)
+        if matches:
+            st.dataframe(
+                pd.DataFrame(matches, columns=SimilarTitle._fields),
+                use_container_width=True,
+                column_config={
+                    "score": st.column_config.ProgressColumn("Similarity", min_value=0.0, max_value=1.0, format="%.2f"),
+                    "title_name": st.column_config.TextColumn("Title", width="large"),
+                    "registration_number": st.column_config.TextColumn("Registration #", width="medium"),
+                    "owner_name": st.column_config.TextColumn("Owner", width="medium"),
+                    "pub_state_name": st.column_config.TextColumn("State", width="small"),
+                    "registrations": st.column_config.NumberColumn("Registrations", width="small"),
+                }
+            )
+        else:
+            st.success("No similar existing titles found.")
+    
+    if show_timings and profiler is not None:
+        show_timing_panel(profiler)
 
 
 if __name__ == "__main__":
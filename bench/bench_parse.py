@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark scrape_prgi table parser backends on saved HTML pages.
+
+Pages saved by a real crawl (scrape_prgi.py --save-html DIR) are the best
+fixtures. Without any, synthetic 1000-row pages shaped like the PRGI listing
+are generated into the fixtures directory first.
+
+Example:
+  python scrape_prgi.py --end-page 3 --save-html bench/fixtures
+  python bench/bench_parse.py --fixtures bench/fixtures --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scrape_prgi  # noqa: E402
+from synth_data import synthetic_page  # noqa: E402
+
+
+def ensure_fixtures(directory: Path, pages: int, rows: int) -> List[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = sorted(directory.glob("*.html"))
+    if paths:
+        return paths
+    for page in range(1, pages + 1):
+        path = directory / f"synthetic_{page:04d}.html"
+        path.write_text(synthetic_page(page, rows), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def bench_backend(name: str, documents: List[str], repeat: int) -> Dict[str, float]:
+    backend = scrape_prgi.PARSER_BACKENDS[name]
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = sum(len(backend(doc)) for doc in documents)
+        best = min(best, time.perf_counter() - started)
+    return {"rows": rows, "seconds": best, "rows_per_sec": rows / best if best else 0.0}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark HTML table parser backends")
+    parser.add_argument("--fixtures", default="bench/fixtures", help="Directory of saved *.html pages")
+    parser.add_argument("--pages", type=int, default=3, help="Synthetic pages to generate if none are saved")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend; the best is reported")
+    parser.add_argument("--json", default="", help="Optional path for JSON results")
+    args = parser.parse_args()
+
+    paths = ensure_fixtures(Path(args.fixtures), args.pages, args.rows)
+    documents = [path.read_text(encoding="utf-8") for path in paths]
+    print(f"{len(documents)} page(s) from {args.fixtures}")
+
+    backends = [name for name in scrape_prgi.PARSER_BACKENDS if name != "lxml" or scrape_prgi.lxml_html]
+    reference = [scrape_prgi.parse_table_from_html(doc, parser="bs4") for doc in documents]
+    results: Dict[str, Dict[str, float]] = {}
+    for name in backends:
+        same = all(scrape_prgi.parse_table_from_html(doc, parser=name) == ref for doc, ref in zip(documents, reference))
+        results[name] = bench_backend(name, documents, args.repeat)
+        results[name]["matches_bs4"] = same
+        r = results[name]
+        print(
+            f"{name:>5}: {r['rows']:>8} rows in {r['seconds']:.3f}s = {r['rows_per_sec']:>10,.0f} rows/s"
+            f"{'' if same else '  (OUTPUT DIFFERS FROM bs4)'}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Benchmark import, query, export and parse paths on synthetic PRGI data.
+
+Generates (and caches) a synthetic dataset of the requested size, imports it
+into a fresh database, then times each filter shape through build_select(),
+the web app's search_database(), the in-memory engine (prgi_engine.py),
+export_cursor(), the title similarity index and parse_table_from_html().
+Each case reports the median and best of --repeat runs; --json saves the
+results and --compare checks them against an earlier run.
+
+Example:
+  python bench/bench_suite.py --rows 100k --json bench/results/100k.json
+  python bench/bench_suite.py --rows 100k --compare bench/results/100k.json
+  python bench/bench_suite.py --rows 1M --only query,export --repeat 3
+  python bench/bench_suite.py --rows 1M --layout dict --compare bench/results/1M.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import prgi_data_manager as dm  # noqa: E402
+import scrape_prgi  # noqa: E402
+from synth_data import dataset, parse_size, synthetic_page  # noqa: E402
+
+GROUPS = ("import", "query", "app", "engine", "export", "similar", "parse")
+
+# Filter shapes the app and CLI produce, with values that are common or rare in the synthetic data.
+QUERY_SHAPES: Dict[str, Dict[str, str]] = {
+    "no_filters": {},
+    "title_common": {"title": "jagran"},
+    "title_rare": {"title": "mathrubhumi"},
+    "title_short": {"title": "aj"},
+    "owner": {"owner": "kulkarni"},
+    "registration_number": {"registration_number": "/2004/"},
+    "sounds_like": {"sounds_like": "samaachar"},
+    "state_common": {"state": "Uttar Pradesh"},
+    "state_rare": {"state": "Tripura"},
+    "state_language": {"state": "Maharashtra", "language": "Marathi"},
+    "district_class": {"district": "Pune", "class_name": "Newspaper"},
+    "title_state": {"title": "samachar", "state": "Delhi"},
+    "all_filters": {"title": "dainik", "state": "Uttar Pradesh", "language": "Hindi", "class_name": "Periodical"},
+}
+APP_SHAPES = ("no_filters", "title_common", "state_language", "all_filters")
+PAGE_SIZE = 1000
+
+
+def measure(fn: Callable[[], int], repeat: int) -> Dict[str, float]:
+    """Run ``fn`` (which returns a row count) ``repeat`` times; report median/best/worst in ms."""
+    times: List[float] = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = fn()
+        times.append(time.perf_counter() - started)
+    median = statistics.median(times)
+    return {
+        "runs": repeat,
+        "rows": rows,
+        "median_ms": median * 1000,
+        "min_ms": min(times) * 1000,
+        "max_ms": max(times) * 1000,
+        "rows_per_sec": rows / median if median else 0.0,
+    }
+
+
+def bench_import(
+    results: Dict[str, Dict[str, float]], csv_path: Path, db_path: Path, small_csv: Path, layout: str
+) -> None:
+    for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        path.unlink(missing_ok=True)
+
+    def bulk() -> int:
+        conn = dm.connect_db(str(db_path))
+        inserted, skipped = dm.import_csv(conn, str(csv_path), bulk=True, layout=layout)
+        conn.execute("ANALYZE")
+        conn.close()
+        return inserted + skipped
+
+    results["import.bulk"] = measure(bulk, 1)
+
+    scratch = db_path.with_name(db_path.stem + "_incremental.db")
+
+    def incremental() -> int:
+        scratch.unlink(missing_ok=True)
+        conn = dm.connect_db(str(scratch))
+        inserted, skipped = dm.import_csv(conn, str(small_csv), layout=layout)
+        conn.close()
+        return inserted + skipped
+
+    results["import.incremental"] = measure(incremental, 1)
+    scratch.unlink(missing_ok=True)
+
+
+def run_query(conn: sqlite3.Connection, filters: Dict[str, str], fts: bool, rank: bool = False) -> int:
+    sql, params = dm.build_select(
+        filters, fts=fts, rank=rank, descending=True, limit=PAGE_SIZE, lookup_ids=dm.filter_lookup_ids(conn, filters)
+    )
+    return len(conn.execute(sql, params).fetchall())
+
+
+def bench_queries(results: Dict[str, Dict[str, float]], conn: sqlite3.Connection, repeat: int) -> None:
+    fts = dm.has_fts(conn)
+    for name, filters in QUERY_SHAPES.items():
+        results[f"query.{name}"] = measure(lambda: run_query(conn, filters, fts), repeat)
+        if fts and any(key in dm.CONTAINS_FILTERS for key in filters):
+            # The same shape without the FTS index, as with --no-fts.
+            results[f"query_like.{name}"] = measure(lambda: run_query(conn, filters, False), repeat)
+    if fts:
+        results["query.title_relevance"] = measure(
+            lambda: run_query(conn, QUERY_SHAPES["title_common"], True, rank=True), repeat
+        )
+
+
+def bench_app(results: Dict[str, Dict[str, float]], conn: sqlite3.Connection, repeat: int) -> None:
+    if not (importlib.util.find_spec("streamlit") and importlib.util.find_spec("pandas")):
+        print("Skipping app benchmarks: streamlit/pandas not installed")
+        return
+    # Importing app.py outside `streamlit run` logs warnings about the missing script context.
+    from streamlit.logger import set_log_level
+
+    set_log_level("error")
+    import app
+
+    for name in APP_SHAPES:
+        filters = QUERY_SHAPES[name]
+        results[f"app_search.{name}"] = measure(lambda: len(app.search_database(conn, filters, PAGE_SIZE)[0]), repeat)
+
+
+def bench_engine(results: Dict[str, Dict[str, float]], conn: sqlite3.Connection, repeat: int) -> None:
+    if not (importlib.util.find_spec("numpy") and importlib.util.find_spec("pandas")):
+        print("Skipping engine benchmarks: numpy/pandas not installed")
+        return
+    from prgi_engine import ColumnarEngine
+
+    engine: Optional[ColumnarEngine] = None
+
+    def load() -> int:
+        nonlocal engine
+        engine = ColumnarEngine.from_db(conn)
+        return len(engine)
+
+    results["engine.load"] = measure(load, 1)
+    print(f"Engine: {engine.nbytes / 1e6:.1f} MB in memory")
+    for name, filters in QUERY_SHAPES.items():
+        results[f"engine.{name}"] = measure(
+            lambda: len(engine.search_page(filters, PAGE_SIZE, descending=True)[0]), repeat
+        )
+
+
+def bench_export(results: Dict[str, Dict[str, float]], conn: sqlite3.Connection, workdir: Path, repeat: int) -> None:
+    out_path = workdir / "export.csv"
+    fts = dm.has_fts(conn)
+    for name in ("state_common", "no_filters"):
+
+        def export() -> int:
+            filters = QUERY_SHAPES[name]
+            sql, params = dm.build_select(filters, fts=fts, lookup_ids=dm.filter_lookup_ids(conn, filters))
+            cursor = conn.execute(sql, params)
+            return dm.export_cursor(cursor, str(out_path), head=cursor.fetchmany(1000))
+
+        results[f"export.{name}"] = measure(export, repeat)
+    out_path.unlink(missing_ok=True)
+
+
+def bench_similar(results: Dict[str, Dict[str, float]], conn: sqlite3.Connection, repeat: int) -> None:
+    index: Optional[dm.TitleIndex] = None
+
+    def build() -> int:
+        nonlocal index
+        index = dm.TitleIndex.from_db(conn)
+        return len(index)
+
+    results["similar.build"] = measure(build, 1)
+    for title in ("Dainik Jagran", "Rashtriya Samaachar Times", "Mathrubhumi"):
+        key = f"similar.search.{title.split()[0].lower()}"
+        results[key] = measure(lambda: len(index.search(title, limit=10)), repeat)
+
+
+def bench_parse(results: Dict[str, Dict[str, float]], pages: int, repeat: int) -> None:
+    documents = [synthetic_page(page, 1000) for page in range(1, pages + 1)]
+    results[f"parse.{scrape_prgi.DEFAULT_PARSER}"] = measure(
+        lambda: sum(len(scrape_prgi.parse_table_from_html(doc)) for doc in documents), repeat
+    )
+
+
+def run_metadata(rows: int, seed: int, layout: str, db_path: Path) -> Dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "rows": rows,
+        "seed": seed,
+        "layout": layout,
+        "db_bytes": db_path.stat().st_size if db_path.exists() else 0,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "fts": dm.fts_supported(),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], rows: int, baseline_path: Path, tolerance: float) -> List[str]:
+    """Print median changes against a saved run; returns the cases slower than ``tolerance`` allows."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if baseline["meta"]["rows"] != rows:
+        print(f"Warning: the baseline used {baseline['meta']['rows']:,} rows, this run {rows:,}")
+    old_results = baseline["results"]
+    regressions = []
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit') or 'unknown commit'}):")
+    for name, result in results.items():
+        old = old_results.get(name)
+        if not old or not old["median_ms"]:
+            continue
+        ratio = result["median_ms"] / old["median_ms"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / (1 + tolerance):
+            flag = "  faster"
+        print(f"  {name:<36} {old['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PRGI import, query, export and parse paths")
+    parser.add_argument("--rows", default="100k", help="Dataset size: 10k, 100k, 1M, 10M or an integer")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset seed")
+    parser.add_argument("--layout", choices=dm.LAYOUTS, default="row", help="Storage layout of the benchmark DB")
+    parser.add_argument("--workdir", default="bench/data", help="Where datasets and the benchmark DB are kept")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"Comma-separated groups to run: {','.join(GROUPS)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the median is reported")
+    parser.add_argument(
+        "--incremental-rows", default="20k", help="Rows for the non-bulk import case (it is much slower than bulk)"
+    )
+    parser.add_argument("--parse-pages", type=int, default=3, help="Synthetic 1000-row pages for the parse case")
+    parser.add_argument("--json", default="", help="Optional path for JSON results")
+    parser.add_argument("--compare", default="", help="Earlier --json results to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Median slowdown (0.25 = 25%%) reported as a regression"
+    )
+    args = parser.parse_args()
+
+    groups = {group.strip() for group in args.only.split(",") if group.strip()}
+    unknown = groups - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(sorted(unknown))}")
+    rows = parse_size(args.rows)
+    workdir = Path(args.workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+    suffix = "" if args.layout == "row" else f"_{args.layout}"
+    db_path = workdir / f"prgi_{rows}_s{args.seed}{suffix}.db"
+    results: Dict[str, Dict[str, float]] = {}
+
+    started = time.perf_counter()
+    csv_path = dataset(workdir, rows, args.seed)
+    print(f"Dataset {csv_path} ({rows:,} rows) ready in {time.perf_counter() - started:.1f}s")
+
+    if "import" in groups or not db_path.exists():
+        small_csv = dataset(workdir, min(rows, parse_size(args.incremental_rows)), args.seed)
+        bench_import(results, csv_path, db_path, small_csv, args.layout)
+        print(f"{db_path}: {db_path.stat().st_size / 1e6:.1f} MB ({args.layout} layout)")
+
+    if groups & {"query", "app", "engine", "export", "similar"}:
+        conn = dm.connect_readonly(str(db_path))
+        if "query" in groups:
+            bench_queries(results, conn, args.repeat)
+        if "app" in groups:
+            bench_app(results, conn, args.repeat)
+        if "engine" in groups:
+            bench_engine(results, conn, args.repeat)
+        if "export" in groups:
+            bench_export(results, conn, workdir, max(1, args.repeat // 2))
+        if "similar" in groups:
+            bench_similar(results, conn, args.repeat)
+        conn.close()
+
+    if "parse" in groups:
+        bench_parse(results, args.parse_pages, args.repeat)
+
+    for name, r in results.items():
+        print(f"{name:<36} {r['median_ms']:>10.2f} ms (best {r['min_ms']:.2f})  {r['rows']:>10,} rows")
+
+    output = {"meta": run_metadata(rows, args.seed, args.layout, db_path), "results": results}
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(output, indent=2), encoding="utf-8")
+        print(f"Saved results to {args.json}")
+    if args.compare:
+        regressions = compare(results, rows, Path(args.compare), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
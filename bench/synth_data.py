@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Synthetic PRGI registration data for benchmarks.
+
+Rows look like the scraped listing: skewed state and language mixes,
+romanized Indic titles with spelling variants, ~1% exact duplicates (skipped
+on import) and extra columns that end up in meta_json. Output is
+deterministic for a given seed, so runs at the same size are comparable.
+
+Example:
+  python bench/synth_data.py --rows 100k --output bench/data/prgi_100k.csv
+  python bench/synth_data.py --rows 1M --seed 7 --output bench/data/prgi_1m.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import html
+import itertools
+import random
+import time
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple
+
+HEADERS = [
+    "Sr No",
+    "Title Name",
+    "Registration Number",
+    "Owner Name",
+    "Publication State",
+    "Publication District",
+    "Languages",
+    "Class",
+    # Not canonical columns: imported into meta_json.
+    "Periodicity",
+    "Registration Date",
+]
+
+# (state, code, main language, districts), most registrations first.
+STATES: List[Tuple[str, str, str, Sequence[str]]] = [
+    ("Uttar Pradesh", "UP", "Hindi", ["Lucknow", "Kanpur", "Varanasi", "Agra", "Prayagraj", "Meerut"]),
+    ("Maharashtra", "MAH", "Marathi", ["Mumbai", "Pune", "Nagpur", "Nashik", "Aurangabad", "Thane"]),
+    ("Delhi", "DEL", "Hindi", ["New Delhi", "North Delhi", "South Delhi", "East Delhi"]),
+    ("Madhya Pradesh", "MP", "Hindi", ["Bhopal", "Indore", "Jabalpur", "Gwalior"]),
+    ("Rajasthan", "RAJ", "Hindi", ["Jaipur", "Jodhpur", "Udaipur", "Kota", "Bikaner"]),
+    ("West Bengal", "WB", "Bengali", ["Kolkata", "Howrah", "Siliguri", "Durgapur"]),
+    ("Tamil Nadu", "TN", "Tamil", ["Chennai", "Madurai", "Coimbatore", "Tiruchirappalli"]),
+    ("Karnataka", "KAR", "Kannada", ["Bengaluru Urban", "Mysuru", "Mangaluru", "Hubballi"]),
+    ("Gujarat", "GUJ", "Gujarati", ["Ahmedabad", "Surat", "Vadodara", "Rajkot"]),
+    ("Bihar", "BIH", "Hindi", ["Patna", "Gaya", "Muzaffarpur", "Bhagalpur"]),
+    ("Andhra Pradesh", "AP", "Telugu", ["Visakhapatnam", "Vijayawada", "Guntur"]),
+    ("Telangana", "TEL", "Telugu", ["Hyderabad", "Warangal", "Karimnagar"]),
+    ("Kerala", "KER", "Malayalam", ["Thiruvananthapuram", "Kochi", "Kozhikode"]),
+    ("Punjab", "PUN", "Punjabi", ["Ludhiana", "Amritsar", "Jalandhar"]),
+    ("Odisha", "ORI", "Odia", ["Bhubaneswar", "Cuttack", "Puri"]),
+    ("Assam", "ASS", "Assamese", ["Guwahati", "Dibrugarh"]),
+    ("Haryana", "HAR", "Hindi", ["Gurugram", "Faridabad", "Hisar"]),
+    ("Jharkhand", "JHA", "Hindi", ["Ranchi", "Jamshedpur", "Dhanbad"]),
+    ("Chhattisgarh", "CHH", "Hindi", ["Raipur", "Bilaspur"]),
+    ("Uttarakhand", "UTT", "Hindi", ["Dehradun", "Haridwar"]),
+    ("Jammu and Kashmir", "JK", "Urdu", ["Srinagar", "Jammu"]),
+    ("Himachal Pradesh", "HP", "Hindi", ["Shimla", "Mandi"]),
+    ("Goa", "GOA", "Konkani", ["North Goa", "South Goa"]),
+    ("Manipur", "MAN", "Manipuri", ["Imphal West"]),
+    ("Tripura", "TRI", "Bengali", ["West Tripura"]),
+]
+LANGUAGE_CODES = {
+    "Hindi": "HIN",
+    "English": "ENG",
+    "Marathi": "MAR",
+    "Bengali": "BEN",
+    "Tamil": "TAM",
+    "Kannada": "KAN",
+    "Gujarati": "GUJ",
+    "Telugu": "TEL",
+    "Malayalam": "MAL",
+    "Punjabi": "PUN",
+    "Odia": "ORI",
+    "Assamese": "ASS",
+    "Urdu": "URD",
+    "Konkani": "KON",
+    "Manipuri": "MAN",
+    "Bilingual": "BIL",
+}
+CLASSES = ["Newspaper", "Periodical"]
+PERIODICITIES = ["Daily", "Weekly", "Fortnightly", "Monthly", "Quarterly", "Annual"]
+
+# Title vocabulary; each entry lists spelling variants of one word, the first being the most common.
+PREFIXES = [
+    ["Dainik"], ["Saptahik", "Saptaahik"], ["Rashtriya", "Rastriya"], ["Lok"], ["Jan"], ["Nav", "Nava"],
+    ["Aaj", "Aj"], ["Sandhya"], ["Pratah", "Prataha"], ["Prabhat"], ["Hindustan"], ["Bharat"],
+]
+CORES = [
+    ["Jagran", "Jaagran"], ["Samachar", "Samaachar", "Samacharr"], ["Bhaskar", "Bhasker"], ["Sandesh"],
+    ["Darpan"], ["Vani", "Vaani"], ["Awaz", "Awaaz", "Avaz"], ["Kesari"], ["Mitra", "Mitr"], ["Patrika"],
+    ["Varta", "Vaarta"], ["Jyoti", "Jyothi"], ["Prakash"], ["Khabar", "Khabhar"], ["Chetna", "Chetana"],
+    ["Kranti"], ["Sakal"], ["Lokmat"], ["Anand Bazar"], ["Dinamani"], ["Eenadu"], ["Mathrubhumi"],
+]
+SUFFIXES = ["", "", "", "Times", "Express", "News", "Today", "Weekly", "Bulletin", "Herald", "Post", "Chronicle"]
+FIRST_NAMES = [
+    "Ramesh", "Sunita", "Anil", "Kavita", "Suresh", "Priya", "Rajesh", "Meena", "Vijay", "Anita",
+    "Mohammed", "Fatima", "Arun", "Lakshmi", "Sanjay", "Deepa", "Harish", "Geeta", "Manoj", "Rekha",
+]
+SURNAMES = [
+    "Sharma", "Singh", "Patil", "Iyer", "Gupta", "Verma", "Reddy", "Nair", "Das", "Khan",
+    "Joshi", "Kulkarni", "Banerjee", "Chatterjee", "Pillai", "Yadav", "Mishra", "Shah", "Rao", "Mehta",
+]
+COMPANY_SUFFIXES = ["", "", "", " & Sons", " Publications Pvt. Ltd.", " Media Trust", " Prakashan"]
+
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+DUPLICATE_RATE = 0.01
+
+
+def parse_size(text: str) -> int:
+    """Row count from '10k', '1M', '2.5m' or a plain integer."""
+    text = text.strip().lower().replace("_", "")
+    scale = SIZE_SUFFIXES.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    """Cumulative Zipf weights for n ranked choices."""
+    return list(itertools.accumulate(1 / (rank**s) for rank in range(1, n + 1)))
+
+
+def pick_variant(rng: random.Random, variants: Sequence[str]) -> str:
+    # The common spelling most of the time, a variant otherwise.
+    return variants[0] if len(variants) == 1 or rng.random() < 0.8 else rng.choice(variants[1:])
+
+
+def generate_rows(count: int, seed: int = 0) -> Iterator[List[str]]:
+    """Yield ``count`` CSV rows in HEADERS order."""
+    rng = random.Random(seed)
+    state_weights = zipf_weights(len(STATES), 0.9)
+    prefix_weights = zipf_weights(len(PREFIXES))
+    core_weights = zipf_weights(len(CORES), 0.8)
+    recent: List[List[str]] = []
+    serial = 0
+    for sr in range(1, count + 1):
+        if recent and rng.random() < DUPLICATE_RATE:
+            # Same registration listed twice, as the live listing sometimes does.
+            row = list(rng.choice(recent))
+            row[0] = str(sr)
+            yield row
+            continue
+        state, code, main_language, districts = rng.choices(STATES, cum_weights=state_weights)[0]
+        roll = rng.random()
+        language = main_language if roll < 0.6 else "English" if roll < 0.85 else "Hindi" if roll < 0.95 else "Bilingual"
+        words = []
+        if rng.random() < 0.7:
+            words.append(pick_variant(rng, rng.choices(PREFIXES, cum_weights=prefix_weights)[0]))
+        words.append(pick_variant(rng, rng.choices(CORES, cum_weights=core_weights)[0]))
+        if rng.random() < 0.2:
+            words.append(rng.choice(districts))
+        suffix = rng.choice(SUFFIXES)
+        if suffix:
+            words.append(suffix)
+        title = " ".join(words)
+        if rng.random() < 0.05:
+            title = title.upper()
+        owner = f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}{rng.choice(COMPANY_SUFFIXES)}"
+        year = rng.randint(1950, 2024)
+        serial += 1
+        row = [
+            str(sr),
+            title,
+            f"{code}{LANGUAGE_CODES[language]}/{year}/{serial:05d}",
+            owner,
+            state,
+            rng.choice(districts),
+            language,
+            CLASSES[0] if rng.random() < 0.35 else CLASSES[1],
+            rng.choice(PERIODICITIES),
+            f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        ]
+        if len(recent) < 1000:
+            recent.append(row)
+        else:
+            recent[rng.randrange(1000)] = row
+        yield row
+
+
+def write_csv(path: Path, count: int, seed: int = 0) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(generate_rows(count, seed))
+    return path
+
+
+def dataset(directory: Path, count: int, seed: int = 0) -> Path:
+    """Path of the cached CSV for (count, seed), generated on first use."""
+    path = directory / f"prgi_{count}_s{seed}.csv"
+    if not path.exists():
+        tmp = path.with_suffix(".csv.part")
+        write_csv(tmp, count, seed)
+        tmp.replace(path)
+    return path
+
+
+def synthetic_page(page: int, rows: int, seed: int = 0) -> str:
+    """One listing page: thead/tbody table with links, <br> and entities in cells."""
+    body = []
+    for i, record in enumerate(generate_rows(rows, seed * 100003 + page)):
+        sr = (page - 1) * rows + i + 1
+        title, reg, owner, state, district, language, class_name = record[1:8]
+        body.append(
+            "<tr>\n"
+            f"  <td>{sr}</td>\n"
+            f'  <td><a href="/title/{sr}">{html.escape(title)}</a></td>\n'
+            f"  <td>{reg}</td>\n"
+            f"  <td>{html.escape(owner)}<br>\n    <small>Publisher</small></td>\n"
+            f"  <td>{state}</td>\n"
+            f"  <td>{district}</td>\n"
+            f"  <td>{language}</td>\n"
+            f"  <td>{class_name}</td>\n"
+            "</tr>"
+        )
+    head = "".join(f"<th>{h}</th>" for h in HEADERS[:8])
+    return (
+        "<!DOCTYPE html><html><head><title>Registration Title Details</title>"
+        "<script>var cfg = {items: 1000};</script></head><body>"
+        '<div class="container"><table class="table table-striped">'
+        f"<thead><tr>{head}</tr></thead><tbody>\n" + "\n".join(body) + "\n</tbody></table></div></body></html>"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic PRGI registrations CSV")
+    parser.add_argument("--rows", default="100k", help="Row count: 10k, 100k, 1M, 10M or an integer")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same file")
+    parser.add_argument("--output", required=True, help="CSV file to write")
+    args = parser.parse_args()
+
+    count = parse_size(args.rows)
+    started = time.perf_counter()
+    write_csv(Path(args.output), count, args.seed)
+    print(f"Wrote {count:,} rows to {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,79 @@
 
 This script automatically launches the Streamlit web application.
 Run: python main.py
+Startup timings: python main.py --profile-startup
 """
 
+import argparse
+import importlib
+import importlib.util
 import subprocess
 import sys
-import os
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
 from pathlib import Path
 
+REQUIRED_PACKAGES = ("streamlit", "pandas")
+PORT = 8501
+
+class StartupProfile:
+    """Wall-clock time and modules imported per startup step, printed with --profile-startup."""
+    
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.steps = []
+    
+    @contextmanager
+    def step(self, name):
+        before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - start, len(sys.modules) - before))
+    
+    def report(self):
+        if not self.enabled:
+            return
+        print("\n⏱️  Startup profile")
+        for name, seconds, modules in self.steps:
+            print(f"   {name:<32} {seconds * 1000:8.1f} ms  {modules:5d} modules")
+        elapsed = time.perf_counter() - self.started
+        print(f"   {'total before server start':<32} {elapsed * 1000:8.1f} ms  {len(sys.modules):5d} loaded")
+        print("   pandas is imported by app.py on the first search, not at startup.")
+        print("   Per-module detail: python -X importtime main.py --profile-startup\n")
+    
+    def watch_server(self):
+        """Report when the server answers its health check (the first page can be served from then on)."""
+        if not self.enabled:
+            return
+        
+        def poll():
+            url = f"http://localhost:{PORT}/_stcore/health"
+            deadline = time.monotonic() + 60
+            while time.monotonic() < deadline:
+                try:
+                    with urllib.request.urlopen(url, timeout=1):
+                        break
+                except OSError:
+                    time.sleep(0.05)
+            else:
+                return
+            print(f"⏱️  Server ready {time.perf_counter() - self.started:.2f}s after launch")
+        
+        threading.Thread(target=poll, daemon=True).start()
+
 def check_dependencies():
-    """Check if required packages are installed."""
-    try:
-        import streamlit
-        import pandas
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    """Check if required packages are installed, without importing them."""
+    missing = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("Installing required packages...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "-q"])
+        importlib.invalidate_caches()
         print("✅ Dependencies installed successfully!")
 
 def check_database():
@@ -31,13 +88,19 @@ def check_database():
         if csv_path.exists():
             print("📊 CSV file found. Importing data into database...")
             print("This may take a minute...\n")
-            subprocess.check_call([
-                sys.executable, 
-                "prgi_data_manager.py", 
-                "import", 
-                "--csv", str(csv_path),
-                "--db", str(db_path)
-            ])
+            from prgi_data_manager import connect_db, import_csv
+            
+            conn = connect_db(str(db_path))
+            try:
+                # A fresh file, so load it in one bulk transaction.
+                inserted, skipped = import_csv(conn, str(csv_path), bulk=True)
+                conn.execute("ANALYZE")
+            except BaseException:
+                conn.close()
+                db_path.unlink(missing_ok=True)
+                raise
+            conn.close()
+            print(f"Import complete. Inserted={inserted}, Skipped(duplicates)={skipped}")
             print("\n✅ Database created successfully!")
         else:
             print(f"❌ CSV file '{csv_path}' not found!")
@@ -51,42 +114,57 @@ def check_database():
     
     return True
 
-def launch_app():
-    """Launch the Streamlit application."""
+def launch_app(profile):
+    """Launch the Streamlit application in this process."""
+    with profile.step("import streamlit"):
+        from streamlit.web import cli as stcli
+    
     print("\n🚀 Starting PRGI Data Search Application...")
     print("📱 The app will open in your default browser")
-    print("🔗 URL: http://localhost:8501")
+    print(f"🔗 URL: http://localhost:{PORT}")
     print("\n💡 Press Ctrl+C to stop the server\n")
     print("="*60)
+    profile.report()
+    profile.watch_server()
     
+    sys.argv = [
+        "streamlit",
+        "run",
+        "app.py",
+        f"--server.port={PORT}",
+        "--server.headless=true",
+        "--browser.gatherUsageStats=false"
+    ]
     try:
-        subprocess.run([
-            sys.executable,
-            "-m",
-            "streamlit",
-            "run",
-            "app.py",
-            "--server.port=8501",
-            "--server.headless=true",
-            "--browser.gatherUsageStats=false"
-        ])
+        stcli.main()
     except KeyboardInterrupt:
         print("\n\n👋 Application stopped. Goodbye!")
         sys.exit(0)
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Launch the PRGI Data Search web application")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print how long each startup step and its imports take, and when the server is ready"
+    )
+    args = parser.parse_args()
+    profile = StartupProfile(args.profile_startup)
+    
     print("="*60)
     print("🔍 PRGI Data Search - Database Management System")
     print("="*60)
     
     print("\n📋 Checking system requirements...")
-    check_dependencies()
+    with profile.step("dependency check"):
+        check_dependencies()
     
-    if not check_database():
-        sys.exit(1)
+    with profile.step("database check"):
+        if not check_database():
+            sys.exit(1)
     
-    launch_app()
+    launch_app(profile)
 
 if __name__ == "__main__":
     main()
@@ -5,22 +5,69 @@ Typical flow:
   1) Import scraped CSV into SQLite DB
      python prgi_data_manager.py import --csv prgi_77000.csv --db prgi_data.db
 
+     Large loads: one transaction, relaxed durability, indexes rebuilt once at the end
+     python prgi_data_manager.py import --csv prgi_77000.csv --db prgi_data.db --bulk
+
+     Multi-GB files: parse and canonicalize CSV chunks in 4 worker processes
+     python prgi_data_manager.py import --csv big.csv --db prgi_data.db --bulk --workers 4
+
   2) Filter records and print/save
      python prgi_data_manager.py query --db prgi_data.db --state Maharashtra --language Hindi --limit 50
      python prgi_data_manager.py query --db prgi_data.db --owner "Ramesh" --export filtered.csv
+
+     Page through results: each page prints the --after-id token for the next one
+     python prgi_data_manager.py query --db prgi_data.db --state Maharashtra --limit 50 --after-id 1234
+
+     Stream every match to CSV in constant memory
+     python prgi_data_manager.py query --db prgi_data.db --language Hindi --limit 0 --export hindi.csv
+
+     Title/owner/registration searches use the FTS5 index; every word must match, best matches first
+     python prgi_data_manager.py query --db prgi_data.db --title "times india" --order relevance
+
+     Titles that sound the same despite spelling ("Samaachaar", "समाचार" -> "Samachar")
+     python prgi_data_manager.py query --db prgi_data.db --sounds-like "Dainik Jaagran"
+
+  3) Check a proposed title against existing ones
+     python prgi_data_manager.py similar --db prgi_data.db --title "Dainik Jagran Times" --limit 10
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import io
 import json
+import queue
+import re
 import sqlite3
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
 
 TABLE_NAME = "registrations"
 
+T = TypeVar("T")
+
 # Canonical columns for a normalized table. Extra fields from CSV are stored in meta_json.
 CANONICAL_COLUMNS = [
     "sr_no",
@@ -53,6 +100,174 @@ ALIASES = {
     "class name": "class_name",
 }
 
+# Connection settings for import --bulk; the previous values come back afterwards.
+BULK_PRAGMAS = {
+    "synchronous": "OFF",
+    "cache_size": -262144,  # 256 MiB
+    "temp_store": "MEMORY",
+}
+
+
+# Secondary (non-unique) indexes. The unique index stays in place during bulk
+# loads because INSERT OR IGNORE relies on it to skip duplicates.
+# Filters compare case-insensitively with "col = ? COLLATE NOCASE", so the
+# indexes are built with the same collation for SQLite to use them.
+SECONDARY_INDEXES = {
+    f"idx_{TABLE_NAME}_state": "pub_state_name COLLATE NOCASE",
+    f"idx_{TABLE_NAME}_dist": "pub_dist_name COLLATE NOCASE",
+    f"idx_{TABLE_NAME}_language": "language COLLATE NOCASE",
+    f"idx_{TABLE_NAME}_class": "class_name COLLATE NOCASE",
+    f"idx_{TABLE_NAME}_owner": "owner_name COLLATE NOCASE",
+    f"idx_{TABLE_NAME}_phonetic": "title_phonetic",
+}
+
+# Contains-searches (filter key -> column) go through the FTS index when it exists;
+# exact-match filters use the NOCASE indexes above.
+CONTAINS_FILTERS = {"title": "title_name", "owner": "owner_name", "registration_number": "registration_number"}
+EXACT_FILTERS = {
+    "state": "pub_state_name",
+    "district": "pub_dist_name",
+    "language": "language",
+    "class_name": "class_name",
+}
+
+# facet_cube holds the record count of every (state, district, language, class)
+# combination, kept current by triggers; dropdown options and their counts are
+# small aggregates over it. The same triggers keep db_meta's total_records and
+# the version stamp that readers cache on.
+FACET_COLUMNS = ("pub_state_name", "pub_dist_name", "language", "class_name")
+
+_CUBE_COLS = ", ".join(FACET_COLUMNS)
+_CUBE_KEY = ", ".join(f"COALESCE({c}, '')" for c in FACET_COLUMNS)
+
+# Optional dictionary-encoded storage ("dict" layout): the facet columns are kept
+# as integer ids into small lookup tables in DATA_TABLE, and TABLE_NAME becomes a
+# view joining the text back in, so readers see the same columns in either layout.
+# build_select() queries DATA_TABLE directly there, so facet filters compare ids.
+LAYOUTS = ("row", "dict")
+DATA_TABLE = f"{TABLE_NAME}_data"
+LOOKUP_IDS = {
+    "pub_state_name": "pub_state_id",
+    "pub_dist_name": "pub_dist_id",
+    "language": "language_id",
+    "class_name": "class_id",
+}
+ALL_COLUMNS = ["id", *CANONICAL_COLUMNS, "meta_json", "title_phonetic"]
+
+# The dict layout indexes the integer ids instead of the repeated text.
+DICT_INDEXES = {
+    f"idx_{DATA_TABLE}_state": "pub_state_id",
+    f"idx_{DATA_TABLE}_dist": "pub_dist_id",
+    f"idx_{DATA_TABLE}_language": "language_id",
+    f"idx_{DATA_TABLE}_class": "class_id",
+    f"idx_{DATA_TABLE}_owner": "owner_name COLLATE NOCASE",
+    f"idx_{DATA_TABLE}_phonetic": "title_phonetic",
+}
+
+
+def lookup_table(column: str) -> str:
+    return f"lookup_{column}"
+
+
+def _row_value(row: str, column: str) -> str:
+    return f"{row}.{column}"
+
+
+def _lookup_value(row: str, column: str) -> str:
+    return f"(SELECT value FROM {lookup_table(column)} WHERE id = {row}.{LOOKUP_IDS[column]})"
+
+
+def _lookup_id(row: str, column: str) -> str:
+    return f"(SELECT id FROM {lookup_table(column)} WHERE value = {row}.{column})"
+
+
+def _meta_bump(total_delta: int) -> str:
+    keys = "('version', 'total_records')" if total_delta else "('version')"
+    delta = f"CASE key WHEN 'version' THEN 1 ELSE {total_delta} END"
+    return f"UPDATE db_meta SET value = CAST(value AS INTEGER) + {delta} WHERE key IN {keys};"
+
+
+def _facet_triggers(table: str, value: Callable[[str, str], str], watched: str) -> Dict[str, str]:
+    """Cube triggers on ``table``; ``value(row, column)`` is the SQL for a facet value of the new/old row."""
+    new = ", ".join(f"COALESCE({value('new', c)}, '')" for c in FACET_COLUMNS)
+    old_key = " AND ".join(f"{c} = COALESCE({value('old', c)}, '')" for c in FACET_COLUMNS)
+    add = (
+        f"INSERT INTO facet_cube ({_CUBE_COLS}, count) VALUES ({new}, 1) "
+        f"ON CONFLICT ({_CUBE_COLS}) DO UPDATE SET count = count + 1;"
+    )
+    remove = (
+        f"UPDATE facet_cube SET count = count - 1 WHERE {old_key}; "
+        f"DELETE FROM facet_cube WHERE {old_key} AND count <= 0;"
+    )
+    return {
+        "facet_cube_ai": f"AFTER INSERT ON {table} BEGIN {add} {_meta_bump(1)} END",
+        "facet_cube_ad": f"AFTER DELETE ON {table} BEGIN {remove} {_meta_bump(-1)} END",
+        "facet_cube_au": f"AFTER UPDATE OF {watched} ON {table} BEGIN {remove} {add} {_meta_bump(0)} END",
+    }
+
+
+FACET_TRIGGERS = _facet_triggers(TABLE_NAME, _row_value, _CUBE_COLS)
+DICT_FACET_TRIGGERS = _facet_triggers(DATA_TABLE, _lookup_value, ", ".join(LOOKUP_IDS.values()))
+
+# External-content FTS5 table over the searchable columns. The trigram tokenizer
+# indexes every 3-character window, so MATCH keeps LIKE's substring semantics;
+# words shorter than FTS_MIN_TERM cannot be looked up and fall back to LIKE.
+FTS_TABLE = f"{TABLE_NAME}_fts"
+FTS_COLUMNS = ("title_name", "owner_name", "registration_number")
+FTS_MIN_TERM = 3
+
+_FTS_COLS = ", ".join(FTS_COLUMNS)
+_FTS_NEW = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+_FTS_OLD = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+_FTS_INSERT = f"INSERT INTO {FTS_TABLE} (rowid, {_FTS_COLS}) VALUES (new.id, {_FTS_NEW});"
+_FTS_DELETE = f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {_FTS_COLS}) VALUES ('delete', old.id, {_FTS_OLD});"
+
+
+def _fts_triggers(table: str) -> Dict[str, str]:
+    return {
+        f"{FTS_TABLE}_ai": f"AFTER INSERT ON {table} BEGIN {_FTS_INSERT} END",
+        f"{FTS_TABLE}_ad": f"AFTER DELETE ON {table} BEGIN {_FTS_DELETE} END",
+        f"{FTS_TABLE}_au": f"AFTER UPDATE OF {_FTS_COLS} ON {table} BEGIN {_FTS_DELETE} {_FTS_INSERT} END",
+    }
+
+
+FTS_TRIGGERS = _fts_triggers(TABLE_NAME)
+DICT_FTS_TRIGGERS = _fts_triggers(DATA_TABLE)
+
+
+# The dict layout's view columns, and the same joins for build_select(), which reads DATA_TABLE under
+# the view's name so every "registrations.<column>" clause works unchanged.
+def _dict_columns(alias: str) -> Dict[str, str]:
+    return {c: f"l_{c}.value" if c in LOOKUP_IDS else f"{alias}.{c}" for c in ALL_COLUMNS}
+
+
+def _dict_joins(alias: str) -> str:
+    return " ".join(
+        f"LEFT JOIN {lookup_table(c)} AS l_{c} ON l_{c}.id = {alias}.{id_column}" for c, id_column in LOOKUP_IDS.items()
+    )
+
+
+_VIEW_COLUMNS = ", ".join(f"{expr} AS {c}" for c, expr in _dict_columns(DATA_TABLE).items())
+_DATA_WRITE_COLS = ", ".join(LOOKUP_IDS.get(c, c) for c in ALL_COLUMNS[1:])
+_VIEW_NEW = ", ".join(_lookup_id("new", c) if c in LOOKUP_IDS else f"new.{c}" for c in ALL_COLUMNS[1:])
+_ADD_LOOKUPS = " ".join(
+    f"INSERT OR IGNORE INTO {lookup_table(c)} (value) SELECT new.{c} WHERE new.{c} IS NOT NULL;" for c in LOOKUP_IDS
+)
+# Writes through the view (ad-hoc SQL; the importer writes DATA_TABLE directly).
+VIEW_TRIGGERS = {
+    f"{TABLE_NAME}_view_ins": (
+        f"INSTEAD OF INSERT ON {TABLE_NAME} BEGIN {_ADD_LOOKUPS} "
+        f"INSERT INTO {DATA_TABLE} (id, {_DATA_WRITE_COLS}) VALUES (new.id, {_VIEW_NEW}); END"
+    ),
+    f"{TABLE_NAME}_view_del": (
+        f"INSTEAD OF DELETE ON {TABLE_NAME} BEGIN DELETE FROM {DATA_TABLE} WHERE id = old.id; END"
+    ),
+    f"{TABLE_NAME}_view_upd": (
+        f"INSTEAD OF UPDATE ON {TABLE_NAME} BEGIN {_ADD_LOOKUPS} "
+        f"UPDATE {DATA_TABLE} SET ({_DATA_WRITE_COLS}) = ({_VIEW_NEW}) WHERE id = old.id; END"
+    ),
+}
+
 
 def normalize_header(name: str) -> str:
     if name is None or not name:
@@ -61,9 +276,205 @@ def normalize_header(name: str) -> str:
     return ALIASES.get(key, key.replace(" ", "_"))
 
 
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def title_key(title: str) -> str:
+    """Lowercase a title and collapse punctuation and spacing for comparison."""
+    return _NON_ALNUM.sub(" ", title.casefold()).strip()
+
+
+# Devanagari -> Latin, close to how Hindi/Marathi titles get romanized. Consonants
+# carry an inherent "a" that a vowel sign replaces and a virama removes.
+_DEVANAGARI_CONSONANTS = dict(
+    zip(
+        "कखगघङचछजझञटठडढणतथदधनपफबभमयरलळवशषसह",
+        "k kh g gh n ch chh j jh n t th d dh n t th d dh n p ph b bh m y r l l v sh sh s h".split(),
+    )
+)
+_DEVANAGARI_VOWEL_SIGNS = dict(zip("ािीुूृेैोौॅॉ", "aa i ii u uu ri e ai o au e o".split()))
+_DEVANAGARI_OTHER = dict(
+    zip("अआइईउऊऋएऐओऔंँः०१२३४५६७८९", "a aa i ii u uu ri e ai o au n n h 0 1 2 3 4 5 6 7 8 9".split())
+)
+_VIRAMA, _NUKTA = "\u094d", "\u093c"
+
+# Ordered rewrites that fold common spelling variants of romanized Indic words.
+_PHONETIC_RULES = [
+    (re.compile(pattern), replacement)
+    for pattern, replacement in (
+        (r"[\W_]+", ""),  # "Nav Bharat" == "Navbharat"
+        (r"tch", "ch"),  # "Kutch" == "Kachchh"
+        (r"c(?!h)|q", "k"),  # a lone Latin c is hard; "c" below stands for ch
+        (r"chh|ch", "c"),
+        (r"sh", "s"),
+        (r"ph", "f"),
+        (r"([bdgjkpt])h", r"\1"),  # aspirates: kh/gh/jh/th/dh/bh
+        (r"x", "ks"),
+        (r"w", "v"),
+        (r"z", "j"),
+    )
+]
+_INNER_VOWELS = re.compile(r"(?<=.)[aeiou]+")
+_REPEATS = re.compile(r"(.)\1+")
+
+
+def transliterate_devanagari(text: str) -> str:
+    out: List[str] = []
+    inherent = False
+    for ch in text:
+        if ch in _DEVANAGARI_CONSONANTS:
+            if inherent:
+                out.append("a")
+            out.append(_DEVANAGARI_CONSONANTS[ch])
+            inherent = True
+        elif ch in _DEVANAGARI_VOWEL_SIGNS:
+            out.append(_DEVANAGARI_VOWEL_SIGNS[ch])
+            inherent = False
+        elif ch == _VIRAMA:
+            inherent = False
+        elif ch == _NUKTA:
+            continue
+        else:
+            # Word-final inherent vowels are silent in Hindi/Marathi ("समाचार" -> "samaachaar").
+            if inherent and not ch.isspace():
+                out.append("a")
+            inherent = False
+            out.append(_DEVANAGARI_OTHER.get(ch, ch))
+    return "".join(out)
+
+
+def phonetic_key(title: str) -> str:
+    """Spelling-insensitive key for a title, stored in ``title_phonetic``.
+
+    Metaphone-style: Devanagari is transliterated, spacing and punctuation
+    dropped, aspirates and w/v, z/j style variants folded, vowels after the
+    first letter removed and repeated letters collapsed, so "Samachar",
+    "Samaachaar" and "समाचार" share the key "smcr".
+    """
+    key = transliterate_devanagari(title.casefold())
+    for pattern, replacement in _PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    key = _INNER_VOWELS.sub("", key)
+    return _REPEATS.sub(r"\1", key)
+
+
+def sounds_like_key(value: str) -> str:
+    """phonetic_key() of a sounds-like filter; ValueError when the value has nothing to key on (e.g. "!!!")."""
+    key = phonetic_key(value)
+    if not key:
+        raise ValueError(f"sounds-like value {value.strip()!r} has no letters or digits to match")
+    return key
+
+
 def connect_db(db_path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    ensure_schema(conn)
+    return conn
+
+
+def connect_readonly(db_path: str, mmap_mb: int = 256, cache_mb: int = 16) -> sqlite3.Connection:
+    """Open a read-only connection (``mode=ro`` URI) tuned for searches.
+
+    It may be handed between threads, but only one thread may use it at a
+    time; ``ReadPool`` takes care of that.
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=10, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size={mmap_mb * 1024 * 1024}")
+    conn.execute(f"PRAGMA cache_size=-{cache_mb * 1024}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+class ReadPool:
+    """Bounded pool of read-only connections, each checked out by one thread at a time.
+
+    Call ``prepare_for_readers()`` on the file first: in WAL mode readers run
+    in parallel with each other and with an import writing to the same
+    database, and sqlite3 releases the GIL while a query runs, so concurrent
+    searches spread across cores instead of queueing on one connection.
+    """
+
+    def __init__(self, db_path: str, size: int = 8, mmap_mb: int = 256, cache_mb: int = 16) -> None:
+        self.db_path = db_path
+        self.size = size
+        self.mmap_mb = mmap_mb
+        self.cache_mb = cache_mb
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = 30.0) -> Iterator[sqlite3.Connection]:
+        conn = self._checkout(timeout)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def _checkout(self, timeout: Optional[float]) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                opening = True
+            else:
+                opening = False
+        if opening:
+            try:
+                return connect_readonly(self.db_path, self.mmap_mb, self.cache_mb)
+            except BaseException:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        # Every connection is busy: wait for one to come back.
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No read connection to {self.db_path} became free within {timeout}s") from None
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def prepare_for_readers(db_path: str) -> None:
+    """Migrate the schema and switch the file to WAL, which read-only connections cannot do themselves."""
+    conn = connect_db(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        conn.close()
+
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """Create the table and indexes, migrating databases built by older versions."""
+    if storage_layout(conn) == "dict":
+        create_dict_tables(conn)
+    else:
+        create_row_table(conn)
+        add_phonetic_column(conn)
+    conn.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{TABLE_NAME}_unique ON {storage_table(conn)} "
+        f"(registration_number, title_name, owner_name)"
+    )
+    create_secondary_indexes(conn)
+    create_fts(conn)
+    create_facet_tables(conn)
+    conn.commit()
+
+
+def create_row_table(conn: sqlite3.Connection) -> None:
     conn.execute(
         f"""
         CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
@@ -76,19 +487,290 @@ def connect_db(db_path: str) -> sqlite3.Connection:
             pub_dist_name TEXT,
             language TEXT,
             class_name TEXT,
-            meta_json TEXT
+            meta_json TEXT,
+            title_phonetic TEXT
         )
         """
     )
+
+
+def create_dict_tables(conn: sqlite3.Connection) -> None:
+    """Create the lookup tables, DATA_TABLE and the TABLE_NAME view over them."""
+    for column in LOOKUP_IDS:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {lookup_table(column)} (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE)"
+        )
     conn.execute(
-        f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{TABLE_NAME}_unique ON {TABLE_NAME} (registration_number, title_name, owner_name)"
+        f"""
+        CREATE TABLE IF NOT EXISTS {DATA_TABLE} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sr_no TEXT,
+            title_name TEXT,
+            registration_number TEXT,
+            owner_name TEXT,
+            pub_state_id INTEGER,
+            pub_dist_id INTEGER,
+            language_id INTEGER,
+            class_id INTEGER,
+            meta_json TEXT,
+            title_phonetic TEXT
+        )
+        """
     )
-    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_state ON {TABLE_NAME} (pub_state_name)")
-    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_dist ON {TABLE_NAME} (pub_dist_name)")
-    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_language ON {TABLE_NAME} (language)")
-    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_owner ON {TABLE_NAME} (owner_name)")
+    conn.execute(
+        f"CREATE VIEW IF NOT EXISTS {TABLE_NAME} AS SELECT {_VIEW_COLUMNS} FROM {DATA_TABLE} {_dict_joins(DATA_TABLE)}"
+    )
+    for name, body in VIEW_TRIGGERS.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def storage_layout(conn: sqlite3.Connection) -> str:
+    """Return "dict" when TABLE_NAME is the view over the dictionary-encoded tables, otherwise "row"."""
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (TABLE_NAME,)).fetchone()
+    return "dict" if row is not None and row[0] == "view" else "row"
+
+
+def storage_table(conn: sqlite3.Connection) -> str:
+    """The table that physically holds the records."""
+    return DATA_TABLE if storage_layout(conn) == "dict" else TABLE_NAME
+
+
+def set_layout(conn: sqlite3.Connection, layout: str) -> bool:
+    """Convert the database to the "row" or "dict" layout in one transaction; False if it already uses it.
+
+    Record ids are kept. The freed pages only leave the file with a VACUUM.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown storage layout: {layout}")
+    if storage_layout(conn) == layout:
+        return False
     conn.commit()
-    return conn
+    try:
+        conn.execute("BEGIN")
+        drop_facet_triggers(conn)
+        drop_fts_triggers(conn)
+        drop_secondary_indexes(conn)
+        conn.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        if layout == "dict":
+            for column in LOOKUP_IDS:
+                conn.execute(f"DROP TABLE IF EXISTS {lookup_table(column)}")
+            conn.execute(f"DROP TABLE IF EXISTS {DATA_TABLE}")
+            conn.execute(f"ALTER TABLE {TABLE_NAME} RENAME TO {TABLE_NAME}_old")
+            create_dict_tables(conn)
+            for column in LOOKUP_IDS:
+                conn.execute(
+                    f"INSERT INTO {lookup_table(column)} (value) SELECT DISTINCT {column} FROM {TABLE_NAME}_old "
+                    f"WHERE {column} IS NOT NULL ORDER BY {column}"
+                )
+            ids = ", ".join(_lookup_id("old", c) if c in LOOKUP_IDS else f"old.{c}" for c in ALL_COLUMNS)
+            conn.execute(f"INSERT INTO {DATA_TABLE} SELECT {ids} FROM {TABLE_NAME}_old AS old ORDER BY old.id")
+            _copy_sequence(conn, f"{TABLE_NAME}_old", DATA_TABLE)
+            conn.execute(f"DROP TABLE {TABLE_NAME}_old")
+        else:
+            conn.execute(f"DROP VIEW {TABLE_NAME}")
+            create_row_table(conn)
+            columns = ", ".join(_dict_columns(DATA_TABLE).values())
+            conn.execute(
+                f"INSERT INTO {TABLE_NAME} SELECT {columns} FROM {DATA_TABLE} {_dict_joins(DATA_TABLE)} "
+                f"ORDER BY {DATA_TABLE}.id"
+            )
+            _copy_sequence(conn, DATA_TABLE, TABLE_NAME)
+            conn.execute(f"DROP TABLE {DATA_TABLE}")
+            for column in LOOKUP_IDS:
+                conn.execute(f"DROP TABLE {lookup_table(column)}")
+        conn.execute(
+            f"CREATE UNIQUE INDEX idx_{TABLE_NAME}_unique ON {storage_table(conn)} "
+            f"(registration_number, title_name, owner_name)"
+        )
+        create_secondary_indexes(conn)
+        create_fts(conn)
+        refresh_facets(conn, commit=False)
+        create_facet_triggers(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return True
+
+
+def _copy_sequence(conn: sqlite3.Connection, source: str, target: str) -> None:
+    # AUTOINCREMENT never reuses an id, including ids of deleted rows past the current maximum.
+    conn.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, (SELECT seq FROM sqlite_sequence WHERE name = ?)) WHERE name = ?",
+        (source, target),
+    )
+
+
+def add_phonetic_column(conn: sqlite3.Connection) -> None:
+    """Add and backfill ``title_phonetic`` on databases created before it existed."""
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE_NAME})")}
+    if "title_phonetic" in columns:
+        return
+    conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN title_phonetic TEXT")
+    conn.create_function("prgi_phonetic_key", 1, phonetic_key, deterministic=True)
+    # Older FTS sync triggers fire on any update; keep them out of the backfill.
+    drop_fts_triggers(conn)
+    conn.execute(f"UPDATE {TABLE_NAME} SET title_phonetic = prgi_phonetic_key(COALESCE(title_name, ''))")
+
+
+def create_facet_tables(conn: sqlite3.Connection) -> None:
+    """Create facet_cube, db_meta and the cube triggers; databases that predate the cube are summarized right away."""
+    created = not table_exists(conn, "facet_cube")
+    # Replaced by facet_cube, which also answers the per-column counts.
+    conn.execute("DROP TABLE IF EXISTS facet_values")
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS facet_cube ("
+        f"{', '.join(f'{c} TEXT NOT NULL' for c in FACET_COLUMNS)}, count INTEGER NOT NULL, "
+        f"PRIMARY KEY ({_CUBE_COLS})) WITHOUT ROWID"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS db_meta (key TEXT PRIMARY KEY, value TEXT)")
+    create_facet_triggers(conn)
+    if created or not db_version(conn):
+        refresh_facets(conn, commit=False)
+
+
+def create_facet_triggers(conn: sqlite3.Connection) -> None:
+    triggers = DICT_FACET_TRIGGERS if storage_layout(conn) == "dict" else FACET_TRIGGERS
+    for name, body in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def drop_facet_triggers(conn: sqlite3.Connection) -> None:
+    for name in FACET_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+    return row is not None
+
+
+def refresh_facets(conn: sqlite3.Connection, commit: bool = True) -> int:
+    """Rebuild the count cube and summary stats from the table and bump the version; returns the new version.
+
+    The triggers keep both current row by row; this full rebuild is for bulk
+    loads, which skip the triggers, and for databases that predate the cube.
+    """
+    conn.execute("DELETE FROM facet_cube")
+    conn.execute(
+        f"INSERT INTO facet_cube ({_CUBE_COLS}, count) "
+        f"SELECT {_CUBE_KEY}, COUNT(*) FROM {TABLE_NAME} GROUP BY {_CUBE_KEY}"
+    )
+    total = conn.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
+    version = db_version(conn) + 1
+    conn.executemany(
+        "INSERT OR REPLACE INTO db_meta (key, value) VALUES (?, ?)",
+        [("version", str(version)), ("total_records", str(total)), ("facets_updated", str(int(time.time())))],
+    )
+    if commit:
+        conn.commit()
+    return version
+
+
+def db_version(conn: sqlite3.Connection) -> int:
+    """Version stamp, bumped by every change to the table; 0 before the first refresh_facets()."""
+    row = conn.execute("SELECT value FROM db_meta WHERE key = 'version'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def facet_counts(
+    conn: sqlite3.Connection, column: str, selections: Optional[Dict[str, str]] = None
+) -> List[Tuple[str, int]]:
+    """(value, record count) pairs for one facet column, sorted by value.
+
+    ``selections`` maps other facet columns to a chosen value; the counts then
+    cover only the records matching them, so the options narrow as filters
+    are picked. One aggregate over the small cube, never the table itself.
+    """
+    if column not in FACET_COLUMNS:
+        raise ValueError(f"Not a facet column: {column}")
+    clauses = [f"{column} != ''"]
+    params: List[str] = []
+    for other, value in (selections or {}).items():
+        if other not in FACET_COLUMNS:
+            raise ValueError(f"Not a facet column: {other}")
+        if other != column and value:
+            clauses.append(f"{other} = ?")
+            params.append(value)
+    cur = conn.execute(
+        f"SELECT {column}, SUM(count) FROM facet_cube WHERE {' AND '.join(clauses)} GROUP BY {column} ORDER BY {column}",
+        params,
+    )
+    return [(value, count) for value, count in cur]
+
+
+def db_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Summary stats from db_meta and the facet cube, without touching the registrations table."""
+    row = conn.execute("SELECT value FROM db_meta WHERE key = 'total_records'").fetchone()
+    stats = {"total_records": int(row[0]) if row else 0}
+    counts = ", ".join(f"COUNT(DISTINCT NULLIF({c}, ''))" for c in FACET_COLUMNS)
+    distinct = conn.execute(f"SELECT {counts} FROM facet_cube").fetchone()
+    for column, count in zip(FACET_COLUMNS, distinct):
+        stats[f"unique_{column}"] = count
+    return stats
+
+
+def create_secondary_indexes(conn: sqlite3.Connection) -> None:
+    table = storage_table(conn)
+    indexes = DICT_INDEXES if table == DATA_TABLE else SECONDARY_INDEXES
+    existing = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,)))
+    for name, column in indexes.items():
+        sql = existing.get(name)
+        if sql is not None and column.lower() not in sql.lower():
+            # Older databases indexed the plain column, which NOCASE lookups cannot use.
+            conn.execute(f"DROP INDEX {name}")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection) -> None:
+    for name in (*SECONDARY_INDEXES, *DICT_INDEXES):
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+@lru_cache(maxsize=None)
+def fts_supported() -> bool:
+    """True when this SQLite build has FTS5 with the trigram tokenizer (3.34+)."""
+    probe = sqlite3.connect(":memory:")
+    try:
+        probe.execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        probe.close()
+
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    return table_exists(conn, FTS_TABLE)
+
+
+def create_fts(conn: sqlite3.Connection) -> None:
+    """Create the FTS index and its sync triggers; a new index is filled from existing rows."""
+    if not fts_supported():
+        return
+    created = not has_fts(conn)
+    conn.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{_FTS_COLS}, content='{storage_table(conn)}', content_rowid='id', tokenize='trigram')"
+    )
+    create_fts_triggers(conn)
+    if created:
+        rebuild_fts(conn)
+
+
+def create_fts_triggers(conn: sqlite3.Connection) -> None:
+    triggers = DICT_FTS_TRIGGERS if storage_layout(conn) == "dict" else FTS_TRIGGERS
+    for name, body in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def drop_fts_triggers(conn: sqlite3.Connection) -> None:
+    for name in FTS_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def rebuild_fts(conn: sqlite3.Connection) -> None:
+    conn.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
 
 
 def row_to_canonical(row: Dict[str, str]) -> Dict[str, str]:
@@ -98,142 +780,932 @@ def row_to_canonical(row: Dict[str, str]) -> Dict[str, str]:
     canonical = {key: normalized.get(key, "") for key in CANONICAL_COLUMNS}
     extras = {k: v for k, v in normalized.items() if k not in CANONICAL_COLUMNS and v}
     canonical["meta_json"] = "" if not extras else json.dumps(extras, ensure_ascii=False)
+    canonical["title_phonetic"] = phonetic_key(canonical["title_name"])
     return canonical
 
 
-def import_csv(conn: sqlite3.Connection, csv_path: str, batch_size: int = 1000) -> Tuple[int, int]:
+class ColumnPlan(NamedTuple):
+    """Where each output column comes from in a CSV row, computed once per file.
+
+    ``canonical`` holds one source index (or None) per CANONICAL_COLUMNS
+    entry; ``extras`` lists ``(normalized name, index)`` for the remaining
+    columns that end up in meta_json. Duplicate headers resolve exactly as
+    ``row_to_canonical()`` does on a ``csv.DictReader`` row.
+    """
+
+    canonical: List[Optional[int]]
+    extras: List[Tuple[str, int]]
+
+
+def build_column_plan(fieldnames: Sequence[str]) -> ColumnPlan:
+    # DictReader keeps a repeated header at its first position with its last value...
+    raw_positions: Dict[str, int] = {}
+    for idx, name in enumerate(fieldnames):
+        raw_positions[name] = idx
+    # ...and row_to_canonical() then lets later headers win on the normalized name.
+    positions: Dict[str, int] = {}
+    for name, idx in raw_positions.items():
+        key = normalize_header(name)
+        if key:
+            positions[key] = idx
+    return ColumnPlan(
+        canonical=[positions.get(col) for col in CANONICAL_COLUMNS],
+        extras=[(key, idx) for key, idx in positions.items() if key not in CANONICAL_COLUMNS],
+    )
+
+
+def canonicalize_values(values: Sequence[str], plan: ColumnPlan) -> Tuple[str, ...]:
+    """Plan-driven equivalent of ``canonical_tuple(row_to_canonical(row))`` for a csv.reader row."""
+    width = len(values)
+    out = [values[idx].strip() if idx is not None and idx < width else "" for idx in plan.canonical]
+    extras = {}
+    for key, idx in plan.extras:
+        if idx < width:
+            value = values[idx].strip()
+            if value:
+                extras[key] = value
+    out.append(json.dumps(extras, ensure_ascii=False) if extras else "")
+    out.append(phonetic_key(out[1]))
+    return tuple(out)
+
+
+def _canonicalize_chunk(text: str, plan: ColumnPlan) -> List[Tuple[str, ...]]:
+    return [canonicalize_values(values, plan) for values in csv.reader(io.StringIO(text)) if values]
+
+
+def iter_csv_chunks(f: TextIO, chunk_rows: int) -> Iterator[str]:
+    """Split CSV text into chunks of whole records without parsing fields.
+
+    A line ends a record when the running count of quote characters is even,
+    which holds for any CSV written with standard quoting (quotes inside a
+    field are doubled and only appear in quoted fields).
+    """
+    lines: List[str] = []
+    records = 0
+    in_quotes = False
+    for line in f:
+        lines.append(line)
+        if line.count('"') % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            records += 1
+            if records >= chunk_rows:
+                yield "".join(lines)
+                lines = []
+                records = 0
+    if lines:
+        yield "".join(lines)
+
+
+def iter_csv_tuples(f: TextIO, workers: int = 1, chunk_rows: int = 20000) -> Iterator[Tuple[str, ...]]:
+    """Yield insert-ready tuples for every record of an open CSV file, in file order.
+
+    The header is normalized once into a ColumnPlan. With ``workers > 1``
+    chunks of raw CSV text are parsed and canonicalized in a process pool;
+    the caller stays the single SQLite writer.
+    """
+    reader = csv.reader(f)
+    fieldnames = next(reader, None)
+    if fieldnames is None:
+        return
+    plan = build_column_plan(fieldnames)
+
+    if workers <= 1:
+        for values in reader:
+            if values:
+                yield canonicalize_values(values, plan)
+        return
+
+    pending: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for text in iter_csv_chunks(f, chunk_rows):
+                pending.append(pool.submit(_canonicalize_chunk, text, plan))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+INSERT_SQL = f"""
+    INSERT OR IGNORE INTO {TABLE_NAME}
+    (sr_no, title_name, registration_number, owner_name, pub_state_name, pub_dist_name, language, class_name, meta_json,
+     title_phonetic)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+DICT_INSERT_SQL = f"""
+    INSERT OR IGNORE INTO {DATA_TABLE}
+    (sr_no, title_name, registration_number, owner_name, pub_state_id, pub_dist_id, language_id, class_id, meta_json,
+     title_phonetic)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def canonical_tuple(c: Dict[str, str]) -> Tuple[str, ...]:
+    return (
+        c["sr_no"],
+        c["title_name"],
+        c["registration_number"],
+        c["owner_name"],
+        c["pub_state_name"],
+        c["pub_dist_name"],
+        c["language"],
+        c["class_name"],
+        c["meta_json"],
+        c["title_phonetic"],
+    )
+
+
+class LookupEncoder:
+    """Swaps the facet values of canonical tuples for lookup-table ids, for inserts in the dict layout.
+
+    Keeps every lookup table in a dict and adds values it has not seen yet.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.ids = {c: dict(conn.execute(f"SELECT value, id FROM {lookup_table(c)}")) for c in LOOKUP_IDS}
+
+    def encode(self, column: str, value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return None
+        ids = self.ids[column]
+        found = ids.get(value)
+        if found is None:
+            found = ids[value] = self.conn.execute(
+                f"INSERT INTO {lookup_table(column)} (value) VALUES (?)", (value,)
+            ).lastrowid
+        return found
+
+    def encode_batch(self, batch: Sequence[Tuple[str, ...]]) -> List[tuple]:
+        # Canonical tuples hold the facet columns at positions 4-7, in LOOKUP_IDS order.
+        columns = list(LOOKUP_IDS)
+        return [
+            (*values[:4], *(self.encode(c, v) for c, v in zip(columns, values[4:8])), *values[8:]) for values in batch
+        ]
+
+
+def insert_batch(
+    conn: sqlite3.Connection,
+    batch: Sequence[Tuple[str, ...]],
+    commit: bool = True,
+    encoder: Optional[LookupEncoder] = None,
+) -> Tuple[int, int]:
+    """Insert one batch, by default in its own transaction; returns (inserted, skipped duplicates).
+
+    In the dict layout the rows go straight into DATA_TABLE; pass the same
+    ``encoder`` for every batch of a load to keep its lookup dicts warm.
+    """
+    if encoder is None and storage_layout(conn) == "dict":
+        encoder = LookupEncoder(conn)
+    # rowcount counts rows this statement inserted; total_changes would also count FTS trigger writes.
+    if encoder is not None:
+        delta = conn.executemany(DICT_INSERT_SQL, encoder.encode_batch(batch)).rowcount
+    else:
+        delta = conn.executemany(INSERT_SQL, batch).rowcount
+    if commit:
+        conn.commit()
+    return delta, len(batch) - delta
+
+
+def insert_tuples(
+    conn: sqlite3.Connection, tuples: Iterable[Tuple[str, ...]], batch_size: int = 1000, commit: bool = True
+) -> Tuple[int, int]:
+    """Insert canonical tuples in batches; with ``commit=False`` the caller owns the transaction."""
     inserted = 0
     skipped = 0
-    insert_sql = f"""
-        INSERT OR IGNORE INTO {TABLE_NAME}
-        (sr_no, title_name, registration_number, owner_name, pub_state_name, pub_dist_name, language, class_name, meta_json)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
+    batch: List[Tuple[str, ...]] = []
+    encoder = LookupEncoder(conn) if storage_layout(conn) == "dict" else None
+
+    for values in tuples:
+        batch.append(values)
+        if len(batch) >= batch_size:
+            ins, skip = insert_batch(conn, batch, commit=commit, encoder=encoder)
+            inserted += ins
+            skipped += skip
+            batch.clear()
+
+    if batch:
+        ins, skip = insert_batch(conn, batch, commit=commit, encoder=encoder)
+        inserted += ins
+        skipped += skip
+
+    return inserted, skipped
+
 
+def insert_rows(
+    conn: sqlite3.Connection, rows: Iterable[Dict[str, str]], batch_size: int = 1000, commit: bool = True
+) -> Tuple[int, int]:
+    """Canonicalize raw rows (CSV or scraped dicts) and insert them in batches."""
+    tuples = (canonical_tuple(row_to_canonical(row)) for row in rows)
+    return insert_tuples(conn, tuples, batch_size=batch_size, commit=commit)
+
+
+def import_csv(
+    conn: sqlite3.Connection,
+    csv_path: str,
+    batch_size: int = 1000,
+    bulk: bool = False,
+    workers: int = 1,
+    layout: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Import a CSV file; returns (inserted, skipped duplicates).
+
+    Bulk mode loads everything in one transaction with synchronous=OFF and a
+    large page cache (BULK_PRAGMAS, restored afterwards), dropping the
+    secondary indexes first and rebuilding them once at the end; the FTS
+    index is likewise rebuilt in one pass instead of through its per-row
+    triggers, and so is the facet cube. The drop/rebuild is part of the same
+    transaction, so a failed load leaves the database untouched.
+    ``workers > 1`` fans CSV parsing and canonicalization out to processes.
+    ``layout`` ("row" or "dict") converts the database to that storage layout
+    first; by default the current one is kept.
+    """
+    if layout:
+        set_layout(conn, layout)
     with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        batch: List[Tuple[str, ...]] = []
-
-        for row in reader:
-            c = row_to_canonical(row)
-            batch.append(
-                (
-                    c["sr_no"],
-                    c["title_name"],
-                    c["registration_number"],
-                    c["owner_name"],
-                    c["pub_state_name"],
-                    c["pub_dist_name"],
-                    c["language"],
-                    c["class_name"],
-                    c["meta_json"],
-                )
-            )
+        tuples = iter_csv_tuples(f, workers=workers)
+        if not bulk:
+            return insert_tuples(conn, tuples, batch_size=batch_size)
 
-            if len(batch) >= batch_size:
-                before = conn.total_changes
-                conn.executemany(insert_sql, batch)
-                conn.commit()
-                delta = conn.total_changes - before
-                inserted += delta
-                skipped += len(batch) - delta
-                batch.clear()
-
-        if batch:
-            before = conn.total_changes
-            conn.executemany(insert_sql, batch)
+        conn.commit()
+        conn.execute("PRAGMA journal_mode=WAL")
+        saved = {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in BULK_PRAGMAS}
+        for name, value in BULK_PRAGMAS.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        try:
+            conn.execute("BEGIN")
+            drop_secondary_indexes(conn)
+            drop_facet_triggers(conn)
+            fts = has_fts(conn)
+            if fts:
+                drop_fts_triggers(conn)
+            result = insert_tuples(conn, tuples, batch_size=max(batch_size, 10000), commit=False)
+            create_secondary_indexes(conn)
+            if fts:
+                rebuild_fts(conn)
+                create_fts_triggers(conn)
+            refresh_facets(conn, commit=False)
+            create_facet_triggers(conn)
             conn.commit()
-            delta = conn.total_changes - before
-            inserted += delta
-            skipped += len(batch) - delta
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            for name, value in saved.items():
+                conn.execute(f"PRAGMA {name}={value}")
+        return result
 
-    return inserted, skipped
 
+def fts_match_expression(filters: Dict[str, str]) -> Tuple[str, List[Tuple[str, str]]]:
+    """Turn the contains-filters into one FTS5 MATCH expression.
 
-def build_where_clause(args: argparse.Namespace) -> Tuple[str, List[str]]:
-    clauses: List[str] = []
-    params: List[str] = []
+    Every word must occur in its column, in any order. Returns the expression
+    and the (column, word) pairs too short for the trigram index.
+    """
+    phrases: List[str] = []
+    short: List[Tuple[str, str]] = []
+    for key, column in CONTAINS_FILTERS.items():
+        for word in (filters.get(key) or "").split():
+            if len(word) >= FTS_MIN_TERM:
+                quoted = word.replace('"', '""')
+                phrases.append(f'{column} : "{quoted}"')
+            else:
+                short.append((column, word))
+    return " AND ".join(phrases), short
 
-    def add_like(field: str, value: str) -> None:
-        if value:
-            clauses.append(f"LOWER({field}) LIKE LOWER(?)")
-            params.append(f"%{value.strip()}%")
 
-    def add_eq(field: str, value: str) -> None:
+def _contains_pattern(value: str) -> str:
+    """LIKE pattern matching ``value`` as a plain substring: its own % and _ are escaped with backslashes."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def filter_lookup_ids(conn: sqlite3.Connection, filters: Dict[str, str]) -> Optional[Dict[str, List[int]]]:
+    """For the dict layout, the lookup ids each exact filter matches (case-insensitively); None in the row layout."""
+    if storage_layout(conn) != "dict":
+        return None
+    ids: Dict[str, List[int]] = {}
+    for key, column in EXACT_FILTERS.items():
+        value = (filters.get(key) or "").strip()
         if value:
-            clauses.append(f"LOWER({field}) = LOWER(?)")
-            params.append(value.strip())
-
-    add_like("title_name", args.title)
-    add_like("owner_name", args.owner)
-    add_like("registration_number", args.registration_number)
-    add_eq("pub_state_name", args.state)
-    add_eq("pub_dist_name", args.district)
-    add_eq("language", args.language)
-    add_eq("class_name", args.class_name)
-
-    where = " AND ".join(clauses)
-    return where, params
-
-
-def query_data(conn: sqlite3.Connection, args: argparse.Namespace) -> List[sqlite3.Row]:
-    where, params = build_where_clause(args)
-    sql = f"SELECT * FROM {TABLE_NAME}"
-    if where:
-        sql += f" WHERE {where}"
-    sql += " ORDER BY id ASC"
-    if args.limit:
+            cur = conn.execute(f"SELECT id FROM {lookup_table(column)} WHERE value = ? COLLATE NOCASE", (value,))
+            ids[key] = [row[0] for row in cur]
+    return ids
+
+
+def build_filter_clause(
+    filters: Dict[str, str], fts: bool = False, lookup_ids: Optional[Dict[str, List[int]]] = None
+) -> Tuple[List[str], List[object], str]:
+    """Return (clauses, params, match expression) for a filter dict.
+
+    Without ``fts`` each contains-filter is a single LIKE over the whole value
+    and the match expression is empty. With ``lookup_ids`` (from
+    filter_lookup_ids()) the exact filters compare the dict layout's id columns.
+    """
+    clauses: List[str] = []
+    params: List[object] = []
+    match = ""
+
+    # LIKE is already case-insensitive for ASCII, the same folding LOWER() does.
+    # ESCAPE keeps a typed % or _ literal, as it is in the FTS phrases.
+    if fts:
+        match, short = fts_match_expression(filters)
+        for column, word in short:
+            clauses.append(f"{TABLE_NAME}.{column} LIKE ? ESCAPE '\\'")
+            params.append(_contains_pattern(word))
+    else:
+        for key, column in CONTAINS_FILTERS.items():
+            value = (filters.get(key) or "").strip()
+            if value:
+                clauses.append(f"{TABLE_NAME}.{column} LIKE ? ESCAPE '\\'")
+                params.append(_contains_pattern(value))
+
+    # NOCASE keeps the comparison case-insensitive while matching the NOCASE indexes.
+    for key, column in EXACT_FILTERS.items():
+        value = (filters.get(key) or "").strip()
+        if value and lookup_ids is not None:
+            ids = lookup_ids.get(key, [])
+            clauses.append(f"{TABLE_NAME}.{LOOKUP_IDS[column]} IN ({', '.join('?' * len(ids))})")
+            params.extend(ids)
+        elif value:
+            clauses.append(f"{TABLE_NAME}.{column} = ? COLLATE NOCASE")
+            params.append(value)
+
+    sounds_like = (filters.get("sounds_like") or "").strip()
+    if sounds_like:
+        clauses.append(f"{TABLE_NAME}.title_phonetic = ?")
+        params.append(sounds_like_key(sounds_like))
+
+    return clauses, params, match
+
+
+def build_select(
+    filters: Dict[str, str],
+    columns: Optional[Sequence[str]] = None,
+    fts: bool = False,
+    rank: bool = False,
+    descending: bool = False,
+    after_id: Optional[int] = None,
+    limit: int = 0,
+    lookup_ids: Optional[Dict[str, List[int]]] = None,
+) -> Tuple[str, List[object]]:
+    """Build the search SELECT; returns (sql, params).
+
+    With ``rank`` and a full-text term the rows come back best bm25 match
+    first, otherwise in id order. ``after_id`` is a keyset page token: only
+    rows past that id in the requested direction, so any page is one index
+    seek instead of an OFFSET that reads and discards every earlier row.
+    Pass ``lookup_ids=filter_lookup_ids(conn, filters)`` on a dict-layout
+    database: the query then reads DATA_TABLE and the lookup tables itself,
+    since filtering the view by text would scan the table.
+    """
+    clauses, params, match = build_filter_clause(filters, fts, lookup_ids)
+    params = list(params)
+    if after_id is not None:
+        if match and rank:
+            raise ValueError("Keyset pages need id order; relevance-ranked results cannot be paged by id")
+        clauses.append(f"{TABLE_NAME}.id {'<' if descending else '>'} ?")
+        params.append(after_id)
+    table, joins = TABLE_NAME, ""
+    if lookup_ids is not None:
+        table, joins = f"{DATA_TABLE} AS {TABLE_NAME}", _dict_joins(TABLE_NAME)
+    source = f"{table} {joins}".rstrip()
+    order = f"{TABLE_NAME}.id {'DESC' if descending else 'ASC'}"
+    if match and rank:
+        source = f"{FTS_TABLE} JOIN {table} ON {TABLE_NAME}.id = {FTS_TABLE}.rowid {joins}".rstrip()
+        clauses.insert(0, f"{FTS_TABLE} MATCH ?")
+        order = f"{FTS_TABLE}.rank, {order}"
+    elif match:
+        clauses.insert(0, f"{TABLE_NAME}.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?)")
+    if match:
+        params.insert(0, match)
+
+    if lookup_ids is not None:
+        exprs = _dict_columns(TABLE_NAME)
+        select = ", ".join(f"{exprs[c]} AS {c}" for c in columns or ALL_COLUMNS)
+    else:
+        select = ", ".join(f"{TABLE_NAME}.{c}" for c in columns) if columns else f"{TABLE_NAME}.*"
+    sql = f"SELECT {select} FROM {source}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {order}"
+    if limit:
         sql += " LIMIT ?"
-        params.append(str(args.limit))
+        params.append(limit)
+    return sql, params
 
-    cur = conn.execute(sql, params)
-    return cur.fetchall()
 
+def filters_from_args(args: argparse.Namespace) -> Dict[str, str]:
+    return {key: getattr(args, key, "") or "" for key in (*CONTAINS_FILTERS, *EXACT_FILTERS, "sounds_like")}
 
-def export_rows(rows: Sequence[sqlite3.Row], out_path: str) -> None:
-    if not rows:
-        Path(out_path).write_text("", encoding="utf-8")
-        return
 
-    headers = rows[0].keys()
+def search_page(
+    conn: sqlite3.Connection,
+    filters: Dict[str, str],
+    page_size: int,
+    after_id: Optional[int] = None,
+    rank: bool = False,
+    columns: Optional[Sequence[str]] = None,
+    descending: bool = False,
+) -> Tuple[List[sqlite3.Row], Optional[int]]:
+    """One page of search results, as served by the web app and the API server.
+
+    Rows start with ``id``. Keyset pages in id order by default; with
+    ``rank`` and a full-text term the best bm25 matches come back as a
+    single page (the token is None), since relevance order has no keyset.
+    """
+    fts = has_fts(conn)
+    if rank and fts and fts_match_expression(filters)[0]:
+        sql, params = build_select(
+            filters,
+            columns=["id", *columns] if columns else None,
+            fts=True,
+            rank=True,
+            descending=descending,
+            limit=page_size,
+            lookup_ids=filter_lookup_ids(conn, filters),
+        )
+        return conn.execute(sql, params).fetchall(), None
+    return query_page(conn, filters, page_size, after_id=after_id, columns=columns, descending=descending)
+
+
+def normalize_filters(filters: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    """Hashable cache key for a filter dict: empty filters dropped, values trimmed, sorted by name.
+
+    ASCII values are lowercased too; every filter already matches ASCII case-insensitively.
+    """
+    items = []
+    for key, value in filters.items():
+        value = (value or "").strip()
+        if value:
+            items.append((key, value.lower() if value.isascii() else value))
+    return tuple(sorted(items))
+
+
+class ResultCache:
+    """Thread-safe LRU cache for query results, bounded by total size in bytes.
+
+    Every entry remembers the DB version (``db_version()``) it was computed
+    at and counts as a miss once the database has changed. ``sizeof`` gives
+    each value's footprint; the least recently used entries are evicted
+    until the total fits in ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, object, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[object]:
+        """Cached value for ``key`` at ``version``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def get_or_compute(
+        self, key: Hashable, version: int, compute: Callable[[], T], sizeof: Callable[[T], int]
+    ) -> T:
+        value = self.get(key, version)
+        if value is not None:
+            return value
+        # Computed outside the lock so a slow query does not block other sessions' hits.
+        value = compute()
+        self.put(key, version, value, sizeof(value))
+        return value
+
+    def put(self, key: Hashable, version: int, value: object, size: int) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (version, value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# A plan step that reads the whole registrations table (index scans say "USING ... INDEX").
+_FULL_SCAN = re.compile(rf"^SCAN {TABLE_NAME}\b(?!.*\bUSING\b)")
+# Schema lookups and FTS5's own statements on its shadow tables ("FROM 'main'.'..._config'").
+_INTERNAL_SQL = re.compile(r"\bsqlite_master\b|\bFROM '")
+_SLOW_LOG_LOCK = threading.Lock()
+
+
+class QueryTiming(NamedTuple):
+    label: str
+    ms: float
+    rows: int
+    statements: Tuple[str, ...]
+    plan: Tuple[str, ...]
+    full_scan: bool
+    slow: bool
+
+
+def explain_plan(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """EXPLAIN QUERY PLAN for one statement, indented by depth like the sqlite3 shell prints it."""
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+class QueryProfiler:
+    """Records wall time, rows and query plans of tracked blocks.
+
+    ``track(label, conn)`` captures the SELECT statements the block runs on
+    ``conn`` (through the connection's trace callback) and explains them
+    afterwards, outside the timed section. Blocks that ran a statement and
+    took longer than ``slow_ms`` go to ``log_path`` as one JSON line each;
+    blocks without SQL (DataFrame building, cache lookups) are only timed.
+    """
+
+    def __init__(self, slow_ms: float = 250.0, log_path: Optional[str] = None, explain: bool = True) -> None:
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.explain = explain
+        self.timings: List[QueryTiming] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, label: str, conn: Optional[sqlite3.Connection] = None) -> Iterator[Dict[str, int]]:
+        """Time the block; set ``info["rows"]`` inside it to record the row count."""
+        statements: List[str] = []
+        if conn is not None:
+            conn.set_trace_callback(statements.append)
+        info = {"rows": 0}
+        started = time.perf_counter()
+        try:
+            yield info
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if conn is not None:
+                conn.set_trace_callback(None)
+            selects = tuple(
+                sql
+                for sql in statements
+                if sql.lstrip()[:6].upper() in ("SELECT", "WITH") and not _INTERNAL_SQL.search(sql)
+            )
+            plan: List[str] = []
+            for sql in selects if self.explain else ():
+                try:
+                    plan.extend(explain_plan(conn, sql))
+                except sqlite3.Error:
+                    pass
+            self.record(
+                QueryTiming(
+                    label=label,
+                    ms=elapsed_ms,
+                    rows=info["rows"],
+                    statements=selects,
+                    plan=tuple(plan),
+                    full_scan=any(_FULL_SCAN.match(line.strip()) for line in plan),
+                    slow=elapsed_ms >= self.slow_ms,
+                )
+            )
+
+    def record(self, timing: QueryTiming) -> None:
+        with self._lock:
+            self.timings.append(timing)
+        if timing.slow and timing.statements and self.log_path:
+            self._log_slow(timing)
+
+    def _log_slow(self, timing: QueryTiming) -> None:
+        entry = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), **timing._asdict()}
+        try:
+            with _SLOW_LOG_LOCK, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as exc:
+            print(f"Warning: cannot write slow-query log {self.log_path}: {exc}")
+            self.log_path = None
+
+
+def profiled(
+    profiler: Optional[QueryProfiler], label: str, conn: Optional[sqlite3.Connection] = None
+) -> ContextManager[Dict[str, int]]:
+    """``profiler.track()``, or a no-op block when profiling is off."""
+    return profiler.track(label, conn) if profiler is not None else nullcontext({"rows": 0})
+
+
+def format_timing(timing: QueryTiming) -> str:
+    """One line of time and rows (flagging slow queries and full scans), then the indented plan."""
+    flags = (" [slow]" if timing.slow else "") + (" [full table scan]" if timing.full_scan else "")
+    lines = [f"{timing.label}: {timing.ms:.1f} ms, {timing.rows} row(s){flags}"]
+    lines.extend(f"  {line}" for line in timing.plan)
+    return "\n".join(lines)
+
+
+def iter_query(conn: sqlite3.Connection, args: argparse.Namespace) -> sqlite3.Cursor:
+    filters = filters_from_args(args)
+    sql, params = build_select(
+        filters,
+        fts=not getattr(args, "no_fts", False) and has_fts(conn),
+        rank=getattr(args, "order", "id") == "relevance",
+        after_id=getattr(args, "after_id", None),
+        limit=args.limit,
+        lookup_ids=filter_lookup_ids(conn, filters),
+    )
+    return conn.execute(sql, params)
+
+
+def query_data(
+    conn: sqlite3.Connection, args: argparse.Namespace, profiler: Optional[QueryProfiler] = None
+) -> List[sqlite3.Row]:
+    with profiled(profiler, "query", conn) as info:
+        rows = iter_query(conn, args).fetchall()
+        info["rows"] = len(rows)
+    return rows
+
+
+def query_page(
+    conn: sqlite3.Connection,
+    filters: Dict[str, str],
+    page_size: int,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    descending: bool = False,
+) -> Tuple[List[sqlite3.Row], Optional[int]]:
+    """Fetch one keyset page in id order; returns (rows, token for the next page or None on the last).
+
+    Rows start with ``id`` followed by ``columns`` (all columns by default).
+    """
+    sql, params = build_select(
+        filters,
+        columns=["id", *columns] if columns else None,
+        fts=has_fts(conn),
+        descending=descending,
+        after_id=after_id,
+        limit=page_size + 1,
+        lookup_ids=filter_lookup_ids(conn, filters),
+    )
+    rows = conn.execute(sql, params).fetchall()
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, rows[-1][0]
+
+
+class SimilarTitle(NamedTuple):
+    score: float
+    title_name: str
+    registration_number: str
+    owner_name: str
+    pub_state_name: str
+    registrations: int
+
+
+def title_trigrams(key: str) -> set:
+    padded = f" {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance, using Myers' bit-parallel algorithm (one big-int step per character of ``b``)."""
+    if not a or not b:
+        return len(a) + len(b)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, dist = full, 0, len(a)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            dist += 1
+        elif mh & last:
+            dist -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return dist
+
+
+def edit_similarity(key_a: str, key_b: str) -> float:
+    return 1 - levenshtein(key_a, key_b) / max(len(key_a), len(key_b), 1)
+
+
+def title_similarity(key_a: str, key_b: str) -> float:
+    """Score two title keys in [0, 1]: the mean of trigram Jaccard and normalized edit similarity."""
+    if not key_a or not key_b:
+        return 0.0
+    grams_a, grams_b = title_trigrams(key_a), title_trigrams(key_b)
+    jaccard = len(grams_a & grams_b) / len(grams_a | grams_b)
+    return (jaccard + edit_similarity(key_a, key_b)) / 2
+
+
+class TitleIndex:
+    """Trigram inverted index over the distinct titles, for "is this title taken?" checks.
+
+    Postings are compact ``array('I')`` lists of title ids, so a lookup only
+    touches titles sharing a trigram with the query. The ``candidates`` with
+    the most shared trigrams get their exact Jaccard from those counts and are
+    re-ranked by ``title_similarity``; edit distances are only computed while
+    a candidate's Jaccard can still lift it into the top ``limit``.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[str]]) -> None:
+        self.keys: List[str] = []
+        self.rows: List[Tuple[str, ...]] = []
+        self.counts: List[int] = []
+        self.sizes = array("H")
+        self.postings: Dict[str, array] = {}
+        ids: Dict[str, int] = {}
+        for row in rows:
+            key = title_key(row[0] or "")
+            if not key:
+                continue
+            title_id = ids.get(key)
+            if title_id is not None:
+                self.counts[title_id] += 1
+                continue
+            title_id = ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.rows.append(tuple(value or "" for value in row))
+            self.counts.append(1)
+            grams = title_trigrams(key)
+            self.sizes.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                postings = self.postings.get(gram)
+                if postings is None:
+                    postings = self.postings[gram] = array("I")
+                postings.append(title_id)
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection) -> "TitleIndex":
+        columns = ", ".join(SimilarTitle._fields[1:5])
+        return cls(conn.execute(f"SELECT {columns} FROM {TABLE_NAME} ORDER BY id"))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def search(self, title: str, limit: int = 10, candidates: int = 200, min_score: float = 0.0) -> List[SimilarTitle]:
+        """Return existing titles closest to ``title``, best first, one entry per distinct title."""
+        key = title_key(title)
+        if not key:
+            return []
+        grams = title_trigrams(key)
+        shared: Counter = Counter()
+        for gram in grams:
+            postings = self.postings.get(gram)
+            if postings is not None:
+                shared.update(postings)
+
+        ranked = sorted(
+            ((n / (len(grams) + self.sizes[title_id] - n), title_id) for title_id, n in shared.most_common(candidates)),
+            reverse=True,
+        )
+        matches: List[SimilarTitle] = []
+        floor = min_score
+        for jaccard, title_id in ranked:
+            # The edit half of the score is at most 1, so nothing further down can beat the floor.
+            # Scores are compared rounded, as reported, so ties with the floor are still considered.
+            if round((jaccard + 1) / 2, 4) < floor:
+                break
+            score = round((jaccard + edit_similarity(key, self.keys[title_id])) / 2, 4)
+            if score < floor:
+                continue
+            matches.append(SimilarTitle(score, *self.rows[title_id], self.counts[title_id]))
+            if len(matches) >= limit:
+                # Same order as the result, so ties at the cut keep the same titles whatever order they came in.
+                matches.sort(key=lambda t: (-t.score, t.title_name))
+                del matches[limit:]
+                floor = max(floor, matches[-1].score)
+        matches.sort(key=lambda t: (-t.score, t.title_name))
+        return matches
+
+
+def export_cursor(
+    cursor: sqlite3.Cursor, out_path: str, head: Sequence[sqlite3.Row] = (), fetch_size: int = 1000
+) -> int:
+    """Stream a query cursor to CSV with ``fetchmany``; ``head`` holds rows already fetched from it.
+
+    Memory stays at one batch whatever the result size. Returns the number of rows written.
+    """
+    count = 0
     with open(out_path, "w", encoding="utf-8", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow(headers)
-        for row in rows:
-            writer.writerow([row[h] for h in headers])
+        writer.writerow([d[0] for d in cursor.description])
+        batch = list(head)
+        while batch:
+            writer.writerows(batch)
+            count += len(batch)
+            batch = cursor.fetchmany(fetch_size)
+    return count
 
 
-def print_rows(rows: Sequence[sqlite3.Row], max_print: int = 20) -> None:
-    if not rows:
+def print_rows(rows: Sequence[sqlite3.Row], max_print: int = 20, total: Optional[int] = None) -> None:
+    total = len(rows) if total is None else total
+    if not total:
         print("No records found.")
         return
 
-    print(f"Found {len(rows)} record(s).")
+    print(f"Found {total} record(s).")
     for idx, row in enumerate(rows[:max_print], start=1):
         print(
             f"{idx}. Reg#: {row['registration_number']} | Title: {row['title_name']} | "
             f"Owner: {row['owner_name']} | State: {row['pub_state_name']} | "
             f"District: {row['pub_dist_name']} | Language: {row['language']}"
         )
-    if len(rows) > max_print:
+    if total > max_print:
         print(f"... showing first {max_print}. Use --export to save full results.")
 
 
 def cmd_import(args: argparse.Namespace) -> None:
     conn = connect_db(args.db)
-    inserted, skipped = import_csv(conn, args.csv)
+    converting = args.layout is not None and storage_layout(conn) != args.layout
+    started = time.perf_counter()
+    inserted, skipped = import_csv(conn, args.csv, bulk=args.bulk, workers=args.workers, layout=args.layout)
+    elapsed = time.perf_counter() - started
+    # Refresh planner statistics so multi-filter queries pick the most selective index.
+    conn.execute("ANALYZE")
+    if converting:
+        # The previous layout's pages are free but still part of the file.
+        conn.execute("VACUUM")
+        print(f"Converted to the {args.layout} storage layout")
     total = conn.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
     print(f"Import complete. Inserted={inserted}, Skipped(duplicates)={skipped}, Total in DB={total}")
+    rate = (inserted + skipped) / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {inserted + skipped} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
     conn.close()
 
 
 def cmd_query(args: argparse.Namespace) -> None:
     conn = connect_db(args.db)
-    rows = query_data(conn, args)
-    print_rows(rows, max_print=args.max_print)
+    profiler = QueryProfiler(slow_ms=args.slow_ms, log_path=args.slow_log) if args.profile or args.slow_log else None
     if args.export:
-        export_rows(rows, args.export)
-        print(f"Exported {len(rows)} rows to {args.export}")
+        with profiled(profiler, "export", conn) as info:
+            cursor = iter_query(conn, args)
+            head = cursor.fetchmany(args.max_print)
+            total = export_cursor(cursor, args.export, head=head)
+            info["rows"] = total
+        print_rows(head, max_print=args.max_print, total=total)
+        print(f"Exported {total} rows to {args.export}")
+    else:
+        rows = query_data(conn, args, profiler)
+        print_rows(rows, max_print=args.max_print)
+        if args.limit and len(rows) == args.limit and args.order == "id":
+            print(f"Next page: --after-id {rows[-1]['id']}")
+    if args.profile:
+        for timing in profiler.timings:
+            print(format_timing(timing))
+    conn.close()
+
+
+def cmd_similar(args: argparse.Namespace) -> None:
+    conn = connect_db(args.db)
+    start = time.perf_counter()
+    index = TitleIndex.from_db(conn)
+    built = time.perf_counter()
+    matches = index.search(args.title, limit=args.limit, candidates=args.candidates, min_score=args.min_score)
+    searched = time.perf_counter()
+    print(f"Indexed {len(index):,} distinct titles in {built - start:.2f}s.")
+    print(f"Found {len(matches)} similar title(s) in {(searched - built) * 1000:.1f} ms.")
+    for i, m in enumerate(matches, start=1):
+        print(
+            f"{i}. Score: {m.score:.3f} | Title: {m.title_name} | Reg#: {m.registration_number} | "
+            f"Owner: {m.owner_name} | State: {m.pub_state_name} | Registrations: {m.registrations}"
+        )
     conn.close()
 
 
@@ -244,6 +1716,21 @@ def build_parser() -> argparse.ArgumentParser:
     p_import = sub.add_parser("import", help="Import CSV data into SQLite DB")
     p_import.add_argument("--csv", required=True, help="Input CSV file produced by scraper")
     p_import.add_argument("--db", default="prgi_data.db", help="SQLite DB file path")
+    p_import.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Single-transaction load with relaxed durability; secondary indexes are rebuilt once at the end",
+    )
+    p_import.add_argument(
+        "--workers", type=int, default=1, help="Parse/canonicalize CSV chunks in N processes (default: 1)"
+    )
+    p_import.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default=None,
+        help="Convert the DB to this storage layout first: row (plain table) or dict (state/district/language/class "
+        "stored as ids into lookup tables, behind a view); default keeps the current layout",
+    )
     p_import.set_defaults(func=cmd_import)
 
     p_query = sub.add_parser("query", help="Filter/query records from SQLite DB")
@@ -255,17 +1742,55 @@ def build_parser() -> argparse.ArgumentParser:
     p_query.add_argument("--district", default="", help="District exact match (case-insensitive)")
     p_query.add_argument("--language", default="", help="Language exact match (case-insensitive)")
     p_query.add_argument("--class-name", default="", help="Class exact match (case-insensitive)")
-    p_query.add_argument("--limit", type=int, default=100, help="Max rows to return")
+    p_query.add_argument(
+        "--sounds-like",
+        default="",
+        help="Title with the same phonetic key (spelling variants, Devanagari/romanized)",
+    )
+    p_query.add_argument(
+        "--order",
+        choices=["id", "relevance"],
+        default="id",
+        help="Row order; relevance ranks full-text title/owner/registration matches by bm25",
+    )
+    p_query.add_argument("--no-fts", action="store_true", help="Use plain LIKE scans instead of the full-text index")
+    p_query.add_argument("--limit", type=int, default=100, help="Max rows to return (page size; 0 = no limit)")
+    p_query.add_argument(
+        "--after-id",
+        type=int,
+        default=None,
+        help="Keyset page token: return rows after this id (printed as the next-page token)",
+    )
     p_query.add_argument("--max-print", type=int, default=20, help="Max rows to print to terminal")
     p_query.add_argument("--export", default="", help="Optional CSV export path for filtered results")
+    p_query.add_argument("--profile", action="store_true", help="Print query time, row count and query plan")
+    p_query.add_argument("--slow-log", default="", help="Append queries slower than --slow-ms to this JSON-lines file")
+    p_query.add_argument("--slow-ms", type=float, default=250.0, help="Slow-query threshold in milliseconds")
     p_query.set_defaults(func=cmd_query)
 
+    p_similar = sub.add_parser("similar", help="List existing titles most similar to a proposed title")
+    p_similar.add_argument("--db", default="prgi_data.db", help="SQLite DB file path")
+    p_similar.add_argument("--title", required=True, help="Proposed title to check")
+    p_similar.add_argument("--limit", type=int, default=10, help="Number of titles to return")
+    p_similar.add_argument(
+        "--candidates", type=int, default=200, help="Titles sharing the most trigrams that get re-ranked"
+    )
+    p_similar.add_argument("--min-score", type=float, default=0.0, help="Drop titles scoring below this (0-1)")
+    p_similar.set_defaults(func=cmd_similar)
+
     return parser
 
 
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
+    if getattr(args, "after_id", None) is not None and getattr(args, "order", "id") == "relevance":
+        parser.error("--after-id pages in id order and cannot be combined with --order relevance")
+    if (getattr(args, "sounds_like", "") or "").strip():
+        try:
+            sounds_like_key(args.sounds_like)
+        except ValueError as exc:
+            parser.error(str(exc))
     args.func(args)
 
 
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""In-memory columnar search over the PRGI registrations table.
+
+ColumnarEngine loads the table once into NumPy arrays and answers the same
+filter dicts as prgi_data_manager.build_select() with vectorized boolean
+masks, so an interactive search never goes back to SQLite. Each column is
+kept as integer codes into its distinct values:
+
+- exact filters (state, district, language, class) and sounds-like pick the
+  matching codes among a few hundred values, then compare one int array;
+- contains filters search the pre-lowercased distinct values of title,
+  owner and registration number in one joined string, then gather the hits
+  through the codes.
+
+The web app keeps one engine per DB version in st.cache_resource (see
+PRGI_SEARCH_ENGINE in app.py). Relevance ranking still needs the FTS index.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import sys
+import time
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from prgi_data_manager import CONTAINS_FILTERS, EXACT_FILTERS, TABLE_NAME, db_version, has_fts, sounds_like_key
+
+RESULT_COLUMNS = [
+    "sr_no",
+    "title_name",
+    "registration_number",
+    "owner_name",
+    "pub_state_name",
+    "pub_dist_name",
+    "language",
+    "class_name",
+]
+LOAD_BATCH = 50000
+# Below one candidate row per this many distinct values, contains filters test the rows one by one.
+SPARSE_RATIO = 20
+
+
+class Column:
+    """One column as int32 codes into its distinct values; NULL is code -1.
+
+    ``searchable`` columns also keep their distinct values lowercased in one
+    string for substring search, value i spanning text[starts[i]:ends[i]].
+    """
+
+    def __init__(self, values: Sequence[Optional[str]], searchable: bool = False) -> None:
+        codes, uniques = pd.factorize(np.array(values, dtype=object))
+        self.codes = codes.astype(np.int32)
+        # Code -1 indexes the trailing None, so take() needs no special case for NULL.
+        self.values = np.append(uniques.astype(object), None)
+        self.text = ""
+        self.starts = self.ends = np.zeros(0, dtype=np.int64)
+        if searchable:
+            folded = [v.lower().replace("\n", " ") for v in uniques]
+            self.text = "\n".join(folded)
+            lengths = np.fromiter(map(len, folded), dtype=np.int64, count=len(folded))
+            self.ends = np.cumsum(lengths + 1) - 1
+            self.starts = self.ends - lengths
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        strings = sum(sys.getsizeof(v) for v in self.values[:-1]) + sys.getsizeof(self.text)
+        return self.codes.nbytes + self.values.nbytes + self.starts.nbytes + self.ends.nbytes + strings
+
+    @cached_property
+    def positions(self) -> Dict[str, int]:
+        """Code of each distinct value."""
+        return {value: code for code, value in enumerate(self.values[:-1])}
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        return self.values[self.codes[rows]]
+
+    def rows_in(self, matches: Sequence[int]) -> np.ndarray:
+        """Rows whose code is one of ``matches``."""
+        if len(matches) == 1:
+            return self.codes == matches[0]
+        return np.isin(self.codes, matches)
+
+    def equal(self, value: str) -> np.ndarray:
+        """Rows equal to ``value``, ignoring case like COLLATE NOCASE (meant for the few-valued facet columns)."""
+        folded = value.lower()
+        return self.rows_in([code for code, v in enumerate(self.values[:-1]) if v.lower() == folded])
+
+    def contains(self, term: str) -> np.ndarray:
+        """Rows containing ``term``, ignoring case like LIKE and the trigram index; NULL never matches."""
+        hits = np.zeros(len(self.values), dtype=bool)
+        positions = [m.start() for m in re.finditer(re.escape(term.lower()), self.text)]
+        if positions:
+            hits[np.searchsorted(self.starts, positions, side="right") - 1] = True
+        return hits[self.codes]
+
+    def rows_contain(self, term: str, rows: np.ndarray) -> np.ndarray:
+        """contains() for just ``rows``; cheaper than scanning every distinct value when the rows are few."""
+        term = term.lower()
+        text, starts, ends = self.text, self.starts, self.ends
+        found = (code >= 0 and term in text[starts[code] : ends[code]] for code in self.codes[rows].tolist())
+        return np.fromiter(found, dtype=bool, count=len(rows))
+
+
+class ColumnarEngine:
+    """Read-only columnar copy of the table at one DB version, rows in id order.
+
+    ``fts`` mirrors the database it was loaded from: with a full-text index
+    every word of a contains filter must occur in the column, as in SQL;
+    without one the whole value must.
+    """
+
+    def __init__(self, ids: np.ndarray, columns: Dict[str, Column], fts: bool, version: int) -> None:
+        self.ids = ids
+        self.columns = columns
+        self.fts = fts
+        self.version = version
+        self.load_seconds = 0.0
+        self.nbytes = ids.nbytes + sum(column.nbytes for column in columns.values())
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection, batch_size: int = LOAD_BATCH) -> "ColumnarEngine":
+        started = time.perf_counter()
+        names = [*RESULT_COLUMNS, "title_phonetic"]
+        values: List[list] = [[] for _ in range(len(names) + 1)]
+        # One read transaction, so the rows and the version stamp come from the same snapshot.
+        conn.execute("BEGIN")
+        try:
+            version = db_version(conn)
+            fts = has_fts(conn)
+            cur = conn.execute(f"SELECT id, {', '.join(names)} FROM {TABLE_NAME} ORDER BY id")
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for column, chunk in zip(values, zip(*rows)):
+                    column.extend(chunk)
+        finally:
+            conn.rollback()
+        ids = np.array(values[0], dtype=np.int64)
+        searchable = set(CONTAINS_FILTERS.values())
+        columns = {name: Column(column, name in searchable) for name, column in zip(names, values[1:])}
+        engine = cls(ids, columns, fts, version)
+        engine.load_seconds = time.perf_counter() - started
+        return engine
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, filters: Dict[str, str]) -> np.ndarray:
+        """Boolean mask of the rows matching a filter dict."""
+        mask = np.ones(len(self.ids), dtype=bool)
+        for key, column in EXACT_FILTERS.items():
+            value = (filters.get(key) or "").strip()
+            if value:
+                mask &= self.columns[column].equal(value)
+        sounds_like = (filters.get("sounds_like") or "").strip()
+        if sounds_like:
+            phonetic = self.columns["title_phonetic"]
+            code = phonetic.positions.get(sounds_like_key(sounds_like))
+            mask &= phonetic.rows_in([] if code is None else [code])
+        for key, name in CONTAINS_FILTERS.items():
+            value = (filters.get(key) or "").strip()
+            if not value:
+                continue
+            column = self.columns[name]
+            for term in value.split() if self.fts else [value]:
+                candidates = np.flatnonzero(mask)
+                if len(candidates) * SPARSE_RATIO < len(column.starts):
+                    mask[candidates] = column.rows_contain(term, candidates)
+                else:
+                    mask &= column.contains(term)
+        return mask
+
+    def count(self, filters: Dict[str, str]) -> int:
+        return int(np.count_nonzero(self.mask(filters)))
+
+    def search_page(
+        self, filters: Dict[str, str], page_size: int, after_id: Optional[int] = None, descending: bool = False
+    ) -> Tuple[pd.DataFrame, Optional[int]]:
+        """One keyset page in id order, like query_page(); returns (RESULT_COLUMNS DataFrame, next page token)."""
+        mask = self.mask(filters)
+        if after_id is None:
+            rows = np.flatnonzero(mask)
+        elif descending:
+            rows = np.flatnonzero(mask[: np.searchsorted(self.ids, after_id, side="left")])
+        else:
+            start = np.searchsorted(self.ids, after_id, side="right")
+            rows = np.flatnonzero(mask[start:]) + start
+        page = rows[::-1][: page_size + 1] if descending else rows[: page_size + 1]
+        next_after = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            next_after = int(self.ids[page[-1]])
+        return pd.DataFrame({name: self.columns[name].take(page) for name in RESULT_COLUMNS}), next_after
@@ -3,23 +3,56 @@
 
 Example:
   python scrape_prgi.py --start-page 1 --end-page 77 --items-per-page 1000 --output prgi_77000.csv
+
+Concurrent crawl (pages fetched by 4 threads, paced by an adaptive rate limiter,
+and parsed by 2 worker processes):
+  python scrape_prgi.py --workers 4 --parse-workers 2 --rate 1 --max-rate 6 --output prgi_77000.csv
+
+Daily refresh: stop at the first page whose registrations are all in the DB:
+  python scrape_prgi.py --since-db prgi_data.db --output prgi_new.csv
+
+Load pages straight into the SQLite database as they arrive, without a CSV:
+  python scrape_prgi.py --db prgi_data.db --no-csv
+
+Continue an interrupted crawl, or re-run only the pages that failed:
+  python scrape_prgi.py --output prgi_77000.csv --resume
+  python scrape_prgi.py --output prgi_77000.csv --retry-failed
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import io
 import json
+import multiprocessing
+import os
 import random
 import re
+import sqlite3
+import threading
 import time
-from typing import Dict, Iterable, List, Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
 
 import requests
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from prgi_data_manager import TABLE_NAME, connect_db, insert_rows, normalize_header
+
+try:
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml is optional; the "lxml" parser backend needs it.
+    lxml_etree = None
+    lxml_html = None
+
 BASE_URL = "https://prgi.gov.in/registration-title-details"
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -29,9 +62,14 @@ DEFAULT_HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
 }
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+# (page, html, rows already known from the response cache, error)
+HtmlResult = Tuple[int, Optional[str], Optional[List[Dict[str, str]]], Optional[Exception]]
+PageResult = Tuple[int, Optional[List[Dict[str, str]]], Optional[Exception]]
 
 
-def build_session() -> requests.Session:
+def build_session(pool_size: int = 10) -> requests.Session:
     session = requests.Session()
     retry = Retry(
         total=5,
@@ -42,13 +80,97 @@ def build_session() -> requests.Session:
         allowed_methods=["GET"],
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=max(pool_size, 1))
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     session.headers.update(DEFAULT_HEADERS)
     return session
 
 
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose refill rate adapts to server health.
+
+    The rate follows AIMD: every healthy response adds ``increase`` requests/sec
+    (up to ``max_rate``), every 429/5xx multiplies the rate by ``decrease``
+    (down to ``min_rate``) and drains the bucket so in-flight workers pause.
+    A ``Retry-After`` header pauses all workers for the requested time.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.2,
+        max_rate: float = 8.0,
+        burst: float = 1.0,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+    ) -> None:
+        if min_rate <= 0 or max_rate < min_rate:
+            raise ValueError("Invalid rate bounds")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.burst = max(burst, 1.0)
+        self.increase = increase
+        self.decrease = decrease
+        self.throttled = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = max(self._paused_until - now, (1.0 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = 0.0
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+    def observe(self, response: requests.Response) -> None:
+        """Feed a response (including urllib3's internal retries) back into the limiter."""
+        throttled = response.status_code in THROTTLE_STATUSES
+        retries = getattr(response.raw, "retries", None)
+        history = getattr(retries, "history", None) or ()
+        throttled = throttled or any(event.status in THROTTLE_STATUSES for event in history)
+        if throttled:
+            self.record_throttle(parse_retry_after(response.headers.get("Retry-After")))
+        else:
+            self.record_success()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        # HTTP-date form; fall back to the limiter's own backoff.
+        return None
+
+
 def page_params(page: int, items_per_page: int) -> Dict[str, str]:
     return {
         "title_name": "",
@@ -66,7 +188,20 @@ def clean_text(value: str) -> str:
     return re.sub(r"\s+", " ", value or "").strip()
 
 
-def parse_table_from_html(html: str) -> List[Dict[str, str]]:
+def _rows_from_cells(headers: List[str], body_rows: Iterable[List[str]]) -> List[Dict[str, str]]:
+    rows: List[Dict[str, str]] = []
+    for values in body_rows:
+        if not values:
+            continue
+        if headers and len(headers) == len(values):
+            row = dict(zip(headers, values))
+        else:
+            row = {f"col_{i+1}": val for i, val in enumerate(values)}
+        rows.append(row)
+    return rows
+
+
+def _parse_table_bs4(html: str) -> List[Dict[str, str]]:
     soup = BeautifulSoup(html, "html.parser")
 
     table = soup.select_one("table")
@@ -79,31 +214,457 @@ def parse_table_from_html(html: str) -> List[Dict[str, str]]:
         if first_row:
             headers = [clean_text(cell.get_text(" ", strip=True)) for cell in first_row.find_all(["th", "td"]) ]
 
-    rows: List[Dict[str, str]] = []
     body_rows = table.select("tbody tr") or table.select("tr")[1:]
+    return _rows_from_cells(
+        headers, ([clean_text(td.get_text(" ", strip=True)) for td in tr.find_all("td")] for tr in body_rows)
+    )
 
-    for tr in body_rows:
-        cells = tr.find_all("td")
-        if not cells:
-            continue
-        values = [clean_text(td.get_text(" ", strip=True)) for td in cells]
-        if headers and len(headers) == len(values):
-            row = dict(zip(headers, values))
+
+class _IrregularTable(Exception):
+    """Markup the streaming parser does not model; the caller falls back to bs4."""
+
+
+class _TableStateParser(HTMLParser):
+    """Collect cell text of the first ``<table>`` with a flat state machine.
+
+    Inside the table every end tag must close the innermost open element and
+    sections/rows/cells must appear where the HTML table model puts them.
+    Anything else (nested tables, unclosed cells, stray end tags, a table that
+    sits inside a ``<tbody>``/``<tr>``...) is ambiguous without a full tree, so
+    ``_IrregularTable`` is raised and the page is parsed with bs4 instead.
+    Text is gathered the way ``get_text(" ", strip=True)`` sees it: one string
+    per text node, skipping comments and script/style/template content.
+    """
+
+    SECTIONS = ("thead", "tbody", "tfoot")
+    TABLE_TAGS = ("table", "thead", "tbody", "tfoot", "tr", "td", "th")
+    SKIP_TEXT = ("script", "style", "template")
+    VOID = frozenset(
+        "area base basefont bgsound br col command embed frame hr image img input isindex "
+        "keygen link menuitem meta nextid param source spacer track wbr".split()
+    )
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.found = False
+        self.done = False
+        self.header_cells: List[str] = []
+        # Each row: (inside tbody, [(cell tag, text), ...])
+        self.rows: List[Tuple[bool, List[Tuple[str, str]]]] = []
+        self._outer: List[str] = []
+        self._stack: List[str] = []
+        self._section = ""
+        self._row: Optional[List[Tuple[str, str]]] = None
+        self._cell = ""
+        self._parts: List[str] = []
+        self._pending: List[str] = []
+        self._skip = 0
+
+    def _flush_text(self) -> None:
+        if self._pending:
+            self._parts.append("".join(self._pending))
+            self._pending = []
+
+    def _close_cell(self) -> None:
+        self._flush_text()
+        if self._cell:
+            text = clean_text(" ".join(self._parts))
+            self._row.append((self._cell, text))
+            if self._section == "thead" and self._cell == "th":
+                self.header_cells.append(text)
+            self._cell = ""
+            self._parts = []
+
+    def _close_row(self) -> None:
+        self._close_cell()
+        if self._row is not None:
+            self.rows.append((self._section == "tbody", self._row))
+            self._row = None
+
+    def finish(self) -> None:
+        """End of document: close whatever the table left open."""
+        if self.found and not self.done:
+            self._close_row()
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if self.done:
+            return
+        if not self.found:
+            if tag == "table":
+                if any(name in self.TABLE_TAGS for name in self._outer):
+                    raise _IrregularTable(tag)
+                self.found = True
+                self._stack = [tag]
+            elif tag not in self.VOID:
+                self._outer.append(tag)
+            return
+
+        self._flush_text()
+        if tag in self.VOID:
+            return
+        top = self._stack[-1]
+        if tag == "table":
+            raise _IrregularTable(tag)
+        if tag in self.SECTIONS:
+            if top != "table":
+                raise _IrregularTable(tag)
+            self._section = tag
+        elif tag == "tr":
+            if top != "table" and top not in self.SECTIONS:
+                raise _IrregularTable(tag)
+            self._row = []
+        elif tag in ("td", "th"):
+            if top != "tr":
+                raise _IrregularTable(tag)
+            self._cell = tag
+            self._parts = []
+        elif tag in self.SKIP_TEXT:
+            self._skip += 1
+        self._stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in self.VOID:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag) -> None:
+        if self.done:
+            return
+        if not self.found:
+            if tag in self._outer:
+                idx = len(self._outer) - 1 - self._outer[::-1].index(tag)
+                del self._outer[idx:]
+            return
+
+        self._flush_text()
+        if self._stack[-1] != tag:
+            raise _IrregularTable(tag)
+        self._stack.pop()
+        if tag == self._cell:
+            self._close_cell()
+        elif tag == "tr":
+            self._close_row()
+        elif tag == self._section:
+            self._section = ""
+        elif tag in self.SKIP_TEXT:
+            self._skip -= 1
+        elif tag == "table":
+            self.done = True
+
+    def handle_data(self, data) -> None:
+        if self._cell and not self._skip:
+            self._pending.append(data)
+
+    def handle_comment(self, data) -> None:
+        self._flush_text()
+
+    def unknown_decl(self, data) -> None:
+        self._flush_text()
+        if data.startswith("CDATA[") and self._cell and not self._skip:
+            self._parts.append(data[len("CDATA[") :])
+
+    def handle_decl(self, decl) -> None:
+        self._flush_text()
+
+    def handle_pi(self, data) -> None:
+        self._flush_text()
+
+
+def _parse_table_html(html: str) -> List[Dict[str, str]]:
+    parser = _TableStateParser()
+    try:
+        parser.feed(html)
+        parser.close()
+        parser.finish()
+    except _IrregularTable:
+        return _parse_table_bs4(html)
+    if not parser.found:
+        return []
+
+    headers = parser.header_cells
+    if not headers and parser.rows:
+        headers = [text for _, text in parser.rows[0][1]]
+
+    body_rows = [cells for in_tbody, cells in parser.rows if in_tbody] or [cells for _, cells in parser.rows[1:]]
+    return _rows_from_cells(headers, ([text for tag, text in cells if tag == "td"] for cells in body_rows))
+
+
+def _lxml_text(element) -> str:
+    parts: List[str] = []
+
+    def walk(node) -> None:
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in _TableStateParser.SKIP_TEXT:
+                walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(element)
+    return clean_text(" ".join(parts))
+
+
+_TABLE_TAG = re.compile(r"<(/?)(table|thead|tbody|tfoot|tr|td|th)\b[^>]*?(/?)>", re.IGNORECASE)
+# Where each table tag may open; "" is outside the table.
+_TABLE_PARENTS = {
+    "table": ("",),
+    **{section: ("table",) for section in _TableStateParser.SECTIONS},
+    "tr": ("table", *_TableStateParser.SECTIONS),
+    "td": ("tr",),
+    "th": ("tr",),
+}
+
+
+def _regular_table_tags(html: str) -> bool:
+    """Check the first table's tags against the rules ``_TableStateParser`` enforces.
+
+    Only explicit, properly nested table/section/row/cell tags pass; libxml2
+    and html.parser repair anything else (unclosed cells, nested tables,
+    stray end tags) into different trees. Tags inside comments or scripts
+    also fail the check, which only costs a bs4 parse.
+    """
+    stack = [""]
+    for closing, tag, empty in _TABLE_TAG.findall(html):
+        tag = tag.lower()
+        if empty:
+            return False
+        if closing:
+            if stack[-1] != tag:
+                return False
+            stack.pop()
+            if len(stack) == 1:
+                return True
+        elif stack[-1] not in _TABLE_PARENTS[tag]:
+            return False
         else:
-            row = {f"col_{i+1}": val for i, val in enumerate(values)}
-        rows.append(row)
+            stack.append(tag)
+    return len(stack) == 1
 
-    return rows
 
+def _parse_table_lxml(html: str) -> List[Dict[str, str]]:
+    if lxml_html is None:
+        raise RuntimeError("The lxml parser backend requires the lxml package (pip install lxml)")
+    if not _regular_table_tags(html):
+        return _parse_table_bs4(html)
+    try:
+        doc = lxml_html.fromstring(html)
+    except (lxml_etree.ParserError, ValueError):
+        return []
+    tables = doc.xpath("descendant-or-self::table")
+    if not tables:
+        return []
+    table = tables[0]
+
+    headers = [_lxml_text(th) for th in table.xpath(".//thead//th")]
+    if not headers:
+        first_row = table.xpath(".//tr")
+        if first_row:
+            headers = [_lxml_text(cell) for cell in first_row[0].xpath(".//th|.//td")]
+
+    body_rows = table.xpath(".//tbody//tr") or table.xpath(".//tr")[1:]
+    return _rows_from_cells(headers, ([_lxml_text(td) for td in tr.xpath(".//td")] for tr in body_rows))
+
+
+# Table parser backends, selectable with --parser. All produce the same rows:
+#   bs4  - BeautifulSoup tree over html.parser (reference implementation)
+#   html - streaming html.parser state machine; falls back to bs4 on nested/unclosed table tags
+#   lxml - libxml2 tree (optional dependency); libxml2 repairs malformed markup differently, so
+#          pages whose table tags are not explicit and properly nested go to bs4 as well
+PARSER_BACKENDS: Dict[str, Callable[[str], List[Dict[str, str]]]] = {
+    "bs4": _parse_table_bs4,
+    "html": _parse_table_html,
+    "lxml": _parse_table_lxml,
+}
+DEFAULT_PARSER = "html"
+
+
+def parse_table_from_html(html: str, parser: str = DEFAULT_PARSER) -> List[Dict[str, str]]:
+    try:
+        backend = PARSER_BACKENDS[parser]
+    except KeyError:
+        raise ValueError(f"Unknown parser backend: {parser}") from None
+    return backend(html)
+
+
+class ResponseCache:
+    """On-disk cache of listing pages for conditional re-crawls.
+
+    Entries are keyed by URL plus query parameters. Each holds the response
+    body, its ETag/Last-Modified validators and a body hash, plus the rows
+    parsed from that body. A later crawl sends the validators; on a 304, or
+    a 200 whose body hash is unchanged, the stored rows are reused and the
+    page is not parsed again. ``evict()`` removes least recently used
+    entries until the directory fits in ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.not_modified = 0
+        self.unchanged = 0
+        self.refreshed = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: Dict[str, str]) -> str:
+        return hashlib.sha256(f"{url}?{urlencode(sorted(params.items()))}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def _read_meta(self, key: str) -> Dict[str, str]:
+        try:
+            with open(self._path(key, ".json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, path: str, text: str) -> None:
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        meta = self._read_meta(key)
+        if not meta or not os.path.exists(self._path(key, ".html")):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _cached_rows(self, key: str) -> Optional[List[Dict[str, str]]]:
+        try:
+            with open(self._path(key, ".rows.json"), "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        now = time.time()
+        for suffix in (".json", ".html", ".rows.json"):
+            try:
+                os.utime(self._path(key, suffix), (now, now))
+            except OSError:
+                pass
+        return rows
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def resolve(self, key: str, response: requests.Response) -> Tuple[str, Optional[List[Dict[str, str]]]]:
+        """Return ``(html, rows)`` for a response; ``rows`` is set when parsing can be skipped."""
+        if response.status_code == 304:
+            with open(self._path(key, ".html"), "r", encoding="utf-8") as f:
+                html = f.read()
+            rows = self._cached_rows(key)
+            self._count("not_modified")
+            return html, rows
+
+        html = response.text
+        body_hash = hashlib.blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+        meta = self._read_meta(key)
+        if meta.get("body_hash") == body_hash:
+            rows = self._cached_rows(key)
+            if rows is not None:
+                self._count("unchanged")
+                return html, rows
 
-def fetch_page(session: requests.Session, page: int, items_per_page: int, timeout: int) -> List[Dict[str, str]]:
-    response = session.get(BASE_URL, params=page_params(page, items_per_page), timeout=timeout)
+        self._write(self._path(key, ".html"), html)
+        self._write(
+            self._path(key, ".json"),
+            json.dumps(
+                {
+                    "url": response.url,
+                    "etag": response.headers.get("ETag", ""),
+                    "last_modified": response.headers.get("Last-Modified", ""),
+                    "body_hash": body_hash,
+                }
+            ),
+        )
+        try:
+            os.remove(self._path(key, ".rows.json"))
+        except OSError:
+            pass
+        self._count("refreshed")
+        return html, None
+
+    def store_rows(self, key: str, rows: List[Dict[str, str]]) -> None:
+        self._write(self._path(key, ".rows.json"), json.dumps(rows, ensure_ascii=False))
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits ``max_bytes``; returns entries removed."""
+        entries: Dict[str, List[float]] = {}
+        for name in os.listdir(self.directory):
+            key = name.split(".", 1)[0]
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            size_mtime = entries.setdefault(key, [0.0, 0.0])
+            size_mtime[0] += st.st_size
+            size_mtime[1] = max(size_mtime[1], st.st_mtime)
+
+        total = sum(size for size, _ in entries.values())
+        removed = 0
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for name in os.listdir(self.directory):
+                if name.split(".", 1)[0] == key:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def fetch_response(
+    session: requests.Session,
+    page: int,
+    items_per_page: int,
+    timeout: int,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    if limiter is not None:
+        limiter.acquire()
+    try:
+        response = session.get(
+            BASE_URL, params=page_params(page, items_per_page), timeout=timeout, headers=headers
+        )
+    except requests.RequestException:
+        if limiter is not None:
+            limiter.record_throttle()
+        raise
+    if limiter is not None:
+        limiter.observe(response)
     response.raise_for_status()
-    rows = parse_table_from_html(response.text)
+    return response
+
+
+def fetch_html(
+    session: requests.Session,
+    page: int,
+    items_per_page: int,
+    timeout: int,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+) -> str:
+    return fetch_response(session, page, items_per_page, timeout, limiter=limiter).text
+
+
+def parse_page(html: str, parser: str = DEFAULT_PARSER) -> List[Dict[str, str]]:
+    rows = parse_table_from_html(html, parser=parser)
 
     if not rows:
         # Some sites embed data in JS; try extracting JSON arrays from scripts as fallback.
-        script_json_match = re.search(r"(\[\s*\{.*?\}\s*\])", response.text, flags=re.S)
+        script_json_match = re.search(r"(\[\s*\{.*?\}\s*\])", html, flags=re.S)
         if script_json_match:
             try:
                 data = json.loads(script_json_match.group(1))
@@ -115,16 +676,213 @@ def fetch_page(session: requests.Session, page: int, items_per_page: int, timeou
     return rows
 
 
+def save_page_html(directory: str, page: int, html: str) -> None:
+    with open(os.path.join(directory, f"page_{page:04d}.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+def fetch_page(
+    session: requests.Session,
+    page: int,
+    items_per_page: int,
+    timeout: int,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    parser: str = DEFAULT_PARSER,
+    save_html: str = "",
+) -> List[Dict[str, str]]:
+    html = fetch_html(session, page, items_per_page, timeout, limiter=limiter)
+    if save_html:
+        save_page_html(save_html, page, html)
+    return parse_page(html, parser=parser)
+
+
+def _fetch_task(
+    session: requests.Session,
+    page: int,
+    items_per_page: int,
+    timeout: int,
+    limiter: Optional[AdaptiveRateLimiter],
+    save_html: str,
+    cache: Optional[ResponseCache],
+) -> HtmlResult:
+    rows = None
+    try:
+        if cache is None:
+            html = fetch_html(session, page, items_per_page, timeout, limiter=limiter)
+        else:
+            key = cache.key(BASE_URL, page_params(page, items_per_page))
+            response = fetch_response(
+                session, page, items_per_page, timeout, limiter=limiter, headers=cache.conditional_headers(key)
+            )
+            html, rows = cache.resolve(key, response)
+    except requests.RequestException as exc:
+        return page, None, None, exc
+    if save_html:
+        save_page_html(save_html, page, html)
+    return page, html, rows, None
+
+
+def iter_html(
+    session: requests.Session,
+    pages: Sequence[int],
+    items_per_page: int,
+    timeout: int,
+    workers: int = 1,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    delay: Tuple[float, float] = (0.8, 1.8),
+    save_html: str = "",
+    cache: Optional[ResponseCache] = None,
+) -> Iterator[HtmlResult]:
+    """Fetch stage: yield ``(page, html, cached_rows, error)`` for each page, in page order.
+
+    With ``workers <= 1`` pages are fetched one at a time with a random delay
+    between requests. Otherwise a thread pool shares ``session`` and pacing is
+    left to ``limiter``; at most ``2 * workers`` pages are in flight, so a slow
+    page only holds back a bounded window of finished ones.
+    """
+    if workers <= 1:
+        for idx, page in enumerate(pages):
+            if idx:
+                time.sleep(random.uniform(*delay))
+            yield _fetch_task(session, page, items_per_page, timeout, limiter, save_html, cache)
+        return
+
+    remaining = iter(pages)
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prgi-fetch") as pool:
+
+        def submit(page: int) -> None:
+            pending.append(
+                pool.submit(_fetch_task, session, page, items_per_page, timeout, limiter, save_html, cache)
+            )
+
+        try:
+            for page in remaining:
+                submit(page)
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                page = next(remaining, None)
+                if page is not None:
+                    submit(page)
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_pages(
+    session: requests.Session,
+    pages: Sequence[int],
+    items_per_page: int,
+    timeout: int,
+    workers: int = 1,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    delay: Tuple[float, float] = (0.8, 1.8),
+    parser: str = DEFAULT_PARSER,
+    save_html: str = "",
+    parse_workers: int = 0,
+    cache: Optional[ResponseCache] = None,
+) -> Iterator[PageResult]:
+    """Yield ``(page, rows, error)`` for each page, in page order.
+
+    Pages come from the ``iter_html()`` fetch stage. With ``parse_workers``
+    set, parsing runs in a process pool: up to ``2 * parse_workers`` pages
+    wait in the queue between the stages, and while the consumer waits on the
+    oldest of them the fetch threads keep downloading. Otherwise each page is
+    parsed on the consuming thread as it arrives. Pages whose rows came from
+    ``cache`` skip parsing; freshly parsed rows are stored back into it.
+    """
+    fetched = iter_html(
+        session,
+        pages,
+        items_per_page,
+        timeout,
+        workers=workers,
+        limiter=limiter,
+        delay=delay,
+        save_html=save_html,
+        cache=cache,
+    )
+
+    def finish(page: int, rows, error: Optional[Exception]) -> PageResult:
+        if isinstance(rows, Future):
+            rows = rows.result()
+            if cache is not None:
+                cache.store_rows(cache.key(BASE_URL, page_params(page, items_per_page)), rows)
+        return page, rows, error
+
+    if parse_workers <= 0:
+        for page, html, rows, error in fetched:
+            if error is None and rows is None:
+                rows = parse_page(html, parser=parser)
+                if cache is not None:
+                    cache.store_rows(cache.key(BASE_URL, page_params(page, items_per_page)), rows)
+            yield page, rows, error
+        return
+
+    queue: deque = deque()
+    # spawn, not fork: the fetch threads may be holding locks when a worker starts.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=parse_workers, mp_context=context) as pool:
+        try:
+            for page, html, rows, error in fetched:
+                if error is None and rows is None:
+                    rows = pool.submit(parse_page, html, parser)
+                queue.append((page, rows, error))
+                while len(queue) >= 2 * parse_workers:
+                    yield finish(*queue.popleft())
+            while queue:
+                yield finish(*queue.popleft())
+        finally:
+            fetched.close()
+            for _, rows, _ in queue:
+                if isinstance(rows, Future):
+                    rows.cancel()
+
+
+def row_digest(row: Dict[str, str]) -> bytes:
+    """Fixed-size (8 byte) fingerprint of a row, independent of column order.
+
+    Empty values are ignored: a missing column and an empty one are written to
+    the CSV identically, so rows read back from an existing output file hash
+    the same as the scraped rows they came from.
+    """
+    items = sorted((k, v) for k, v in row.items() if v)
+    payload = json.dumps(items, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest()
+
+
+def rows_digest(rows: List[Dict[str, str]]) -> str:
+    """Content hash of a parsed page, recorded in the crawl journal."""
+    payload = json.dumps(rows, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class RowDeduper:
+    """Drop rows already seen, remembering only an 8-byte digest per row."""
+
+    def __init__(self) -> None:
+        self.seen: set = set()
+
+    def remember(self, rows: Iterable[Dict[str, str]]) -> None:
+        """Mark rows as seen without holding on to them (e.g. the rows already in a resumed CSV)."""
+        self.seen.update(row_digest(row) for row in rows)
+
+    def filter(self, rows: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+        unique: List[Dict[str, str]] = []
+        for row in rows:
+            key = row_digest(row)
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            unique.append(row)
+        return unique
+
+
 def dedupe(rows: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
-    unique: List[Dict[str, str]] = []
-    seen = set()
-    for row in rows:
-        key = tuple(sorted(row.items()))
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append(row)
-    return unique
+    return RowDeduper().filter(rows)
 
 
 def write_csv(path: str, rows: List[Dict[str, str]]) -> None:
@@ -145,50 +903,466 @@ def write_csv(path: str, rows: List[Dict[str, str]]) -> None:
         writer.writerows(rows)
 
 
+class StreamingCSVWriter:
+    """Append pages of rows to a CSV file as they arrive.
+
+    The header is taken from the columns of the first page written. Columns
+    that first appear on a later page are appended to the end of the header:
+    the file is rewritten right away, streaming, with the new header and the
+    earlier rows padded, and replaced atomically. The output is identical to
+    ``write_csv()`` over the same rows.
+
+    Each page is written in one piece and fsynced, so a killed process leaves
+    at most one torn row at the end of the file, and never a stale header.
+
+    With ``append=True`` an existing file is continued: a torn last row is
+    cut off, and so are rows beyond ``keep_rows`` (the row count the crawl
+    journal recorded with its last completed page), whose page will be
+    fetched again. Its header is reused and new rows are appended after the
+    ones kept.
+    """
+
+    def __init__(self, path: str, append: bool = False, keep_rows: Optional[int] = None) -> None:
+        self.path = path
+        self.fieldnames: List[str] = []
+        self.rows_written = 0
+        self.rows_in_file = 0
+        self.dropped_rows = 0
+        self._written_header: List[str] = []
+        self._file = None
+        self._append = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if self._append:
+            self.rows_in_file = self._recover(keep_rows)
+            self._append = os.path.getsize(path) > 0
+        if self._append:
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                self.fieldnames = next(csv.reader(f), [])
+            self._written_header = list(self.fieldnames)
+
+    def _recover(self, keep_rows: Optional[int]) -> int:
+        """Truncate the file after its last whole row (at most ``keep_rows`` rows); returns the rows kept."""
+        size = os.path.getsize(self.path)
+        ends: List[int] = []
+        consumed = 0
+        with open(self.path, "rb") as f:
+
+            def lines() -> Iterator[str]:
+                nonlocal consumed
+                for line in f:
+                    consumed += len(line)
+                    yield line.decode("utf-8", errors="replace")
+
+            try:
+                # csv.reader pulls lines only as far as the record it returns, so ``consumed`` is where it ends.
+                for _ in csv.reader(lines()):
+                    ends.append(consumed)
+            except csv.Error:
+                pass  # A quoted value cut off at the end of the file.
+            f.seek(max(size - 1, 0))
+            if ends and ends[-1] == size and f.read(1) != b"\n":
+                ends.pop()
+        # ends[0] is the end of the header line, ends[i] the end of row i.
+        rows = max(len(ends) - 1, 0)
+        kept = rows if keep_rows is None else min(rows, keep_rows)
+        cut = ends[kept] if ends else 0
+        if cut < size:
+            torn = 1 if (ends[-1] if ends else 0) < size else 0
+            self.dropped_rows = rows - kept + torn
+            with open(self.path, "r+b") as f:
+                f.truncate(cut)
+                os.fsync(f.fileno())
+        return kept
+
+    def existing_rows(self) -> Iterator[Dict[str, str]]:
+        """Stream the rows already in the file being appended to."""
+        if not self._append:
+            return
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            for values in reader:
+                yield {col: val for col, val in zip(header, values) if val}
+
+    def write_rows(self, rows: List[Dict[str, str]]) -> None:
+        if not rows:
+            return
+        known = set(self.fieldnames)
+        for row in rows:
+            for col in row:
+                if col not in known:
+                    known.add(col)
+                    self.fieldnames.append(col)
+
+        if self._file is None and not self._append:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._write_lines([self.fieldnames])
+            self._written_header = list(self.fieldnames)
+        elif self.fieldnames != self._written_header:
+            self._rewrite_header()
+        if self._file is None:
+            self._file = open(self.path, "a", newline="", encoding="utf-8")
+
+        fieldnames = self.fieldnames
+        self._write_lines([row.get(col, "") for col in fieldnames] for row in rows)
+        self.rows_written += len(rows)
+        self.rows_in_file += len(rows)
+
+    def _write_lines(self, values: Iterable[List[str]]) -> None:
+        """Write whole CSV rows in one call and fsync them."""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(values)
+        self._file.write(buffer.getvalue())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+
+    def _rewrite_header(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        width = len(self.fieldnames)
+        tmp_path = f"{self.path}.tmp"
+        with open(self.path, "r", newline="", encoding="utf-8") as src, open(
+            tmp_path, "w", newline="", encoding="utf-8"
+        ) as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            next(reader, None)
+            writer.writerow(self.fieldnames)
+            for values in reader:
+                if len(values) < width:
+                    values.extend([""] * (width - len(values)))
+                writer.writerow(values)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, self.path)
+        self._written_header = list(self.fieldnames)
+
+
+def load_known_registrations(db_path: str) -> set:
+    """Registration numbers already present in a prgi_data_manager database."""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(db_path)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cur = conn.execute(f"SELECT DISTINCT registration_number FROM {TABLE_NAME} WHERE registration_number != ''")
+        return {value for (value,) in cur}
+    finally:
+        conn.close()
+
+
+def new_registrations(rows: List[Dict[str, str]], known: set) -> Tuple[List[Dict[str, str]], int]:
+    """Split off rows whose registration number is not in ``known``.
+
+    Returns the rows to keep and how many carried an unknown registration
+    number. Rows without a registration number cannot be matched and are
+    kept, but do not count as new.
+    """
+    key = next((col for col in rows[0] if normalize_header(col) == "registration_number"), None) if rows else None
+    if key is None:
+        return rows, len(rows)
+    keep: List[Dict[str, str]] = []
+    unknown = 0
+    for row in rows:
+        number = row.get(key, "")
+        if not number:
+            keep.append(row)
+        elif number not in known:
+            unknown += 1
+            keep.append(row)
+    return keep, unknown
+
+
+class SQLiteSink:
+    """Insert scraped pages into the prgi_data_manager schema as they arrive.
+
+    Rows go through ``row_to_canonical()`` like a CSV import; each page is
+    one transaction (inserted in ``batch_size`` chunks), so a page is either
+    stored whole or not at all, and duplicates are skipped by the unique index.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 1000) -> None:
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.conn = connect_db(db_path)
+        self.inserted = 0
+        self.skipped = 0
+
+    def write_rows(self, rows: List[Dict[str, str]]) -> None:
+        try:
+            inserted, skipped = insert_rows(self.conn, rows, batch_size=self.batch_size, commit=False)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.inserted += inserted
+        self.skipped += skipped
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class CrawlJournal:
+    """Append-only JSONL record of per-page crawl outcomes.
+
+    Each line is ``{"page", "status", "rows", "hash", "items_per_page", ...}``
+    with status ``ok`` or ``failed``; the last line for a page wins. Entries
+    recorded with a different ``items_per_page`` describe different page
+    boundaries and are ignored. ``ok`` entries of a CSV crawl also carry
+    ``csv_rows``, the rows in the output file once the page was written;
+    ``csv_rows`` holds the latest one.
+    """
+
+    def __init__(self, path: str, items_per_page: int) -> None:
+        self.path = path
+        self.items_per_page = items_per_page
+        self.entries: Dict[int, Dict[str, object]] = {}
+        self.csv_rows: Optional[int] = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line from a killed process.
+                        continue
+                    if "csv_rows" in entry:
+                        self.csv_rows = int(entry["csv_rows"])
+                    if entry.get("items_per_page") == items_per_page:
+                        self.entries[int(entry["page"])] = entry
+
+    def reset(self) -> None:
+        self.entries.clear()
+        self.csv_rows = None
+        open(self.path, "w", encoding="utf-8").close()
+
+    def pages_with_status(self, status: str) -> set:
+        return {page for page, entry in self.entries.items() if entry.get("status") == status}
+
+    def record(
+        self,
+        page: int,
+        status: str,
+        rows: int = 0,
+        content_hash: str = "",
+        error: str = "",
+        csv_rows: Optional[int] = None,
+    ) -> None:
+        entry: Dict[str, object] = {
+            "page": page,
+            "status": status,
+            "rows": rows,
+            "hash": content_hash,
+            "items_per_page": self.items_per_page,
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        if error:
+            entry["error"] = error
+        if csv_rows is not None:
+            entry["csv_rows"] = self.csv_rows = csv_rows
+        self.entries[page] = entry
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Scrape prgi.gov.in registration title details")
     parser.add_argument("--start-page", type=int, default=1)
     parser.add_argument("--end-page", type=int, default=77)
     parser.add_argument("--items-per-page", type=int, default=1000)
     parser.add_argument("--output", default="prgi_registration_title_details.csv")
+    parser.add_argument("--db", default="", help="Also insert rows into this SQLite DB (prgi_data_manager schema)")
+    parser.add_argument("--no-csv", action="store_true", help="Skip the CSV output; requires --db")
     parser.add_argument("--timeout", type=int, default=60)
     parser.add_argument("--min-delay", type=float, default=0.8, help="Minimum delay between page requests")
     parser.add_argument("--max-delay", type=float, default=1.8, help="Maximum delay between page requests")
     parser.add_argument("--no-dedupe", action="store_true", help="Keep duplicate rows")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Fetch pages concurrently with N threads paced by an adaptive rate limiter (1 = sequential with delays)",
+    )
+    parser.add_argument("--rate", type=float, default=1.0, help="Initial request rate (req/s) when --workers > 1")
+    parser.add_argument("--min-rate", type=float, default=0.2, help="Lowest rate the limiter backs off to")
+    parser.add_argument("--max-rate", type=float, default=8.0, help="Highest rate the limiter ramps up to")
+    parser.add_argument(
+        "--since-db",
+        default="",
+        help="Incremental crawl: emit only registrations missing from this DB, stopping at the first fully known page",
+    )
+    parser.add_argument("--journal", default="", help="Crawl journal path (default: <output>.journal.jsonl)")
+    parser.add_argument(
+        "--parser",
+        choices=sorted(PARSER_BACKENDS),
+        default=DEFAULT_PARSER,
+        help="HTML table parser backend (default: %(default)s; lxml must be installed separately)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Parse pages in N worker processes, overlapping parsing with fetching (0 = parse inline)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help="Cache pages here and re-crawl with conditional requests, reusing parsed rows of unchanged pages",
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=int, default=512, help="Evict least recently used cache entries above this size"
+    )
+    parser.add_argument("--save-html", default="", help="Also save each fetched page's raw HTML into this directory")
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument(
+        "--resume", action="store_true", help="Append to --output, fetching only pages not yet completed"
+    )
+    resume.add_argument(
+        "--retry-failed", action="store_true", help="Append to --output, re-fetching only pages that failed"
+    )
     args = parser.parse_args()
 
     if args.start_page < 1 or args.end_page < args.start_page:
         raise SystemExit("Invalid page range")
+    if args.no_csv and not args.db:
+        raise SystemExit("--no-csv requires --db")
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+    if args.parse_workers < 0:
+        raise SystemExit("--parse-workers cannot be negative")
+    if args.parser == "lxml" and lxml_html is None:
+        raise SystemExit("--parser lxml requires the lxml package (pip install lxml)")
+    if args.save_html:
+        os.makedirs(args.save_html, exist_ok=True)
+    cache = ResponseCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache_dir else None
+    known: Optional[set] = None
+    if args.since_db:
+        try:
+            known = load_known_registrations(args.since_db)
+        except (OSError, sqlite3.Error) as exc:
+            raise SystemExit(f"Cannot read registrations from {args.since_db}: {exc}")
+        print(f"Loaded {len(known)} known registration number(s) from {args.since_db}")
 
-    session = build_session()
-    collected: List[Dict[str, str]] = []
+    session = build_session(pool_size=args.workers)
+    limiter: Optional[AdaptiveRateLimiter] = None
+    if args.workers > 1:
+        limiter = AdaptiveRateLimiter(rate=args.rate, min_rate=args.min_rate, max_rate=args.max_rate)
+    journal_base = args.db if args.no_csv else args.output
+    journal = CrawlJournal(args.journal or f"{journal_base}.journal.jsonl", args.items_per_page)
+    requested = range(args.start_page, args.end_page + 1)
+    pages: Sequence[int] = requested
+    if args.resume:
+        done = journal.pages_with_status("ok")
+        pages = [page for page in requested if page not in done]
+        print(f"Resuming: {len(requested) - len(pages)} page(s) already done, {len(pages)} to fetch")
+    elif args.retry_failed:
+        failed = journal.pages_with_status("failed")
+        pages = [page for page in requested if page in failed]
+        print(f"Retrying {len(pages)} failed page(s)")
+    else:
+        journal.reset()
 
-    for page in range(args.start_page, args.end_page + 1):
-        print(f"Fetching page {page}/{args.end_page} ...")
-        try:
-            rows = fetch_page(session, page=page, items_per_page=args.items_per_page, timeout=args.timeout)
-        except requests.RequestException as exc:
-            print(f"  Failed page {page}: {exc}")
-            continue
+    appending = args.resume or args.retry_failed
+    deduper = None if args.no_dedupe else RowDeduper()
+    writer = None if args.no_csv else StreamingCSVWriter(args.output, append=appending, keep_rows=journal.csv_rows)
+    if writer is not None and writer.dropped_rows:
+        print(f"Dropped {writer.dropped_rows} row(s) of unfinished pages from the end of {args.output}")
+    if deduper is not None and writer is not None and appending:
+        deduper.remember(writer.existing_rows())
+    db_sink = SQLiteSink(args.db) if args.db else None
+    sinks = [sink for sink in (writer, db_sink) if sink is not None]
+    kept_rows = 0
+    fetched_rows = 0
+    pages_done = 0
+    started = time.monotonic()
 
-        if not rows:
-            print(f"  No rows found on page {page}")
-        else:
-            print(f"  Got {len(rows)} rows")
-            collected.extend(rows)
+    try:
+        for page, rows, error in iter_pages(
+            session,
+            pages,
+            items_per_page=args.items_per_page,
+            timeout=args.timeout,
+            workers=args.workers,
+            limiter=limiter,
+            delay=(args.min_delay, args.max_delay),
+            parser=args.parser,
+            save_html=args.save_html,
+            parse_workers=args.parse_workers,
+            cache=cache,
+        ):
+            pages_done += 1
+            if error is not None:
+                print(f"  Failed page {page}: {error}")
+                journal.record(page, "failed", error=str(error))
+                continue
+
+            unknown = len(rows)
+            if not rows:
+                print(f"  No rows found on page {page}")
+            else:
+                keep = rows
+                if known is not None:
+                    keep, unknown = new_registrations(rows, known)
+                    print(f"Page {page}/{args.end_page}: got {len(rows)} rows, {unknown} new registration(s)")
+                else:
+                    print(f"Page {page}/{args.end_page}: got {len(rows)} rows")
+                fetched_rows += len(keep)
+                if deduper is not None:
+                    keep = deduper.filter(keep)
+                kept_rows += len(keep)
+                for sink in sinks:
+                    sink.write_rows(keep)
+            # Journal only after the page's rows are flushed/committed to the outputs.
+            journal.record(
+                page,
+                "ok",
+                rows=len(rows),
+                content_hash=rows_digest(rows),
+                csv_rows=writer.rows_in_file if writer is not None else None,
+            )
+
+            if known is not None and rows and not unknown:
+                print(f"Page {page} holds only known registrations; stopping")
+                break
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    elapsed = time.monotonic() - started
+    summary = f"Fetched {pages_done} page(s) in {elapsed:.1f}s"
+    if limiter is not None:
+        summary += f" (final rate {limiter.rate:.2f} req/s, {limiter.throttled} throttled response(s))"
+    print(summary)
+    if cache is not None:
+        evicted = cache.evict()
+        print(
+            f"Cache: {cache.not_modified} not modified, {cache.unchanged} unchanged, "
+            f"{cache.refreshed} new/changed page(s); evicted {evicted} entr{'y' if evicted == 1 else 'ies'}"
+        )
 
-        time.sleep(random.uniform(args.min_delay, args.max_delay))
+    failed = journal.pages_with_status("failed") & set(requested)
+    if failed:
+        print(f"{len(failed)} page(s) failed; re-run with --retry-failed to fetch them again")
 
-    if not collected:
+    if not fetched_rows and known is not None:
+        print("No new registrations found.")
+        return
+    if not fetched_rows and not appending:
         raise SystemExit("No data collected. Inspect the page HTML/API, it may require different parsing.")
 
-    if not args.no_dedupe:
-        before = len(collected)
-        collected = dedupe(collected)
-        print(f"Deduplicated: {before} -> {len(collected)}")
+    if deduper is not None:
+        print(f"Deduplicated: {fetched_rows} -> {kept_rows}")
 
-    write_csv(args.output, collected)
-    print(f"Saved {len(collected)} rows to {args.output}")
+    if writer is not None:
+        verb = "Appended" if appending else "Saved"
+        print(f"{verb} {writer.rows_written} rows to {args.output}")
+    if db_sink is not None:
+        print(f"Inserted {db_sink.inserted} rows into {args.db} (skipped {db_sink.skipped} already present)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+"""Shared fixtures: small PRGI databases imported from synthetic data."""
+
+from __future__ import annotations
+
+import shutil
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "bench"))
+
+import prgi_data_manager as dm  # noqa: E402
+from synth_data import write_csv  # noqa: E402
+
+SAMPLE_ROWS = 3000
+# Filter dicts the app, CLI and API produce, with values common, rare or absent in the sample data.
+# Contains-filters hold one word, where FTS (every word) and LIKE (whole value) agree.
+FILTER_SHAPES: Dict[str, Dict[str, str]] = {
+    "no_filters": {},
+    "title_common": {"title": "jagran"},
+    "title_rare": {"title": "mathrubhumi"},
+    "title_short": {"title": "aj"},
+    "title_upper": {"title": "SAMACHAR"},
+    "title_missing": {"title": "zzzz"},
+    "owner": {"owner": "kulkarni"},
+    "registration_number": {"registration_number": "/2004/"},
+    "sounds_like": {"sounds_like": "samaachar"},
+    "state_common": {"state": "Uttar Pradesh"},
+    "state_case": {"state": " dELHI "},
+    "state_missing": {"state": "Atlantis"},
+    "state_language": {"state": "Maharashtra", "language": "Marathi"},
+    "district_class": {"district": "Pune", "class_name": "Newspaper"},
+    "title_state": {"title": "samachar", "state": "Delhi"},
+    "all_filters": {"title": "dainik", "state": "Uttar Pradesh", "language": "Hindi", "class_name": "Periodical"},
+}
+
+
+def search_ids(conn, filters: Dict[str, str], fts: bool) -> List[int]:
+    """Ids of every row build_select() matches, newest first."""
+    sql, params = dm.build_select(
+        filters, columns=["id"], fts=fts, descending=True, lookup_ids=dm.filter_lookup_ids(conn, filters)
+    )
+    return [row[0] for row in conn.execute(sql, params)]
+
+
+@pytest.fixture(scope="session")
+def sample_csv(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A deterministic synthetic CSV, shared by every test."""
+    return write_csv(tmp_path_factory.mktemp("data") / "prgi_sample.csv", SAMPLE_ROWS, seed=3)
+
+
+@pytest.fixture(scope="session")
+def sample_db(tmp_path_factory: pytest.TempPathFactory, sample_csv: Path) -> Callable[[str], Path]:
+    """Path of a database holding the sample CSV in the given layout; each test gets its own copy."""
+    built = {}
+
+    def build(layout: str) -> Path:
+        if layout not in built:
+            path = tmp_path_factory.mktemp("db") / f"prgi_{layout}.db"
+            conn = dm.connect_db(str(path))
+            dm.import_csv(conn, str(sample_csv), layout=layout)
+            conn.close()
+            built[layout] = path
+        copy = tmp_path_factory.mktemp("db") / built[layout].name
+        shutil.copyfile(built[layout], copy)
+        return copy
+
+    return build
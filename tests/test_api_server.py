@@ -0,0 +1,131 @@
+"""JSON API over HTTP/1.1: responses on a kept-alive connection, and the same rows as a direct query."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+from typing import Dict, Tuple
+from urllib.parse import urlencode
+
+import pytest
+from conftest import FILTER_SHAPES, search_ids
+
+import prgi_data_manager as dm
+from api_server import SearchAPI
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+async def request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, target: str, gzip_ok: bool = False
+) -> Response:
+    """Send one request on an open connection and read exactly one response."""
+    extra = "Accept-Encoding: gzip\r\n" if gzip_ok else ""
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: test\r\n{extra}\r\n".encode("latin-1"))
+    await writer.drain()
+    status_line, *lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    body = b""
+    if method == "HEAD":
+        pass
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+            body += (await reader.readexactly(size + 2))[:-2]
+            if not size:
+                break
+    else:
+        body = await reader.readexactly(int(headers["content-length"]))
+    if headers.get("content-encoding") == "gzip" and body:
+        body = gzip.decompress(body)
+    return int(status_line.split()[1]), headers, body
+
+
+def run_api(db_path, scenario):
+    """Serve ``db_path`` on a free port and run ``scenario(reader, writer, conn)`` against it."""
+
+    async def main():
+        api = SearchAPI(str(db_path), pool_size=2)
+        api.start()
+        server = await asyncio.start_server(api.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        conn = dm.connect_readonly(str(db_path))
+        try:
+            await scenario(reader, writer, conn)
+        finally:
+            conn.close()
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.sleep(0.05)  # Let the handler see the close and return.
+            server.close()
+            await server.wait_closed()
+            api.close()
+
+    asyncio.run(main())
+
+
+@pytest.fixture(params=dm.LAYOUTS)
+def db_path(request, sample_db):
+    return sample_db(request.param)
+
+
+@pytest.mark.parametrize("path", ["/search?state=Delhi", "/export?state=Delhi&format=csv", "/export?format=ndjson"])
+@pytest.mark.parametrize("gzip_ok", [False, True])
+def test_head_has_no_body(db_path, path, gzip_ok):
+    async def scenario(reader, writer, conn):
+        status, headers, _ = await request(reader, writer, "HEAD", path, gzip_ok)
+        assert status == 200
+        assert headers["connection"] == "keep-alive"
+        # The next response on the connection must start right after the HEAD response's headers.
+        status, _, body = await request(reader, writer, "GET", "/health")
+        assert (status, json.loads(body)) == (200, {"status": "ok"})
+
+    run_api(db_path, scenario)
+
+
+def test_search_and_export_match_direct_query(db_path):
+    async def scenario(reader, writer, conn):
+        for name, filters in FILTER_SHAPES.items():
+            expected = search_ids(conn, filters, dm.has_fts(conn))
+            query = urlencode(filters)
+            status, _, body = await request(reader, writer, "GET", f"/search?{query}&limit=1000", gzip_ok=True)
+            assert status == 200
+            ids = [row["id"] for row in json.loads(body)["rows"]]
+            assert ids == sorted(expected)[:1000], name
+            status, headers, body = await request(reader, writer, "GET", f"/export?{query}&format=csv", gzip_ok=True)
+            assert status == 200
+            rows = list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+            assert sorted((int(row["id"]) for row in rows), reverse=True) == expected, name
+
+    run_api(db_path, scenario)
+
+
+def test_similar_echoes_each_callers_title(sample_db):
+    async def scenario(reader, writer, conn):
+        bodies = []
+        for title in ("Dainik Jagran", "dainik  JAGRAN", "Dainik Jagran"):
+            status, _, body = await request(reader, writer, "GET", f"/similar?{urlencode({'title': title})}")
+            assert status == 200
+            bodies.append(json.loads(body))
+        assert [body["title"] for body in bodies] == ["Dainik Jagran", "dainik  JAGRAN", "Dainik Jagran"]
+        assert bodies[0] == bodies[2]
+
+    run_api(sample_db("row"), scenario)
+
+
+def test_sounds_like_without_letters_is_a_bad_request(sample_db):
+    async def scenario(reader, writer, conn):
+        for path in ("/search", "/export"):
+            status, _, body = await request(reader, writer, "GET", f"{path}?sounds_like=%21%21%21")
+            assert status == 400, path
+            assert "sounds-like" in json.loads(body)["error"]
+
+    run_api(sample_db("row"), scenario)
@@ -0,0 +1,59 @@
+"""ColumnarEngine parity with the SQL search it stands in for."""
+
+from __future__ import annotations
+
+import pytest
+from conftest import FILTER_SHAPES, search_ids
+
+import prgi_data_manager as dm
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+from prgi_engine import RESULT_COLUMNS, ColumnarEngine  # noqa: E402
+
+
+@pytest.fixture(params=dm.LAYOUTS)
+def conn(request, sample_db):
+    conn = dm.connect_db(str(sample_db(request.param)))
+    yield conn
+    conn.close()
+
+
+def engine_ids(engine, filters):
+    """Ids of every row the engine matches, newest first, like search_ids()."""
+    return engine.ids[np.flatnonzero(engine.mask(filters))][::-1].tolist()
+
+
+@pytest.mark.parametrize("fts", [False, True])
+def test_engine_matches_sql(conn, fts):
+    if fts and not dm.has_fts(conn):
+        pytest.skip("SQLite without FTS5 trigram")
+    engine = ColumnarEngine.from_db(conn)
+    engine.fts = fts
+    for name, filters in FILTER_SHAPES.items():
+        expected = search_ids(conn, filters, fts)
+        assert engine_ids(engine, filters) == expected, name
+        assert engine.count(filters) == len(expected), name
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_match_sql(conn, descending):
+    engine = ColumnarEngine.from_db(conn)
+    filters = FILTER_SHAPES["state_common"]
+    pages, after_id = [], None
+    while True:
+        page, after_id = engine.search_page(filters, 100, after_id=after_id, descending=descending)
+        pages.append(page)
+        if after_id is None:
+            break
+    sql, params = dm.build_select(
+        filters,
+        columns=RESULT_COLUMNS,
+        fts=engine.fts,
+        descending=descending,
+        lookup_ids=dm.filter_lookup_ids(conn, filters),
+    )
+    expected = [tuple(row) for row in conn.execute(sql, params)]
+    got = [tuple(row) for page in pages for row in page.itertuples(index=False)]
+    assert len(pages) > 1
+    assert got == expected
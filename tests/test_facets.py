@@ -0,0 +1,70 @@
+"""The facet count cube and db_meta stay equal to a full recount as rows are written."""
+
+from __future__ import annotations
+
+import pytest
+
+import prgi_data_manager as dm
+
+NEW_ROWS = [
+    {"Title Name": "Naya Akhbar", "Registration Number": "GOAKON/2020/00001", "State": "Goa", "Languages": "Konkani"},
+    {"Title Name": "Dainik Jagran", "Registration Number": "UPHIN/2020/00002", "State": "Uttar Pradesh", "Class": ""},
+]
+
+
+def recount(conn):
+    key = ", ".join(f"COALESCE({c}, '')" for c in dm.FACET_COLUMNS)
+    rows = conn.execute(f"SELECT {key}, COUNT(*) FROM {dm.TABLE_NAME} GROUP BY {key}").fetchall()
+    return sorted(tuple(row) for row in rows)
+
+
+def cube(conn):
+    return sorted(tuple(row) for row in conn.execute(f"SELECT {', '.join(dm.FACET_COLUMNS)}, count FROM facet_cube"))
+
+
+def assert_cube_current(conn):
+    assert cube(conn) == recount(conn)
+    total = conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME}").fetchone()[0]
+    assert dm.db_stats(conn)["total_records"] == total
+
+
+@pytest.fixture
+def conn(sample_db):
+    conn = dm.connect_db(str(sample_db("row")))
+    yield conn
+    conn.close()
+
+
+def test_import_builds_cube(conn):
+    assert_cube_current(conn)
+    assert dm.db_version(conn) > 0
+
+
+def test_triggers_track_writes(conn):
+    version = dm.db_version(conn)
+    dm.insert_rows(conn, NEW_ROWS)
+    assert dm.db_version(conn) == version + 2
+    conn.execute(f"UPDATE {dm.TABLE_NAME} SET pub_state_name = 'Goa' WHERE pub_state_name = 'Delhi' AND id % 2 = 0")
+    conn.execute(f"UPDATE {dm.TABLE_NAME} SET language = NULL WHERE id % 11 = 0")
+    conn.execute(f"UPDATE {dm.TABLE_NAME} SET title_name = 'Renamed' WHERE id % 5 = 0")
+    conn.execute(f"DELETE FROM {dm.TABLE_NAME} WHERE class_name = 'Newspaper' AND id % 3 = 0")
+    conn.commit()
+    assert dm.db_version(conn) > version + 2
+    assert_cube_current(conn)
+
+
+@pytest.mark.parametrize(
+    "column, selections",
+    [
+        ("pub_state_name", {}),
+        ("language", {"pub_state_name": "Maharashtra"}),
+        ("pub_dist_name", {"pub_state_name": "Uttar Pradesh", "class_name": "Newspaper"}),
+    ],
+)
+def test_facet_counts_match_group_by(conn, column, selections):
+    where = " AND ".join([f"{column} != ''", *(f"{c} = ?" for c in selections)])
+    expected = conn.execute(
+        f"SELECT {column}, COUNT(*) FROM {dm.TABLE_NAME} WHERE {where} GROUP BY {column} ORDER BY {column}",
+        list(selections.values()),
+    ).fetchall()
+    assert dm.facet_counts(conn, column, selections) == [tuple(row) for row in expected]
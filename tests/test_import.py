@@ -0,0 +1,138 @@
+"""CSV import: the column plan, the record chunker, parallel canonicalization and bulk mode."""
+
+from __future__ import annotations
+
+import csv
+import io
+
+import pytest
+from conftest import FILTER_SHAPES, search_ids
+from synth_data import write_csv
+from test_facets import assert_cube_current
+
+import prgi_data_manager as dm
+
+# Quoted newlines and doubled quotes, a duplicate header, extra columns and a short row.
+TRICKY_CSV = (
+    "Sr No,Title Name,Registration Number,Owner Name,State,Publication District,Languages,Class,title_name,Periodicity\r\n"
+    '1,"Dainik\nJagran",UPHIN/1950/00001,"Ravi ""RG"" Gupta",Uttar Pradesh,Lucknow,Hindi,Newspaper,Jagran,Daily\r\n'
+    '2,Lokmat,MAHMAR/1971/00002,Anil Joshi,Maharashtra,Pune,Marathi,Periodical,"Lok\r\nmat",\r\n'
+    "3,Sakal,MAHMAR/1932/00003\r\n"
+    '4,"""Quoted"" Title",DELENG/2001/00004,"Line one\nline two\nline three",Delhi,New Delhi,English,Periodical,,Weekly\r\n'
+    "5,Mathrubhumi,KERMAL/1923/00005,M. Nair,Kerala,Kozhikode,Malayalam,Newspaper,,Daily\r\n"
+)
+
+
+def reference_tuples(text: str) -> list:
+    return [dm.canonical_tuple(dm.row_to_canonical(row)) for row in csv.DictReader(io.StringIO(text))]
+
+
+def test_plan_matches_row_to_canonical():
+    reader = csv.reader(io.StringIO(TRICKY_CSV))
+    plan = dm.build_column_plan(next(reader))
+    assert [dm.canonicalize_values(values, plan) for values in reader] == reference_tuples(TRICKY_CSV)
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3, 10])
+def test_chunks_hold_whole_records(chunk_rows):
+    body = TRICKY_CSV.split("\r\n", 1)[1]
+    chunks = list(dm.iter_csv_chunks(io.StringIO(body, newline=""), chunk_rows))
+    assert "".join(chunks) == body
+    counts = [len(list(csv.reader(io.StringIO(chunk)))) for chunk in chunks]
+    assert sum(counts) == 5
+    assert all(count == chunk_rows for count in counts[:-1])
+
+
+def test_parallel_canonicalization_keeps_file_order(sample_csv):
+    with open(sample_csv, encoding="utf-8-sig", newline="") as f:
+        serial = list(dm.iter_csv_tuples(f))
+    with open(sample_csv, encoding="utf-8-sig", newline="") as f:
+        parallel = list(dm.iter_csv_tuples(f, workers=2, chunk_rows=250))
+    assert len(serial) > 0
+    assert parallel == serial
+
+
+def test_tricky_csv_imports_like_dict_reader(tmp_path):
+    path = tmp_path / "tricky.csv"
+    path.write_text(TRICKY_CSV, encoding="utf-8", newline="")
+    for workers in (1, 2):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            assert list(dm.iter_csv_tuples(f, workers=workers, chunk_rows=2)) == reference_tuples(TRICKY_CSV)
+
+
+# Non-default values, so restoring them differs from setting the defaults.
+CALLER_PRAGMAS = {"synchronous": 1, "cache_size": -4000, "temp_store": 1}
+
+
+def snapshot(conn):
+    """Rows, schema objects (indexes, triggers, FTS) and facet cube of a database."""
+    columns = ", ".join(dm.ALL_COLUMNS)
+    return {
+        "rows": [tuple(row) for row in conn.execute(f"SELECT {columns} FROM {dm.TABLE_NAME} ORDER BY id")],
+        "schema": sorted(tuple(row) for row in conn.execute("SELECT type, name, tbl_name, sql FROM sqlite_master")),
+        "cube": sorted(tuple(row) for row in conn.execute("SELECT * FROM facet_cube")),
+        "stats": dm.db_stats(conn),
+    }
+
+
+def pragmas(conn):
+    return {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in CALLER_PRAGMAS}
+
+
+def open_db(path):
+    conn = dm.connect_db(str(path))
+    for name, value in CALLER_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+@pytest.mark.parametrize("layout", dm.LAYOUTS)
+def test_bulk_import_matches_row_by_row(tmp_path, sample_csv, layout):
+    tricky = tmp_path / "tricky.csv"
+    tricky.write_text(TRICKY_CSV, encoding="utf-8", newline="")
+    dbs, counts = {}, {}
+    for bulk in (False, True):
+        conn = open_db(tmp_path / f"bulk_{bulk}.db")
+        # Bulk-load into a database that already has rows, so the rebuilds must keep them.
+        dm.import_csv(conn, str(tricky), layout=layout)
+        counts[bulk] = dm.import_csv(conn, str(sample_csv), bulk=bulk)
+        assert pragmas(conn) == CALLER_PRAGMAS
+        dbs[bulk] = conn
+    assert counts[True] == counts[False]
+    assert sum(counts[True]) == 3000
+
+    row_by_row, bulk = dbs[False], dbs[True]
+    assert dm.storage_layout(bulk) == layout
+    assert snapshot(bulk) == snapshot(row_by_row)
+    assert_cube_current(bulk)
+    fts = dm.has_fts(bulk)
+    if fts:
+        bulk.execute(f"INSERT INTO {dm.FTS_TABLE} ({dm.FTS_TABLE}) VALUES ('integrity-check')")
+    for name, filters in FILTER_SHAPES.items():
+        assert search_ids(bulk, filters, fts) == search_ids(row_by_row, filters, fts), name
+    # The triggers are back: later writes keep the cube and the FTS index current.
+    dm.insert_rows(bulk, [{"Title Name": "Naya Jagran", "Registration Number": "GOAKON/2020/00001", "State": "Goa"}])
+    assert_cube_current(bulk)
+    if fts:
+        assert len(search_ids(bulk, {"title": "naya jagran"}, fts=True)) == 1
+    for conn in dbs.values():
+        conn.close()
+
+
+def test_failed_bulk_import_leaves_database_untouched(tmp_path, sample_db):
+    # Undecodable bytes after more rows than one bulk batch, so the load fails midway.
+    bad = write_csv(tmp_path / "bad.csv", 12000, seed=5)
+    with open(bad, "ab") as f:
+        f.write(b"12001,\xff\xfe broken,XXX/2020/1\r\n")
+    conn = open_db(sample_db("row"))
+    before = snapshot(conn)
+    version = dm.db_version(conn)
+    with pytest.raises(UnicodeDecodeError):
+        dm.import_csv(conn, str(bad), bulk=True)
+    assert snapshot(conn) == before
+    assert dm.db_version(conn) == version
+    assert pragmas(conn) == CALLER_PRAGMAS
+    assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    if dm.has_fts(conn):
+        conn.execute(f"INSERT INTO {dm.FTS_TABLE} ({dm.FTS_TABLE}) VALUES ('integrity-check')")
+    conn.close()
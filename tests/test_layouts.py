@@ -0,0 +1,81 @@
+"""Row and dict storage layouts: lossless conversion both ways and identical search results."""
+
+from __future__ import annotations
+
+import pytest
+from conftest import FILTER_SHAPES, search_ids
+
+import prgi_data_manager as dm
+from test_facets import NEW_ROWS, assert_cube_current
+
+
+def snapshot(conn):
+    columns = ", ".join(dm.ALL_COLUMNS)
+    return conn.execute(f"SELECT {columns} FROM {dm.TABLE_NAME} ORDER BY id").fetchall()
+
+
+@pytest.fixture
+def row_conn(sample_db):
+    conn = dm.connect_db(str(sample_db("row")))
+    yield conn
+    conn.close()
+
+
+def test_round_trip_keeps_rows_and_ids(row_conn):
+    before = [tuple(row) for row in snapshot(row_conn)]
+    assert dm.set_layout(row_conn, "dict")
+    assert dm.storage_layout(row_conn) == "dict"
+    assert not dm.set_layout(row_conn, "dict")
+    assert [tuple(row) for row in snapshot(row_conn)] == before
+    assert dm.set_layout(row_conn, "row")
+    assert dm.storage_layout(row_conn) == "row"
+    assert [tuple(row) for row in snapshot(row_conn)] == before
+
+
+def test_ids_are_not_reused_after_conversion(row_conn):
+    last = row_conn.execute(f"SELECT MAX(id) FROM {dm.TABLE_NAME}").fetchone()[0]
+    row_conn.execute(f"DELETE FROM {dm.TABLE_NAME} WHERE id = ?", (last,))
+    row_conn.commit()
+    dm.set_layout(row_conn, "dict")
+    dm.insert_rows(row_conn, NEW_ROWS[:1])
+    assert row_conn.execute(f"SELECT MAX(id) FROM {dm.TABLE_NAME}").fetchone()[0] == last + 1
+
+
+def test_layouts_return_the_same_ids(sample_db):
+    row = dm.connect_db(str(sample_db("row")))
+    dict_ = dm.connect_db(str(sample_db("dict")))
+    assert dm.storage_layout(dict_) == "dict"
+    for fts in (False, True) if dm.fts_supported() else (False,):
+        for name, filters in FILTER_SHAPES.items():
+            assert search_ids(dict_, filters, fts) == search_ids(row, filters, fts), name
+    row.close()
+    dict_.close()
+
+
+@pytest.mark.parametrize("key", dm.EXACT_FILTERS)
+def test_dict_exact_filter_uses_id_index(sample_db, key):
+    conn = dm.connect_db(str(sample_db("dict")))
+    value = conn.execute(f"SELECT {dm.EXACT_FILTERS[key]} FROM {dm.TABLE_NAME} LIMIT 1").fetchone()[0]
+    filters = {key: value}
+    sql, params = dm.build_select(filters, lookup_ids=dm.filter_lookup_ids(conn, filters))
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    index = {"state": "state", "district": "dist", "language": "language", "class_name": "class"}[key]
+    expected = f"SEARCH {dm.TABLE_NAME} USING INDEX idx_{dm.DATA_TABLE}_{index} "
+    assert any(detail.startswith(expected) for detail in plan), plan
+    conn.close()
+
+
+def test_dict_writes_keep_cube_and_fts_current(sample_db):
+    conn = dm.connect_db(str(sample_db("dict")))
+    dm.insert_rows(conn, NEW_ROWS)
+    # Ad-hoc writes through the view's INSTEAD OF triggers.
+    conn.execute(f"UPDATE {dm.TABLE_NAME} SET pub_state_name = 'Goa', title_name = 'Goa Times' WHERE id % 9 = 0")
+    conn.execute(f"DELETE FROM {dm.TABLE_NAME} WHERE id % 13 = 0")
+    conn.commit()
+    assert_cube_current(conn)
+    if dm.has_fts(conn):
+        conn.execute(f"INSERT INTO {dm.FTS_TABLE} ({dm.FTS_TABLE}) VALUES ('integrity-check')")
+        assert search_ids(conn, {"title": "goa"}, fts=True) == search_ids(conn, {"title": "goa"}, fts=False)
+    goa = conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME} WHERE pub_state_name = 'Goa'").fetchone()[0]
+    assert len(search_ids(conn, {"state": "goa"}, fts=False)) == goa > 1
+    conn.close()
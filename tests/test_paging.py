@@ -0,0 +1,83 @@
+"""Keyset pages and streamed exports return exactly the rows of one unpaged query."""
+
+from __future__ import annotations
+
+import csv
+
+import pytest
+from conftest import FILTER_SHAPES
+
+import prgi_data_manager as dm
+
+SHAPES = ["no_filters", "state_common", "title_common", "state_language", "title_missing"]
+
+
+@pytest.fixture(params=dm.LAYOUTS)
+def conn(request, sample_db):
+    conn = dm.connect_db(str(sample_db(request.param)))
+    yield conn
+    conn.close()
+
+
+def unpaged(conn, filters, descending=False):
+    sql, params = dm.build_select(
+        filters, fts=dm.has_fts(conn), descending=descending, lookup_ids=dm.filter_lookup_ids(conn, filters)
+    )
+    return [tuple(row) for row in conn.execute(sql, params)]
+
+
+def all_pages(conn, filters, page_size, descending=False):
+    pages, after_id = [], None
+    while True:
+        rows, after_id = dm.query_page(conn, filters, page_size, after_id=after_id, descending=descending)
+        pages.append([tuple(row) for row in rows])
+        if after_id is None:
+            return pages
+        assert after_id == rows[-1][0]
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("shape", SHAPES)
+def test_pages_concatenate_to_the_unpaged_result(conn, shape, descending):
+    filters = FILTER_SHAPES[shape]
+    expected = unpaged(conn, filters, descending)
+    for page_size in (1, 7, 250, len(expected) or 1, len(expected) + 1):
+        pages = all_pages(conn, filters, page_size, descending)
+        rows = [row for page in pages for row in page]
+        assert rows == expected, (shape, page_size)
+        ids = [row[0] for row in rows]
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids, reverse=descending)
+        # Every page is full except the last; no empty page follows a full last one.
+        assert all(len(page) == page_size for page in pages[:-1])
+        assert len(pages) == max(1, -(-len(expected) // page_size))
+
+
+def test_pages_are_stable_under_writes(conn):
+    filters = FILTER_SHAPES["state_common"]
+    expected = unpaged(conn, filters)
+    first, after_id = dm.query_page(conn, filters, 100)
+    # Deleting rows already seen must not shift the next page; new rows land after the last one.
+    conn.execute(f"DELETE FROM {dm.TABLE_NAME} WHERE id IN ({', '.join(str(row[0]) for row in first[:50])})")
+    dm.insert_rows(conn, [{"Title Name": "Naya Akhbar", "Registration Number": "UP/2030/1", "State": "Uttar Pradesh"}])
+    second, _ = dm.query_page(conn, filters, 100, after_id=after_id)
+    assert [tuple(row) for row in first] == expected[:100]
+    assert [tuple(row) for row in second] == expected[100:200]
+    rest = [row for page in all_pages(conn, filters, 500) for row in page]
+    assert rest[-1][2] == "Naya Akhbar"
+
+
+@pytest.mark.parametrize("head_rows", [0, 3, 1000])
+def test_export_cursor_writes_every_row_once(conn, tmp_path, head_rows):
+    filters = FILTER_SHAPES["state_common"]
+    expected = unpaged(conn, filters)
+    sql, params = dm.build_select(filters, fts=dm.has_fts(conn), lookup_ids=dm.filter_lookup_ids(conn, filters))
+    cursor = conn.execute(sql, params)
+    head = cursor.fetchmany(head_rows)
+    out = tmp_path / "export.csv"
+    assert dm.export_cursor(cursor, str(out), head=head, fetch_size=64) == len(expected)
+    with open(out, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        assert next(reader) == [d[0] for d in cursor.description]
+        written = list(reader)
+    assert written == [["" if value is None else str(value) for value in row] for row in expected]
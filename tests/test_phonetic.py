@@ -0,0 +1,50 @@
+"""Phonetic title keys and the sounds-like filter built on them."""
+
+from __future__ import annotations
+
+import pytest
+
+import prgi_data_manager as dm
+
+
+@pytest.mark.parametrize(
+    "titles, key",
+    [
+        (["Samachar", "Samaachaar", "समाचार", "SAMA CHAR"], "smcr"),
+        (["Kutch", "Kachchh"], "kc"),
+        (["Dainik Jagran", "Dainik Jaagran"], dm.phonetic_key("Dainik Jagran")),
+    ],
+)
+def test_spelling_variants_share_a_key(titles, key):
+    assert {dm.phonetic_key(title) for title in titles} == {key}
+
+
+@pytest.mark.parametrize("value", ["", "   ", "!!!", "- / ."])
+def test_no_letters_give_an_empty_key(value):
+    assert dm.phonetic_key(value) == ""
+
+
+def test_sounds_like_without_a_key_is_rejected(sample_db):
+    with pytest.raises(ValueError):
+        dm.build_filter_clause({"sounds_like": "!!!"})
+    conn = dm.connect_db(str(sample_db("row")))
+    with pytest.raises(ValueError):
+        dm.search_page(conn, {"sounds_like": "!!!"}, 10)
+    pytest.importorskip("numpy")
+    pytest.importorskip("pandas")
+    from prgi_engine import ColumnarEngine
+
+    with pytest.raises(ValueError):
+        ColumnarEngine.from_db(conn).mask({"sounds_like": "!!!"})
+    conn.close()
+
+
+def test_sounds_like_matches_the_stored_key(sample_db):
+    conn = dm.connect_db(str(sample_db("row")))
+    key = dm.phonetic_key("samaachar")
+    expected = conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME} WHERE title_phonetic = ?", (key,)).fetchone()[0]
+    clauses, params, _ = dm.build_filter_clause({"sounds_like": "  Samaachar "})
+    assert params == [key]
+    rows = conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME} WHERE {' AND '.join(clauses)}", params).fetchone()[0]
+    assert rows == expected > 0
+    conn.close()
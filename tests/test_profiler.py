@@ -0,0 +1,53 @@
+"""Query profiling: plans of traced statements, and a slow log that only holds SQL steps."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+import prgi_data_manager as dm
+
+
+@pytest.fixture
+def conn(sample_db):
+    conn = dm.connect_db(str(sample_db("row")))
+    yield conn
+    conn.close()
+
+
+def test_traced_statements_are_explained(conn):
+    profiler = dm.QueryProfiler(slow_ms=1e9)
+    with profiler.track("state", conn) as info:
+        info["rows"] = len(dm.query_page(conn, {"state": "Delhi"}, 10)[0])
+    with profiler.track("scan", conn):
+        conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME} WHERE meta_json LIKE '%Daily%'").fetchall()
+    state, scan = profiler.timings
+    assert state.rows == 10 and state.statements and not state.full_scan
+    assert any("USING INDEX idx_registrations_state" in line for line in state.plan)
+    assert scan.full_scan and not scan.slow
+
+
+def test_slow_log_holds_only_sql_steps(conn, tmp_path):
+    log = tmp_path / "slow.jsonl"
+    profiler = dm.QueryProfiler(slow_ms=0, log_path=str(log))
+    with profiler.track("no sql"):
+        time.sleep(0.001)
+    with profiler.track("cache hit", conn):
+        pass
+    with profiler.track("sql", conn):
+        conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME}").fetchall()
+    assert all(timing.slow for timing in profiler.timings)
+    entries = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert [entry["label"] for entry in entries] == ["sql"]
+    assert entries[0]["statements"] and entries[0]["plan"]
+
+
+def test_slow_log_without_plans(conn, tmp_path):
+    log = tmp_path / "slow.jsonl"
+    profiler = dm.QueryProfiler(slow_ms=0, log_path=str(log), explain=False)
+    with profiler.track("sql", conn):
+        conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME}").fetchall()
+    (entry,) = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert entry["statements"] and not entry["plan"]
@@ -0,0 +1,95 @@
+"""Exact-match filters must be index seeks, on new databases and on migrated old ones."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import prgi_data_manager as dm
+
+# The schema connect_db() created before the NOCASE indexes: plain-column indexes, no class index.
+BASELINE_SCHEMA = f"""
+CREATE TABLE {dm.TABLE_NAME} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sr_no TEXT,
+    title_name TEXT,
+    registration_number TEXT,
+    owner_name TEXT,
+    pub_state_name TEXT,
+    pub_dist_name TEXT,
+    language TEXT,
+    class_name TEXT,
+    meta_json TEXT
+);
+CREATE UNIQUE INDEX idx_{dm.TABLE_NAME}_unique ON {dm.TABLE_NAME} (registration_number, title_name, owner_name);
+CREATE INDEX idx_{dm.TABLE_NAME}_state ON {dm.TABLE_NAME} (pub_state_name);
+CREATE INDEX idx_{dm.TABLE_NAME}_dist ON {dm.TABLE_NAME} (pub_dist_name);
+CREATE INDEX idx_{dm.TABLE_NAME}_language ON {dm.TABLE_NAME} (language);
+CREATE INDEX idx_{dm.TABLE_NAME}_owner ON {dm.TABLE_NAME} (owner_name);
+"""
+
+FILTER_INDEXES = {
+    "state": "idx_registrations_state",
+    "district": "idx_registrations_dist",
+    "language": "idx_registrations_language",
+    "class_name": "idx_registrations_class",
+}
+
+
+def fresh_db(tmp_path: Path, sample_csv: Path) -> sqlite3.Connection:
+    conn = dm.connect_db(str(tmp_path / "fresh.db"))
+    dm.import_csv(conn, str(sample_csv))
+    return conn
+
+
+def migrated_db(tmp_path: Path, sample_csv: Path) -> sqlite3.Connection:
+    path = tmp_path / "baseline.db"
+    old = sqlite3.connect(str(path))
+    old.executescript(BASELINE_SCHEMA)
+    old.execute(
+        f"INSERT INTO {dm.TABLE_NAME} (title_name, registration_number, owner_name, pub_state_name, "
+        f"pub_dist_name, language, class_name) VALUES "
+        f"('Dainik Jagran', 'UPHIN/1950/00001', 'Ravi Gupta', 'Uttar Pradesh', 'Lucknow', 'Hindi', 'Newspaper'), "
+        f"('Lokmat', 'MAHMAR/1971/00002', 'Anil Joshi', 'Maharashtra', 'Pune', 'Marathi', 'Periodical')"
+    )
+    old.commit()
+    old.close()
+    conn = dm.connect_db(str(path))  # ensure_schema() migrates it
+    dm.import_csv(conn, str(sample_csv))
+    return conn
+
+
+def plan_details(conn: sqlite3.Connection, sql: str, params: list) -> list:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+@pytest.fixture(params=[fresh_db, migrated_db], ids=["fresh", "migrated"])
+def conn(request, tmp_path, sample_csv):
+    conn = request.param(tmp_path, sample_csv)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("key", dm.EXACT_FILTERS)
+def test_exact_filter_uses_nocase_index(conn, key):
+    sql, params = dm.build_select({key: "some value"}, fts=dm.has_fts(conn), descending=True, limit=100)
+    plan = plan_details(conn, sql, params)
+    assert any(detail.startswith(f"SEARCH registrations USING INDEX {FILTER_INDEXES[key]} ") for detail in plan), plan
+
+
+def test_migrated_indexes_are_nocase(tmp_path, sample_csv):
+    conn = migrated_db(tmp_path, sample_csv)
+    sql = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index'"))
+    conn.close()
+    for name, column in dm.SECONDARY_INDEXES.items():
+        assert column.lower() in sql[name].lower()
+
+
+def test_exact_filter_ignores_case(tmp_path, sample_csv):
+    conn = fresh_db(tmp_path, sample_csv)
+    count = conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME} WHERE pub_state_name = 'Delhi'").fetchone()[0]
+    sql, params = dm.build_select({"state": "  dELHI "})
+    assert count and len(conn.execute(sql, params).fetchall()) == count
+    conn.close()
@@ -0,0 +1,103 @@
+"""ReadPool: read-only, bounded connections that see commits made through WAL."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import prgi_data_manager as dm
+
+NEW_ROW = {"Title Name": "Naya Akhbar", "Registration Number": "GOAKON/2030/00001", "State": "Goa"}
+
+
+@pytest.fixture
+def db_path(sample_db):
+    path = str(sample_db("row"))
+    dm.prepare_for_readers(path)
+    return path
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = dm.ReadPool(db_path, size=2)
+    yield pool
+    pool.close()
+
+
+def count(conn):
+    return conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME}").fetchone()[0]
+
+
+def test_connections_are_read_only(pool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        for sql in (
+            f"DELETE FROM {dm.TABLE_NAME}",
+            f"UPDATE {dm.TABLE_NAME} SET title_name = 'x'",
+            "CREATE TABLE scratch (x)",
+        ):
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute(sql)
+        assert count(conn) > 0
+
+
+def test_checkout_reuses_connections_and_blocks_at_capacity(pool):
+    seen = set()
+    for _ in range(5):
+        with pool.connection() as conn:
+            seen.add(id(conn))
+    assert len(seen) == 1  # Sequential checkouts reuse one idle connection.
+
+    got = []
+    with pool.connection() as first, pool.connection() as second:
+        assert first is not second
+        with pytest.raises(TimeoutError):
+            with pool.connection(timeout=0.05):
+                pass
+
+        def wait_for_connection():
+            with pool.connection(timeout=5) as conn:
+                got.append(conn)
+
+        waiter = threading.Thread(target=wait_for_connection)
+        waiter.start()
+        waiter.join(0.1)
+        assert waiter.is_alive()  # Blocked until a connection comes back.
+    waiter.join(5)
+    assert got and got[0] in (first, second)  # Handed a returned connection, not a third one.
+
+
+def test_readers_see_commits_made_after_they_opened(pool, db_path):
+    with pool.connection() as conn:
+        before = count(conn)
+    writer = dm.connect_db(db_path)
+    try:
+        with pool.connection() as conn:
+            # An open read transaction keeps its snapshot and does not block the writer.
+            conn.execute("BEGIN")
+            assert count(conn) == before
+            dm.insert_rows(writer, [NEW_ROW])
+            assert count(conn) == before
+        # Returned connections are rolled back, so the next checkout sees the commit.
+        with pool.connection() as conn:
+            assert count(conn) == before + 1
+    finally:
+        writer.close()
+
+
+def test_concurrent_readers_share_the_pool(pool):
+    used = set()
+
+    def search(_):
+        with pool.connection() as conn:
+            used.add(id(conn))
+            rows, _ = dm.search_page(conn, {"state": "Delhi"}, 50)
+            return len(rows)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(search, range(64)))
+    assert len(set(results)) == 1 and results[0] > 0
+    assert len(used) <= pool.size
@@ -0,0 +1,437 @@
+"""Scraper: parsing, rate limiting, the response cache, incremental crawls, output writers and recovery."""
+
+from __future__ import annotations
+
+import csv
+import gc
+import os
+import sys
+import threading
+import time
+import weakref
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import prgi_data_manager as dm
+import scrape_prgi
+from scrape_prgi import AdaptiveRateLimiter, CrawlJournal, ResponseCache, RowDeduper, SQLiteSink, StreamingCSVWriter
+from synth_data import synthetic_page
+
+HEAD = "<thead><tr><th>Title</th><th>Owner</th></tr></thead>"
+# Markup that html.parser and libxml2 repair differently; the html and lxml backends must hand it to bs4.
+IRREGULAR_TABLES = {
+    "unclosed_td": f"<table>{HEAD}<tbody><tr><td>Lokmat<td>Anil Joshi</tr><tr><td>Sakal<td>Pawar</tr></tbody></table>",
+    "unclosed_tr": f"<table>{HEAD}<tbody><tr><td>Lokmat</td><td>Anil</td><tr><td>Sakal</td><td>Pawar</td></tbody></table>",
+    "nested_table": (
+        f"<table>{HEAD}<tbody><tr><td><table><tr><td>Lokmat</td></tr></table></td><td>Anil</td></tr></tbody></table>"
+    ),
+    "stray_end_tag": f"<table>{HEAD}<tbody><tr><td>Lokmat</td></td><td>Anil</td></tr></tbody></table>",
+    "table_in_row": f"<tr><td><table>{HEAD}<tbody><tr><td>Lokmat</td><td>Anil</td></tr></tbody></table></td></tr>",
+}
+# Every backend closes a table cut off at the end of the page the same way.
+MALFORMED_TABLES = {**IRREGULAR_TABLES, "unclosed_table": f"<table>{HEAD}<tbody><tr><td>Lokmat</td><td>Anil</td></tr>"}
+BACKENDS = sorted(name for name in scrape_prgi.PARSER_BACKENDS if name != "lxml" or scrape_prgi.lxml_html is not None)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_agree_on_listing_page(backend):
+    page = synthetic_page(1, 200)
+    rows = scrape_prgi.parse_table_from_html(page, backend)
+    assert len(rows) == 200
+    assert rows == scrape_prgi.parse_table_from_html(page, "bs4")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("markup", MALFORMED_TABLES)
+def test_backends_agree_on_malformed_markup(backend, markup):
+    html = MALFORMED_TABLES[markup]
+    assert scrape_prgi.parse_table_from_html(html, backend) == scrape_prgi.parse_table_from_html(html, "bs4")
+
+
+@pytest.mark.parametrize("backend", [name for name in BACKENDS if name != "bs4"])
+def test_irregular_markup_falls_back_to_bs4(backend, monkeypatch):
+    calls = []
+    parse_bs4 = scrape_prgi._parse_table_bs4
+    monkeypatch.setattr(scrape_prgi, "_parse_table_bs4", lambda html: calls.append(html) or parse_bs4(html))
+    for html in IRREGULAR_TABLES.values():
+        scrape_prgi.parse_table_from_html(html, backend)
+    assert len(calls) == len(IRREGULAR_TABLES)
+    calls.clear()
+    scrape_prgi.parse_table_from_html(synthetic_page(1, 20), backend)
+    assert calls == []
+
+
+PAGE_1 = [{"Title": "Dainik Jagran", "Owner": "Ravi Gupta"}, {"Title": "Lokmat", "Owner": "Anil Joshi"}]
+PAGE_2 = [{"Title": "Sakal", "Owner": "Pratap Pawar", "Class": "Newspaper"}]
+PAGE_3 = [{"Title": "Mathrubhumi", "Owner": "M. Nair"}]
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_matches_write_csv(tmp_path):
+    streamed, batch = tmp_path / "streamed.csv", tmp_path / "batch.csv"
+    writer = StreamingCSVWriter(str(streamed))
+    for page in (PAGE_1, PAGE_2, PAGE_3):
+        writer.write_rows(page)
+    writer.close()
+    scrape_prgi.write_csv(str(batch), PAGE_1 + PAGE_2 + PAGE_3)
+    assert streamed.read_bytes() == batch.read_bytes()
+
+
+def test_late_column_header_is_on_disk_before_close(tmp_path):
+    path = tmp_path / "out.csv"
+    writer = StreamingCSVWriter(str(path))
+    writer.write_rows(PAGE_1)
+    writer.write_rows(PAGE_2)
+    # As if the process were killed here: the file is already complete.
+    assert read_rows(path) == [
+        ["Title", "Owner", "Class"],
+        ["Dainik Jagran", "Ravi Gupta", ""],
+        ["Lokmat", "Anil Joshi", ""],
+        ["Sakal", "Pratap Pawar", "Newspaper"],
+    ]
+    writer.close()
+
+
+def test_resume_drops_torn_last_row(tmp_path):
+    path = tmp_path / "out.csv"
+    writer = StreamingCSVWriter(str(path))
+    writer.write_rows(PAGE_1)
+    writer.close()
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write("Sakal,Prat")
+
+    writer = StreamingCSVWriter(str(path), append=True, keep_rows=2)
+    assert writer.dropped_rows == 1
+    assert writer.rows_in_file == 2
+    assert list(writer.existing_rows()) == PAGE_1
+    writer.write_rows(PAGE_3)
+    writer.close()
+    assert read_rows(path)[1:] == [["Dainik Jagran", "Ravi Gupta"], ["Lokmat", "Anil Joshi"], ["Mathrubhumi", "M. Nair"]]
+
+
+def test_resume_drops_torn_quoted_value(tmp_path):
+    path = tmp_path / "out.csv"
+    writer = StreamingCSVWriter(str(path))
+    writer.write_rows(PAGE_1)
+    writer.close()
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write('"Sakal\r\nDaily",')
+
+    writer = StreamingCSVWriter(str(path), append=True)
+    assert writer.dropped_rows == 1
+    assert list(writer.existing_rows()) == PAGE_1
+    writer.close()
+
+
+def test_resume_drops_rows_of_unjournaled_page(tmp_path):
+    path = tmp_path / "out.csv"
+    journal = CrawlJournal(str(tmp_path / "out.csv.journal.jsonl"), items_per_page=2)
+    writer = StreamingCSVWriter(str(path))
+    writer.write_rows(PAGE_1)
+    journal.record(1, "ok", rows=2, csv_rows=writer.rows_in_file)
+    writer.write_rows(PAGE_3)  # Killed before page 2's journal entry.
+    writer.close()
+
+    journal = CrawlJournal(journal.path, items_per_page=2)
+    assert journal.csv_rows == 2
+    assert journal.pages_with_status("ok") == {1}
+    writer = StreamingCSVWriter(str(path), append=True, keep_rows=journal.csv_rows)
+    assert writer.dropped_rows == 1
+    assert list(writer.existing_rows()) == PAGE_1
+    writer.close()
+
+
+def test_resume_of_torn_header_starts_over(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("Title,Ow", encoding="utf-8")
+    writer = StreamingCSVWriter(str(path), append=True)
+    assert list(writer.existing_rows()) == []
+    writer.write_rows(PAGE_3)
+    writer.close()
+    assert read_rows(path) == [["Title", "Owner"], ["Mathrubhumi", "M. Nair"]]
+
+
+class Row(dict):
+    """A row dict that can be weakly referenced, to see whether anything still holds it."""
+
+
+def test_resume_dedupe_keeps_only_digests(tmp_path):
+    path = tmp_path / "out.csv"
+    writer = StreamingCSVWriter(str(path))
+    writer.write_rows(PAGE_1 + PAGE_3)
+    writer.close()
+
+    held = []
+
+    def existing_rows():
+        # A consumer may still hold the row it is processing, but no earlier one.
+        refs = []
+        for row in writer.existing_rows():
+            gc.collect()
+            held.append(sum(ref() is not None for ref in refs[:-1]))
+            row = Row(row)
+            refs.append(weakref.ref(row))
+            yield row
+
+    writer = StreamingCSVWriter(str(path), append=True)
+    deduper = RowDeduper()
+    deduper.remember(existing_rows())
+    writer.close()
+    assert held == [0, 0, 0]
+    assert all(isinstance(key, bytes) and len(key) == 8 for key in deduper.seen)
+    assert deduper.filter(PAGE_1 + PAGE_2) == PAGE_2
+
+
+LISTING_1 = [
+    {"Title Name": "Dainik Jagran", "Registration Number": "UPHIN/2001/00001", "Owner Name": "Ravi Gupta"},
+    {"Title Name": "Lokmat", "Registration Number": "MAHMAR/2001/00002", "Owner Name": "Anil Joshi"},
+    {"Title Name": "Sakal", "Registration Number": "MAHMAR/2001/00003", "Owner Name": "Pratap Pawar"},
+]
+LISTING_2 = [*LISTING_1[1:], {"Title Name": "Mathrubhumi", "Registration Number": "KERMAL/2001/4", "Owner Name": "Nair"}]
+
+
+@pytest.mark.parametrize("layout", dm.LAYOUTS)
+def test_sqlite_sink_skips_overlapping_rows(tmp_path, layout):
+    path = str(tmp_path / "prgi.db")
+    conn = dm.connect_db(path)
+    dm.set_layout(conn, layout)
+    conn.close()
+    sink = SQLiteSink(path, batch_size=2)
+    version = dm.db_version(sink.conn)
+    sink.write_rows(LISTING_1)
+    sink.write_rows(LISTING_2)
+    sink.write_rows(LISTING_2)
+    assert (sink.inserted, sink.skipped) == (4, 5)
+    assert dm.db_version(sink.conn) > version
+    sink.close()
+
+    conn = dm.connect_db(path)
+    numbers = [row[0] for row in conn.execute(f"SELECT registration_number FROM {dm.TABLE_NAME} ORDER BY id")]
+    assert numbers == [row["Registration Number"] for row in LISTING_1 + LISTING_2[-1:]]
+    assert dm.db_stats(conn)["total_records"] == 4
+    conn.close()
+
+
+def test_sqlite_sink_stores_a_page_whole_or_not_at_all(tmp_path):
+    path = str(tmp_path / "prgi.db")
+    sink = SQLiteSink(path, batch_size=2)
+    with pytest.raises(AttributeError):
+        sink.write_rows([*LISTING_1, None])  # Fails after the first batch of the page went in.
+    sink.write_rows(LISTING_2[-1:])
+    sink.close()
+    conn = dm.connect_db(path)
+    assert conn.execute(f"SELECT COUNT(*) FROM {dm.TABLE_NAME}").fetchone()[0] == 1
+    conn.close()
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep; sleeping just moves the clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+def acquire_times(limiter, clock, count):
+    times = []
+    for _ in range(count):
+        limiter.acquire()
+        times.append(clock.now)
+    return times
+
+
+def test_limiter_paces_requests_at_its_rate(clock):
+    limiter = AdaptiveRateLimiter(rate=2.0)
+    start = clock.now
+    times = acquire_times(limiter, clock, 5)
+    assert times == pytest.approx([start, start + 0.5, start + 1.0, start + 1.5, start + 2.0])
+
+
+def test_limiter_halves_rate_on_throttle_and_recovers(clock):
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=0.5, max_rate=6.0, increase=0.5, decrease=0.5)
+    limiter.acquire()
+    limiter.record_throttle()
+    limiter.record_throttle()
+    assert limiter.rate == 1.0
+    assert limiter.throttled == 2
+    # The bucket was drained: the next request waits a full interval at the lowered rate.
+    before = clock.now
+    limiter.acquire()
+    assert clock.now - before == pytest.approx(1.0)
+    for _ in range(3):
+        limiter.record_throttle()
+    assert limiter.rate == 0.5  # Never below min_rate.
+    for _ in range(3):
+        limiter.record_success()
+    assert limiter.rate == 2.0  # Additive recovery...
+    for _ in range(20):
+        limiter.record_success()
+    assert limiter.rate == 6.0  # ...up to max_rate.
+
+
+def test_limiter_honours_retry_after(clock):
+    limiter = AdaptiveRateLimiter(rate=8.0, max_rate=8.0)
+    limiter.acquire()
+    limiter.record_throttle(retry_after=5.0)
+    before = clock.now
+    limiter.acquire()
+    assert clock.now - before == pytest.approx(5.0)
+
+
+def fake_response(status, body="", headers=None, history=()):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = "https://prgi.example/registration-title-details?page=1"
+    response.headers.update(headers or {})
+    response.raw = SimpleNamespace(retries=SimpleNamespace(history=[SimpleNamespace(status=s) for s in history]))
+    return response
+
+
+@pytest.mark.parametrize(
+    "response, throttled",
+    [
+        (fake_response(200), False),
+        (fake_response(503, headers={"Retry-After": "3"}), True),
+        (fake_response(429), True),
+        (fake_response(200, history=[429, 503]), True),  # Throttled on urllib3's internal retries.
+    ],
+)
+def test_limiter_observes_throttling_responses(clock, response, throttled):
+    limiter = AdaptiveRateLimiter(rate=2.0, increase=1.0)
+    limiter.observe(response)
+    assert limiter.rate == (1.0 if throttled else 3.0)
+    assert limiter.throttled == int(throttled)
+
+
+PAGE_HTML = "<table><tr><th>Title</th></tr><tr><td>Lokmat</td></tr></table>"
+PAGE_ROWS = [{"Title": "Lokmat"}]
+
+
+def test_cache_reuses_rows_on_304(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = ResponseCache.key("https://prgi.example", {"page": "1"})
+    assert cache.conditional_headers(key) == {}
+    headers = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert cache.resolve(key, fake_response(200, PAGE_HTML, headers)) == (PAGE_HTML, None)
+    cache.store_rows(key, PAGE_ROWS)
+    assert cache.conditional_headers(key) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.resolve(key, fake_response(304)) == (PAGE_HTML, PAGE_ROWS)
+    assert (cache.refreshed, cache.not_modified, cache.unchanged) == (1, 1, 0)
+
+
+def test_cache_detects_changed_bodies_by_hash(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = ResponseCache.key("https://prgi.example", {"page": "1"})
+    cache.resolve(key, fake_response(200, PAGE_HTML))
+    cache.store_rows(key, PAGE_ROWS)
+    # No validators from the server, but the same body: parsed rows are reused.
+    assert cache.resolve(key, fake_response(200, PAGE_HTML)) == (PAGE_HTML, PAGE_ROWS)
+    changed = PAGE_HTML.replace("Lokmat", "Sakal")
+    assert cache.resolve(key, fake_response(200, changed)) == (changed, None)
+    # The stale rows are gone until the new body is parsed and stored.
+    assert cache.resolve(key, fake_response(200, changed)) == (changed, None)
+    assert (cache.unchanged, cache.refreshed) == (1, 3)
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    keys = [ResponseCache.key("https://prgi.example", {"page": str(page)}) for page in range(4)]
+    for age, key in enumerate(reversed(keys)):
+        cache.resolve(key, fake_response(200, PAGE_HTML * 50))
+        cache.store_rows(key, PAGE_ROWS)
+        for name in os.listdir(tmp_path):
+            if name.startswith(key):
+                stamp = time.time() - 100 * (age + 1)
+                os.utime(tmp_path / name, (stamp, stamp))
+    # Oldest first: keys[0], keys[1], keys[2], keys[3]. Reading keys[0] makes it the most recent.
+    assert cache.resolve(keys[0], fake_response(304))[1] == PAGE_ROWS
+    entry_bytes = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)) // 4
+    cache.max_bytes = entry_bytes * 2
+    assert cache.evict() == 2
+    left = {name.split(".", 1)[0] for name in os.listdir(tmp_path)}
+    assert left == {keys[0], keys[3]}
+    assert cache.evict() == 0
+
+
+LISTING_ROWS = 20
+
+
+class FakeSession:
+    """Serves synthetic listing pages for any page number and records which pages were requested."""
+
+    def __init__(self) -> None:
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None, headers=None):
+        page = int(params["page"])
+        with self._lock:
+            self.requested.append(page)
+        return fake_response(200, synthetic_page(page, LISTING_ROWS))
+
+
+def listing(page):
+    return scrape_prgi.parse_table_from_html(synthetic_page(page, LISTING_ROWS), "bs4")
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_since_db_stops_at_first_fully_known_page(tmp_path, monkeypatch, workers):
+    # Pages are listed newest first: page 1 is all new, page 2 half new, pages 3 onwards already imported.
+    db_path = str(tmp_path / "prgi.db")
+    imported = listing(2)[LISTING_ROWS // 2 :] + [row for page in range(3, 9) for row in listing(page)]
+    conn = dm.connect_db(db_path)
+    dm.insert_rows(conn, imported)
+    conn.close()
+    known = {row["Registration Number"] for row in imported}
+    session = FakeSession()
+    monkeypatch.setattr(scrape_prgi, "build_session", lambda pool_size=10: session)
+    output = tmp_path / "new.csv"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "scrape_prgi.py",
+            *("--start-page", "1", "--end-page", "8", "--items-per-page", str(LISTING_ROWS)),
+            *("--since-db", db_path, "--output", str(output), "--min-delay", "0", "--max-delay", "0"),
+            *("--workers", str(workers), "--rate", "1000", "--max-rate", "1000"),
+        ],
+    )
+    scrape_prgi.main()
+
+    with open(output, newline="", encoding="utf-8") as f:
+        written = [row["Registration Number"] for row in csv.DictReader(f)]
+    expected = [row["Registration Number"] for row in listing(1) + listing(2)]
+    assert written == [number for number in expected if number not in known]
+    assert len(written) > LISTING_ROWS
+    journal = CrawlJournal(f"{output}.journal.jsonl", LISTING_ROWS)
+    assert journal.pages_with_status("ok") == {1, 2, 3}
+    if workers == 1:
+        assert session.requested == [1, 2, 3]
+    else:
+        # Fetches run ahead of the consumer by at most two pages per worker.
+        assert set(session.requested) >= {1, 2, 3}
+        assert max(session.requested) <= 3 + 2 * workers
@@ -0,0 +1,73 @@
+"""Full-text search: the trigram index answers like LIKE and stays in sync with writes."""
+
+from __future__ import annotations
+
+import pytest
+from conftest import FILTER_SHAPES, search_ids
+
+import prgi_data_manager as dm
+
+pytestmark = pytest.mark.skipif(not dm.fts_supported(), reason="SQLite without FTS5 trigram support")
+
+
+# Rows whose text holds %, _ and backslashes, which every search path must treat as plain
+# characters; each shape below matches exactly one of them.
+WILDCARD_ROWS = [
+    {"Title Name": "100% Khabar", "Registration Number": "DELHIN/2021/00001", "Owner Name": "A_B Media"},
+    {"Title Name": "Ab Khabar", "Registration Number": "DELHIN/2021/00002", "Owner Name": "AxB Media"},
+    {"Title Name": "Back\\Slash Times", "Registration Number": "DEL\\HIN/2021/3", "Owner Name": "C%D Trust"},
+]
+WILDCARD_SHAPES = {
+    "percent": {"title": "%"},
+    "percent_word": {"title": "100%"},
+    "underscore": {"owner": "_"},
+    "underscore_word": {"owner": "a_b"},
+    "percent_owner": {"owner": "c%d"},
+    "backslash": {"registration_number": "\\"},
+    "backslash_title": {"title": "k\\s"},
+}
+
+
+@pytest.fixture
+def conn(sample_db):
+    conn = dm.connect_db(str(sample_db("row")))
+    yield conn
+    conn.close()
+
+
+def assert_fts_matches_like(conn):
+    for name, filters in FILTER_SHAPES.items():
+        assert search_ids(conn, filters, fts=True) == search_ids(conn, filters, fts=False), name
+
+
+def test_fts_matches_like(conn):
+    assert dm.has_fts(conn)
+    assert search_ids(conn, {"title": "jagran"}, fts=True)
+    assert_fts_matches_like(conn)
+
+
+def test_triggers_keep_fts_in_sync(conn):
+    dm.insert_rows(
+        conn,
+        [{"Title Name": "Jagran Mathrubhumi Vani", "Registration Number": "KERMAL/2004/99999", "Owner Name": "Kulkarni"}],
+    )
+    conn.execute(f"UPDATE {dm.TABLE_NAME} SET title_name = 'Renamed' WHERE title_name LIKE '%samachar%' AND id % 2 = 0")
+    conn.execute(f"UPDATE {dm.TABLE_NAME} SET owner_name = owner_name || ' Kulkarni' WHERE id % 7 = 0")
+    conn.execute(f"DELETE FROM {dm.TABLE_NAME} WHERE title_name LIKE '%jagran%' AND id % 3 = 0")
+    conn.commit()
+    conn.execute(f"INSERT INTO {dm.FTS_TABLE} ({dm.FTS_TABLE}) VALUES ('integrity-check')")
+    assert_fts_matches_like(conn)
+
+
+def test_fts_every_word_in_any_order(conn):
+    both = set(search_ids(conn, {"title": "jagran"}, fts=False)) & set(search_ids(conn, {"title": "dainik"}, fts=False))
+    assert both
+    assert set(search_ids(conn, {"title": "Jagran dainik"}, fts=True)) == both
+
+
+def test_wildcards_match_literally(conn):
+    dm.insert_rows(conn, WILDCARD_ROWS)
+    for name, filters in WILDCARD_SHAPES.items():
+        like = search_ids(conn, filters, fts=False)
+        assert len(like) == 1, name
+        assert search_ids(conn, filters, fts=True) == like, name
@@ -0,0 +1,69 @@
+"""Title similarity: bit-parallel edit distance and the trigram index."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+import prgi_data_manager as dm
+
+
+def reference_levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [("", ""), ("", "jagran"), ("jagran", ""), ("jagran", "jagaran"), ("kitten", "sitting"), ("समाचार", "samachar")],
+)
+def test_levenshtein_examples(a, b):
+    assert dm.levenshtein(a, b) == reference_levenshtein(a, b)
+
+
+def test_levenshtein_matches_dynamic_programming():
+    rng = random.Random(5)
+    for _ in range(500):
+        # Lengths past 64 cross a machine word in the bit vectors.
+        a = "".join(rng.choice("abcde ") for _ in range(rng.randint(0, 90)))
+        b = "".join(rng.choice("abcde ") for _ in range(rng.randint(0, 90)))
+        assert dm.levenshtein(a, b) == reference_levenshtein(a, b), (a, b)
+
+
+@pytest.fixture(scope="module")
+def titles(sample_db):
+    conn = dm.connect_db(str(sample_db("row")))
+    titles = [row[0] for row in conn.execute(f"SELECT title_name FROM {dm.TABLE_NAME}")]
+    conn.close()
+    return titles
+
+
+@pytest.fixture(scope="module")
+def index(titles):
+    return dm.TitleIndex([title, "", "", ""] for title in titles)
+
+
+@pytest.mark.parametrize("title", ["Dainik Jagran", "Rashtriya Samaachar Times", "MATHRUBHUMI!", "Lok-mat Weekly"])
+def test_search_matches_brute_force(index, title):
+    key = dm.title_key(title)
+    scores = sorted(
+        ((round(dm.title_similarity(key, other), 4), index.rows[i][0]) for i, other in enumerate(index.keys)),
+        key=lambda t: (-t[0], t[1]),
+    )
+    found = index.search(title, limit=10, candidates=len(index))
+    assert [(m.score, m.title_name) for m in found] == scores[:10]
+    # The default candidate pool finds the same best match.
+    assert index.search(title, limit=1)[0].score == scores[0][0]
+
+
+def test_search_counts_duplicate_titles(index, titles):
+    best = index.search("  dainik   JAGRAN ", limit=1)[0]
+    assert best.score == 1.0
+    assert best.registrations == sum(1 for title in titles if dm.title_key(title) == "dainik jagran")
+    assert best.registrations > 1